@@ -1,30 +1,254 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mindspace.db")
 
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Run database-backed requests on the event loop with an async driver
+# (aiosqlite / asyncpg) instead of FastAPI's threadpool
+ASYNC_DB = os.getenv("DATABASE_ASYNC", "0") == "1"
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """Swap the driver in a database URL for its async counterpart"""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+
+# Applied to every new SQLite connection. WAL lets readers run alongside a
+# writer, busy_timeout makes a second writer wait instead of failing with
+# "database is locked"; negative cache_size is KiB rather than pages.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "foreign_keys": "ON",  # SQLite ignores FOREIGN KEY clauses (and ON DELETE CASCADE) otherwise
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+# Connections kept open, plus extra ones opened under load and closed when returned
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+}
+# Server databases only: drop connections the server or a proxy closed
+SERVER_POOL_OPTIONS = {
+    "pool_pre_ping": os.getenv("DATABASE_POOL_PRE_PING", "1") == "1",
+    "pool_recycle": int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def engine_options(url: str) -> dict:
+    """Pool and driver settings for create_engine / create_async_engine"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {**POOL_OPTIONS, **SERVER_POOL_OPTIONS}
+    options = {"connect_args": {"check_same_thread": False}}
+    if parsed.database not in (None, "", ":memory:"):
+        # In-memory databases keep SQLAlchemy's single-connection pool
+        options.update(POOL_OPTIONS)
+        if parsed.get_driver_name() == "aiosqlite":
+            # Defaults to NullPool: a new connection, and pragmas, per session
+            options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def configure_engine(engine):
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+configure_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The sync engine stays in use for startup, background writers and exports
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = os.getenv("DATABASE_ASYNC_URL") or async_url(DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url))
+    configure_engine(async_engine.sync_engine)
+    # Objects stay loaded after commit: expiring them would force lazy
+    # reloads while the response is serialized
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for GET traffic. A client that wrote within the
+# last READ_AFTER_WRITE_MS echoes the X-Last-Write header it was given
+# (see app.utils.read_your_writes) and keeps reading from the primary
+# until the replica has had time to catch up.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+READ_AFTER_WRITE_HEADER = "X-Last-Write"
+READ_AFTER_WRITE_MS = int(os.getenv("DATABASE_READ_AFTER_WRITE_MS", "5000"))
+
+read_engine = None
+ReadSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if DATABASE_READ_URL:
+    read_engine = create_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    configure_engine(read_engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    if ASYNC_DB:
+        _async_read_url = os.getenv("DATABASE_ASYNC_READ_URL") or async_url(DATABASE_READ_URL)
+        async_read_engine = create_async_engine(_async_read_url, **engine_options(_async_read_url))
+        configure_engine(async_read_engine.sync_engine)
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    """Dependency to get database session"""
+def get_sync_db():
+    """Dependency to get a session on the sync engine, for handlers kept on the threadpool"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
-def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+
+if ASYNC_DB:
+    async def get_db():
+        """Dependency to get database session.
+
+        Yields the AsyncSession's sync facade: handlers keep their ordinary
+        Session code and are run inside SQLAlchemy's greenlet bridge (see
+        app.utils.async_routes), where each query awaits the async driver.
+        """
+        async with AsyncSessionLocal() as session:
+            yield session.sync_session
+else:
+    get_db = get_sync_db
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client says it wrote less than READ_AFTER_WRITE_MS ago.
+
+    The stamp is echoed by the client, so it only counts if it could be one
+    we issued: a stamp slightly ahead of this server's clock (another
+    worker's) is capped at now, one more than READ_AFTER_WRITE_MS ahead or
+    behind is ignored, and such clients read from the replica as usual.
+    """
+    try:
+        wrote_at = int(request.headers.get(READ_AFTER_WRITE_HEADER, ""))
+    except ValueError:
+        return False
+    now = time.time() * 1000
+    if wrote_at - now > READ_AFTER_WRITE_MS:
+        return False
+    return now - min(wrote_at, now) < READ_AFTER_WRITE_MS
+
+
+def read_sessionmaker(request: Request):
+    """Sync session factory for a read: the replica if configured, unless the client just wrote"""
+    if ReadSessionLocal is None or wrote_recently(request):
+        return SessionLocal
+    return ReadSessionLocal
+
+
+if not DATABASE_READ_URL:
+    get_read_db = get_db
+elif ASYNC_DB:
+    async def get_read_db(request: Request):
+        """Dependency to get a read-only session: the replica, or the primary right after a write"""
+        factory = AsyncSessionLocal if wrote_recently(request) else AsyncReadSessionLocal
+        async with factory() as session:
+            yield session.sync_session
+else:
+    def get_read_db(request: Request):
+        """Dependency to get a read-only session: the replica, or the primary right after a write"""
+        db = read_sessionmaker(request)()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_db(fn, *args):
+    """Run blocking Session work from an async handler without stalling the event loop"""
+    if ASYNC_DB:
+        return await greenlet_spawn(fn, *args)
+    return await run_in_threadpool(fn, *args)
+
+def begin_snapshot(db):
+    """Start a read transaction so every following query sees the same snapshot.
+
+    pysqlite only opens a transaction before DML, so consecutive SELECTs would
+    each see the latest commit; an explicit BEGIN pins them to one snapshot.
+    Postgres gets the same guarantee from REPEATABLE READ.
+    """
+    if db.bind.dialect.name == "sqlite":
+        db.execute(text("BEGIN"))
+    else:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+
+def upsert_insert(db):
+    """The dialect's insert() construct, which supports ON CONFLICT, or None if the backend has none"""
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+# Skip create_all and the startup migrations while the stored schema
+# fingerprint matches; 0 runs them on every boot
+SCHEMA_FINGERPRINT_CHECK = os.getenv("DATABASE_SCHEMA_FINGERPRINT", "1") != "0"
+
+
+def init_db() -> bool:
+    """Initialize database tables and bring existing data up to date.
+
+    Returns False when the schema was already current and nothing ran.
+    """
+    from app.migrations import run_migrations, schema_fingerprint, store_fingerprint, stored_fingerprint
+    from app.utils import versions
+
+    fingerprint = schema_fingerprint(engine.dialect)
+    db = SessionLocal()
+    try:
+        if SCHEMA_FINGERPRINT_CHECK and stored_fingerprint(db) == fingerprint:
+            return False
+        Base.metadata.create_all(bind=engine)
+        run_migrations(db)
+        versions.seed(db)
+        store_fingerprint(db, fingerprint)
+        db.commit()
+        return True
+    finally:
+        db.close()
@@ -1,10 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
 
-from app.database import init_db
-from app.routers import nodes, links, tasks, skills, goals, cards, income, expenses, investments, journal
+from app.database import ASYNC_DB, DATABASE_READ_URL, READ_AFTER_WRITE_HEADER, async_engine, async_read_engine, engine, init_db, pool_stats, read_engine
+from app.utils.async_routes import run_routes_on_event_loop
+from app.utils.metrics import METRICS_ENABLED, MetricsMiddleware, registry
+from app.utils.position_buffer import position_buffer
+from app.utils.profiling import PROFILE_ID_HEADER, PROFILING_ENABLED, ProfilingMiddleware, profile_response, profile_threadpool_calls
+from app.utils.read_your_writes import ReadYourWritesMiddleware
+from app.utils.warmup import WARMUP_ENABLED, readiness, warm_up
+from app.routers import nodes, links, tasks, skills, goals, cards, income, expenses, investments, journal, bootstrap, finance, tags, export, media, graph
 
 load_dotenv()
 
@@ -24,8 +34,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", READ_AFTER_WRITE_HEADER, PROFILE_ID_HEADER],
 )
 
+# Tell writers when they wrote, so their next reads skip the lagging replica
+if DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress larger payloads (bootstrap snapshot, big lists)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Debug mode: X-Profile requests are profiled, repeated SQL is logged as N+1
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so latency includes compression and every other middleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(nodes.router)
 app.include_router(links.router)
@@ -37,17 +63,57 @@ app.include_router(income.router)
 app.include_router(expenses.router)
 app.include_router(investments.router)
 app.include_router(journal.router)
+app.include_router(bootstrap.router)
+app.include_router(finance.router)
+app.include_router(tags.router)
+app.include_router(export.router)
+app.include_router(media.router)
+app.include_router(graph.router)
+
+if ASYNC_DB:
+    run_routes_on_event_loop(app)
+
+if PROFILING_ENABLED:
+    profile_threadpool_calls(app)
 
 
 @app.on_event("startup")
 def startup_event():
     """Initialize database on startup"""
-    init_db()
-    print("✅ Database initialized")
+    started = time.perf_counter()
+    migrated = init_db()
+    readiness.report["schema"] = "migrated" if migrated else "current"
+    readiness.record("init_db", started)
+    print("✅ Database initialized" if migrated else "✅ Database schema current, migrations skipped")
     print("✅ Mind Space API is running")
     print("📚 API Docs: http://localhost:8000/docs")
 
 
+@app.on_event("startup")
+async def start_warm_up():
+    """Warm pools and hot queries in the background; /api/ready turns 200 when done"""
+    if WARMUP_ENABLED:
+        readiness.task = asyncio.create_task(warm_up(app))
+    else:
+        readiness.mark_ready()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Write any buffered node positions before the process exits"""
+    position_buffer.flush()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """Close pooled async connections; each aiosqlite connection holds a thread"""
+    if readiness.task is not None:
+        readiness.task.cancel()
+    for pooled in (async_engine, async_read_engine):
+        if pooled is not None:
+            await pooled.dispose()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint"""
@@ -60,5 +126,33 @@ def read_root():
 
 @app.get("/api/health")
 def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "Mind Space API"}
+    """Health check endpoint, with connection pool usage"""
+    database = {"dialect": engine.dialect.name, "pool": pool_stats(engine)}
+    if async_engine is not None:
+        database["async_pool"] = pool_stats(async_engine.sync_engine)
+    if read_engine is not None:
+        database["read_pool"] = pool_stats(read_engine)
+    if async_read_engine is not None:
+        database["async_read_pool"] = pool_stats(async_read_engine.sync_engine)
+    return {"status": "healthy", "service": "Mind Space API", "database": database}
+
+
+@app.get("/api/ready")
+def readiness_check():
+    """Readiness probe: 503 until startup, including the optional warm-up, has finished"""
+    body = {"status": "ready" if readiness.ready else "starting", **readiness.report}
+    return JSONResponse(body, status_code=200 if readiness.ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, SQL and pool metrics in Prometheus text format"""
+    if not METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/debug/profiles/{profile_id}", include_in_schema=False)
+def download_profile(profile_id: str, format: str = "prof"):
+    """A profile recorded for an X-Profile request; format=text for a pstats report"""
+    return profile_response(profile_id, format)
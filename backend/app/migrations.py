@@ -0,0 +1,262 @@
+"""Idempotent data migrations, run at startup after the tables are created.
+
+Each step checks whether its work is still needed, so running them on every
+boot is safe. init_db skips them (and create_all) while the stored schema
+fingerprint matches the models and this module.
+"""
+from sqlalchemy import String, bindparam, cast, inspect, or_, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+from datetime import date, datetime
+from typing import Optional
+import hashlib
+import json
+import logging
+import sys
+from app import models
+from app.database import Base
+from app.utils import degrees, journal_search, rollups, tag_index
+from app.utils.blobs import externalize
+
+logger = logging.getLogger(__name__)
+
+
+# Formats older clients wrote into the free-form date columns, tried after ISO 8601
+LEGACY_DATE_FORMATS = (
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%d.%m.%Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d %b %Y",
+    "%d %B %Y",
+)
+
+
+def parse_legacy_date(value) -> Optional[date]:
+    """The calendar date an old free-form date string stands for, or None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        pass
+    for pattern in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, pattern).date()
+        except ValueError:
+            continue
+    try:
+        # JavaScript's Date.toString(): "Fri Jan 05 2024 10:00:00 GMT+0100 (...)"
+        return datetime.strptime(" ".join(value.split()[:4]), "%a %b %d %Y").date()
+    except ValueError:
+        return None
+
+
+def quarantine_rows(db: Session, model, ids: list, reason: str):
+    """Move rows a migration cannot convert into quarantined_rows, verbatim.
+
+    They are read and deleted with plain SQL, since loading them through the
+    model is what fails. Their tag index and search index entries go too.
+    """
+    table = model.__tablename__
+    by_id = bindparam("ids", expanding=True)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = db.execute(text(f"SELECT * FROM {table} WHERE id IN :ids").bindparams(by_id), {"ids": chunk})
+        db.add_all([
+            models.QuarantinedRow(
+                table_name=table,
+                row_id=row.id,
+                reason=reason,
+                data=json.loads(json.dumps(dict(row._mapping), default=str)),
+            )
+            for row in rows
+        ])
+        db.execute(text(f"DELETE FROM {table} WHERE id IN :ids").bindparams(by_id), {"ids": chunk})
+        db.query(models.EntityTag).filter(
+            models.EntityTag.entity_type == tag_index.ENTITY_TYPES[model],
+            models.EntityTag.entity_id.in_(chunk)
+        ).delete(synchronize_session=False)
+        if model is models.JournalEntry:
+            for entry_id in chunk:
+                journal_search.remove_entry(db, entry_id)
+    logger.warning(
+        "Quarantined %d %s rows (%s): %s; they are kept in the quarantined_rows table",
+        len(ids), table, reason, ", ".join(ids[:20]) + (" ..." if len(ids) > 20 else ""),
+    )
+
+
+def convert_date_columns(db: Session):
+    """Turn the old free-form date strings into real DATE values.
+
+    Every value that isn't already a valid YYYY-MM-DD is parsed in Python
+    (ISO timestamps, plus LEGACY_DATE_FORMATS) and rewritten as one. Rows
+    whose date can't be parsed are quarantined rather than left in the
+    column, where every read of them would fail. SQLite keeps DATE as ISO
+    text; Postgres then gets the column type changed in place.
+    """
+    dialect = db.bind.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+    quarantined_ledger = False
+    for model in (models.Income, models.Expense, models.Investment, models.JournalEntry):
+        table = model.__tablename__
+        if dialect == "sqlite":
+            # With a modifier, date() normalizes or rejects anything that isn't a
+            # valid YYYY-MM-DD (bare date() lets "2024-02-30" through)
+            candidates = db.execute(text(f"SELECT id, date FROM {table} WHERE date(date, '+0 days') IS NOT date"))
+        else:
+            column = next(c for c in inspect(db.connection()).get_columns(table) if c["name"] == "date")
+            if column["type"].__class__.__name__ == "DATE":
+                continue
+            candidates = db.execute(text(f"SELECT id, date FROM {table} WHERE date IS NOT NULL"))
+
+        fixed, unparseable = [], []
+        for row_id, value in candidates.all():
+            parsed = parse_legacy_date(value)
+            if parsed is None:
+                unparseable.append(row_id)
+            elif parsed.isoformat() != value:
+                fixed.append({"id": row_id, "date": parsed.isoformat()})
+        if fixed:
+            db.execute(text(f"UPDATE {table} SET date = :date WHERE id = :id"), fixed)
+        if unparseable:
+            quarantine_rows(db, model, unparseable, "unparseable date")
+            quarantined_ledger = quarantined_ledger or model in rollups.KINDS
+        if dialect == "postgresql":
+            db.execute(text(f"ALTER TABLE {table} ALTER COLUMN date TYPE DATE USING date::date"))
+
+    if quarantined_ledger and db.query(models.FinanceRollup).first() is not None:
+        rollups.rebuild(db)
+
+
+def add_link_pairs(db: Session):
+    """Fill the canonical link pair columns, dropping duplicate links first.
+
+    Older databases could hold both A-B and B-A (or the same pair twice);
+    one link per pair is kept so the unique index can be built.
+    """
+    columns = {column["name"] for column in inspect(db.connection()).get_columns("links")}
+    if "pair_lo" not in columns:
+        db.execute(text("ALTER TABLE links ADD COLUMN pair_lo VARCHAR"))
+        db.execute(text("ALTER TABLE links ADD COLUMN pair_hi VARCHAR"))
+    elif db.query(models.Link.id).filter(models.Link.pair_lo.is_(None)).first() is None:
+        return
+    db.execute(text(
+        "UPDATE links SET "
+        "pair_lo = CASE WHEN source_id < target_id THEN source_id ELSE target_id END, "
+        "pair_hi = CASE WHEN source_id < target_id THEN target_id ELSE source_id END "
+        "WHERE pair_lo IS NULL"
+    ))
+    db.execute(text(
+        "DELETE FROM links WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM links GROUP BY pair_lo, pair_hi) AS keep)"
+    ))
+
+
+def add_node_degrees(db: Session):
+    """Add the maintained degree column and count the existing links into it"""
+    columns = {column["name"] for column in inspect(db.connection()).get_columns("nodes")}
+    if "degree" in columns:
+        return
+    db.execute(text("ALTER TABLE nodes ADD COLUMN degree INTEGER NOT NULL DEFAULT 0"))
+    degrees.rebuild(db)
+
+
+def create_missing_indexes(db: Session):
+    """create_all skips tables that already exist, so add any newer indexes"""
+    connection = db.connection()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+
+def backfill_finance_rollups(db: Session):
+    """Build the monthly rollups for databases that predate them"""
+    if db.query(models.FinanceRollup).first() is not None:
+        return
+    if not any(db.query(model).first() is not None for model in rollups.KINDS):
+        return
+    rollups.rebuild(db)
+
+
+def backfill_entity_tags(db: Session):
+    """Build the tag index for databases that predate it"""
+    if db.query(models.EntityTag).first() is not None:
+        return
+    if not any(db.query(model).first() is not None for model in tag_index.ENTITY_TYPES):
+        return
+    tag_index.rebuild(db)
+
+
+def externalize_journal_media(db: Session):
+    """Move data URLs still inlined in journal rows into the blob store"""
+    inlined = db.query(models.JournalEntry).filter(or_(
+        cast(models.JournalEntry.photos, String).like("%data:%"),
+        cast(models.JournalEntry.voice_notes, String).like("%data:%")
+    ))
+    for entry in inlined.yield_per(50):
+        entry.photos = externalize(entry.photos)
+        entry.voice_notes = externalize(entry.voice_notes)
+
+
+def build_journal_search_index(db: Session):
+    """Create the full-text index and fill it for databases that predate it"""
+    journal_search.create_index(db)
+    if not journal_search.enabled(db) or not journal_search.is_empty(db):
+        return
+    if db.query(models.JournalEntry).first() is not None:
+        journal_search.rebuild(db)
+
+
+MIGRATIONS = [
+    convert_date_columns,
+    add_link_pairs,
+    add_node_degrees,
+    create_missing_indexes,
+    backfill_finance_rollups,
+    backfill_entity_tags,
+    externalize_journal_media,
+    build_journal_search_index,
+]
+
+
+def run_migrations(db: Session):
+    """Apply every migration step, committing after each one"""
+    for migration in MIGRATIONS:
+        migration(db)
+        db.commit()
+
+
+def schema_fingerprint(dialect) -> str:
+    """Hash of the DDL the models compile to on this dialect, plus this module's source.
+
+    Any model change (column, index, table) or any edit to a migration step
+    produces a new fingerprint, and with it a full create_all + migrations run.
+    """
+    digest = hashlib.sha256(dialect.name.encode())
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    with open(sys.modules[__name__].__file__, "rb") as source:
+        digest.update(source.read())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(db: Session) -> Optional[str]:
+    """The fingerprint recorded by the last full startup, or None on a database that predates it"""
+    try:
+        row = db.query(models.SchemaFingerprint.fingerprint).filter(models.SchemaFingerprint.id == 1).first()
+    except (OperationalError, ProgrammingError):
+        db.rollback()  # no such table yet
+        return None
+    return row[0] if row else None
+
+
+def store_fingerprint(db: Session, fingerprint: str):
+    db.merge(models.SchemaFingerprint(id=1, fingerprint=fingerprint))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Float, DateTime, ForeignKey, Enum, JSON, Boolean
+from sqlalchemy import Column, String, Text, Integer, Float, Date, DateTime, ForeignKey, Enum, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -35,26 +35,33 @@ class Node(Base):
     y = Column(Float, nullable=True)
     progress = Column(Integer, nullable=True)
     completed = Column(Boolean, default=False)
+    # Number of link ends on this node, kept up to date by the link and node writes
+    degree = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    outgoing_links = relationship("Link", foreign_keys="Link.source_id", back_populates="source_node", cascade="all, delete-orphan")
-    incoming_links = relationship("Link", foreign_keys="Link.target_id", back_populates="target_node", cascade="all, delete-orphan")
+    outgoing_links = relationship("Link", foreign_keys="Link.source_id", back_populates="source_node", cascade="all, delete-orphan", passive_deletes=True)
+    incoming_links = relationship("Link", foreign_keys="Link.target_id", back_populates="target_node", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Link(Base):
     __tablename__ = "links"
     
     id = Column(String, primary_key=True, index=True)
-    source_id = Column(String, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False)
-    target_id = Column(String, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False)
+    source_id = Column(String, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False, index=True)
+    target_id = Column(String, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Endpoints in sorted order, so A-B and B-A collide on the unique index
+    pair_lo = Column(String, nullable=False)
+    pair_hi = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     source_node = relationship("Node", foreign_keys=[source_id], back_populates="outgoing_links")
     target_node = relationship("Node", foreign_keys=[target_id], back_populates="incoming_links")
 
+    __table_args__ = (Index("ux_links_pair", "pair_lo", "pair_hi", unique=True),)
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -135,8 +142,13 @@ class Income(Base):
     source = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     tags = Column(JSON, default=list)
-    date = Column(String, nullable=False)  # ISO date string
+    date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Serves date range filters and the (date, id) list ordering
+    __table_args__ = (
+        Index("ix_income_date_id", "date", "id"),
+    )
 
 
 class Expense(Base):
@@ -146,8 +158,13 @@ class Expense(Base):
     source = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     tags = Column(JSON, default=list)
-    date = Column(String, nullable=False)  # ISO date string
+    date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Serves date range filters and the (date, id) list ordering
+    __table_args__ = (
+        Index("ix_expenses_date_id", "date", "id"),
+    )
 
 
 class Investment(Base):
@@ -157,8 +174,13 @@ class Investment(Base):
     source = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     tags = Column(JSON, default=list)
-    date = Column(String, nullable=False)  # ISO date string
+    date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Serves date range filters and the (date, id) list ordering
+    __table_args__ = (
+        Index("ix_investments_date_id", "date", "id"),
+    )
 
 
 class JournalEntry(Base):
@@ -170,6 +192,54 @@ class JournalEntry(Base):
     photos = Column(JSON, default=list)
     voice_notes = Column(JSON, default=list)
     tags = Column(JSON, default=list)
-    date = Column(String, nullable=False)  # ISO date string
+    date = Column(Date, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class FinanceRollup(Base):
+    __tablename__ = "finance_rollups"
+    
+    kind = Column(String, primary_key=True)  # income, expense or investment
+    period = Column(String, primary_key=True)  # YYYY-MM
+    tag = Column(String, primary_key=True, default="")  # "" holds the period total
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class EntityTag(Base):
+    __tablename__ = "entity_tags"
+    
+    entity_type = Column(String, primary_key=True)  # income, expense, investment or journal
+    entity_id = Column(String, primary_key=True)
+    tag = Column(String, primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_entity_tags_tag", "tag", "entity_type"),
+    )
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+    
+    name = Column(String, primary_key=True)  # table name
+    version = Column(Integer, nullable=False, default=0)  # bumped by every commit that writes the table
+
+
+class SchemaFingerprint(Base):
+    __tablename__ = "schema_fingerprint"
+    
+    id = Column(Integer, primary_key=True)  # single row, id 1
+    fingerprint = Column(String, nullable=False)  # hash of the table DDL and the migrations (see app.migrations)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+class QuarantinedRow(Base):
+    __tablename__ = "quarantined_rows"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String, nullable=False, index=True)
+    row_id = Column(String, nullable=False)
+    reason = Column(String, nullable=False)  # why a migration could not convert the row
+    data = Column(JSON, nullable=False)  # the row as it was, for manual repair
+    quarantined_at = Column(DateTime, default=datetime.utcnow)
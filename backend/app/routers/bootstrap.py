@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session, selectinload
+from app import models, schemas
+from app.database import get_read_db, begin_snapshot
+from app.routers.links import serialize_link
+from app.utils.position_buffer import position_buffer
+from app.utils import fast_json
+from app.utils.versions import ETag
+
+router = APIRouter(prefix="/api/bootstrap", tags=["bootstrap"])
+
+BOOTSTRAP_TABLES = (
+    "nodes", "links", "tasks", "subtasks", "skills", "goals", "cards", "income", "expenses", "investments"
+)
+
+
+@router.get("/", response_model=schemas.Bootstrap)
+def get_bootstrap(
+    etag: str = Depends(ETag(*BOOTSTRAP_TABLES, before=position_buffer.flush)),
+    db: Session = Depends(get_read_db)
+):
+    """Get everything the app needs on load in one consistent snapshot"""
+    begin_snapshot(db)
+    snapshot = {
+        "nodes": db.query(models.Node).all(),
+        "links": [serialize_link(link) for link in db.query(models.Link).all()],
+        "tasks": db.query(models.Task).options(selectinload(models.Task.subtasks)).all(),
+        "skills": db.query(models.Skill).all(),
+        "goals": db.query(models.Goal).all(),
+        "cards": db.query(models.Card).all(),
+        "income": db.query(models.Income).order_by(models.Income.date.desc()).all(),
+        "expenses": db.query(models.Expense).order_by(models.Expense.date.desc()).all(),
+        "investments": db.query(models.Investment).order_by(models.Investment.date.desc()).all(),
+    }
+    if fast_json.FAST_JSON_ENABLED:
+        content = fast_json.dumps(schemas.Bootstrap, snapshot)
+    else:
+        content = schemas.Bootstrap.model_validate(snapshot, from_attributes=True).model_dump_json(by_alias=True)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
@@ -1,23 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.fast_json import json_list
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/cards", tags=["cards"])
 
 
-@router.get("/", response_model=List[schemas.Card])
-def get_cards(db: Session = Depends(get_db)):
-    """Get all cards"""
-    cards = db.query(models.Card).all()
-    return cards
+@router.get("/", response_model=List[schemas.Card], dependencies=[Depends(ETag("cards"))])
+def get_cards(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all cards, optionally one page at a time ordered by (created_at, id)"""
+    cards = paginate(db.query(models.Card), [models.Card.created_at, models.Card.id], response, limit, after)
+    return json_list(schemas.Card, cards, response)
 
 
 @router.get("/{card_id}", response_model=schemas.Card)
-def get_card(card_id: str, db: Session = Depends(get_db)):
+def get_card(card_id: str, db: Session = Depends(get_read_db)):
     """Get a single card by ID"""
     card = db.query(models.Card).filter(models.Card.id == card_id).first()
     if not card:
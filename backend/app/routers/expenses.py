@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.date_range import DateRange
+from app.utils import rollups, tag_index
+from app.utils.fast_json import json_list
+from app.utils.importer import import_transactions
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/expenses", tags=["expenses"])
 
 
-@router.get("/", response_model=List[schemas.Expense])
-def get_expenses(db: Session = Depends(get_db)):
-    """Get all expense entries, sorted by date descending"""
-    expenses = db.query(models.Expense).order_by(models.Expense.date.desc()).all()
-    return expenses
+@router.get("/", response_model=List[schemas.Expense], dependencies=[Depends(ETag("expenses", "entity_tags"))])
+def get_expenses(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    tag_filter: tag_index.TagFilter = Depends(),
+    date_range: DateRange = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """Get all expense entries, sorted by (date, id) descending, optionally one page at a time"""
+    query = tag_filter.apply(db.query(models.Expense), models.Expense)
+    query = date_range.apply(query, models.Expense.date)
+    expenses = paginate(query, [models.Expense.date, models.Expense.id], response, limit, after, descending=True)
+    return json_list(schemas.Expense, expenses, response)
 
 
 @router.get("/{expense_id}", response_model=schemas.Expense)
-def get_expense(expense_id: str, db: Session = Depends(get_db)):
+def get_expense(expense_id: str, db: Session = Depends(get_read_db)):
     """Get a single expense entry by ID"""
     expense = db.query(models.Expense).filter(models.Expense.id == expense_id).first()
     if not expense:
@@ -35,6 +50,8 @@ def create_expense(expense: schemas.TransactionCreate, db: Session = Depends(get
             **expense.model_dump()
         )
         db.add(db_expense)
+        rollups.apply_transaction(db, db_expense)
+        tag_index.sync_tags(db, db_expense)
         db.commit()
         db.refresh(db_expense)
         return db_expense
@@ -46,6 +63,16 @@ def create_expense(expense: schemas.TransactionCreate, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_expenses(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    """Bulk-import expense entries from a streamed CSV or NDJSON body"""
+    return await import_transactions(request, db, models.Expense, "exp", format)
+
+
 @router.delete("/{expense_id}", status_code=204)
 def delete_expense(expense_id: str, db: Session = Depends(get_db)):
     """Delete an expense entry"""
@@ -54,6 +81,8 @@ def delete_expense(expense_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Expense entry not found")
     
     try:
+        rollups.apply_transaction(db, db_expense, sign=-1)
+        tag_index.clear_tags(db, db_expense)
         db.delete(db_expense)
         db.commit()
         return None
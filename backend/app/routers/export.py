@@ -0,0 +1,119 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+from typing import Optional
+from app import models, schemas
+from app.database import begin_snapshot, read_sessionmaker
+from app.routers.links import serialize_link
+import csv
+import io
+import json
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Rows fetched per round-trip and lines sent per chunk
+YIELD_PER = 500
+CHUNK_LINES = 500
+
+# Export name -> (model, schema, default ordering); every list endpoint's data
+ENTITIES = {
+    "nodes": (models.Node, schemas.Node, models.Node.created_at),
+    "links": (models.Link, schemas.Link, models.Link.created_at),
+    "tasks": (models.Task, schemas.Task, models.Task.created_at),
+    "subtasks": (models.Subtask, schemas.Subtask, models.Subtask.created_at),
+    "skills": (models.Skill, schemas.Skill, models.Skill.created_at),
+    "goals": (models.Goal, schemas.Goal, models.Goal.created_at),
+    "cards": (models.Card, schemas.Card, models.Card.created_at),
+    "income": (models.Income, schemas.Income, models.Income.date),
+    "expenses": (models.Expense, schemas.Expense, models.Expense.date),
+    "investments": (models.Investment, schemas.Investment, models.Investment.date),
+    "journal": (models.JournalEntry, schemas.JournalEntry, models.JournalEntry.created_at),
+}
+
+# Subtasks are nested inside their tasks in the full NDJSON export
+NDJSON_ENTITIES = [name for name in ENTITIES if name != "subtasks"]
+
+
+def _rows(db, name: str):
+    """Stream one entity as API-shaped dicts without loading the table"""
+    model, schema, order = ENTITIES[name]
+    query = db.query(model).order_by(order, model.id)
+    if model is models.Task:
+        query = query.options(selectinload(models.Task.subtasks))
+    for row in query.yield_per(YIELD_PER):
+        data = serialize_link(row) if model is models.Link else row
+        yield schema.model_validate(data, from_attributes=True).model_dump(mode="json", by_alias=True)
+
+
+def _csv_cell(value):
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return ";".join(value)  # same tag format the CSV import accepts
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _chunks(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_LINES:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _stream(session_factory, lines_for):
+    """Run a line generator on its own session so it outlives the request scope"""
+    db = session_factory()
+    try:
+        begin_snapshot(db)
+        yield from _chunks(lines_for(db))
+    finally:
+        db.close()
+
+
+def _ndjson_lines(db, entities):
+    for name in entities:
+        for data in _rows(db, name):
+            yield json.dumps({"type": name, "data": data}, separators=(",", ":")) + "\n"
+
+
+def _csv_lines(db, name: str):
+    buffer = io.StringIO()
+    writer = None
+    for data in _rows(db, name):
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(data.keys()))
+            writer.writeheader()
+        writer.writerow({key: _csv_cell(value) for key, value in data.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@router.get("/")
+def export_data(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    entity: Optional[str] = Query(None, pattern=f"^({'|'.join(ENTITIES)})$")
+):
+    """Stream a full-account backup as NDJSON, or a single entity as CSV"""
+    stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    if format == "csv":
+        if not entity:
+            raise HTTPException(status_code=400, detail="CSV export needs ?entity=")
+        return StreamingResponse(
+            _stream(read_sessionmaker(request), lambda db: _csv_lines(db, entity)),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="mindspace-{entity}-{stamp}.csv"'}
+        )
+
+    entities = [entity] if entity else NDJSON_ENTITIES
+    return StreamingResponse(
+        _stream(read_sessionmaker(request), lambda db: _ndjson_lines(db, entities)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="mindspace-export-{stamp}.ndjson"'}
+    )
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app import models, schemas
+from app.database import get_read_db
+from app.utils.rollups import TOTAL_TAG
+from app.utils.versions import ETag
+
+router = APIRouter(prefix="/api/finance", tags=["finance"])
+
+# Rollup kind -> summary field
+FIELDS = {"income": "income", "expense": "expenses", "investment": "investments"}
+
+# Rollups are monthly, so bounds are a year or a month; a full date would
+# silently widen to its whole month and is rejected instead
+PERIOD_PATTERN = r"^\d{4}(-\d{2})?$"
+
+
+@router.get("/summary", response_model=schemas.FinanceSummary, dependencies=[Depends(ETag("finance_rollups"))])
+def get_finance_summary(
+    date_from: Optional[str] = Query(None, alias="from", pattern=PERIOD_PATTERN),
+    date_to: Optional[str] = Query(None, alias="to", pattern=PERIOD_PATTERN),
+    granularity: str = Query("month", pattern="^(month|year)$"),
+    db: Session = Depends(get_read_db)
+):
+    """Get income/expense/investment totals per period and per tag from the monthly rollups.
+
+    `from` and `to` are inclusive and month-granular: YYYY or YYYY-MM.
+    """
+    query = db.query(models.FinanceRollup)
+    if date_from:
+        query = query.filter(models.FinanceRollup.period >= date_from)
+    if date_to:
+        # A bare year ("2024") must include all of its months
+        query = query.filter(models.FinanceRollup.period <= (date_to if len(date_to) > 4 else f"{date_to}-12"))
+
+    periods = {}
+    totals = schemas.FinanceTotals()
+    categories = {field: {} for field in FIELDS.values()}
+    for rollup in query.order_by(models.FinanceRollup.period):
+        field = FIELDS[rollup.kind]
+        if rollup.tag == TOTAL_TAG:
+            key = rollup.period[:4] if granularity == "year" else rollup.period
+            bucket = periods.setdefault(key, schemas.FinancePeriod(period=key))
+            setattr(bucket, field, getattr(bucket, field) + rollup.total)
+            setattr(totals, field, getattr(totals, field) + rollup.total)
+        else:
+            categories[field][rollup.tag] = categories[field].get(rollup.tag, 0) + rollup.total
+
+    for bucket in [*periods.values(), totals]:
+        bucket.net = bucket.income - bucket.expenses
+
+    return schemas.FinanceSummary(
+        granularity=granularity,
+        periods=list(periods.values()),
+        totals=totals,
+        categories=categories
+    )
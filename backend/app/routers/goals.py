@@ -1,23 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.fast_json import json_list
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/goals", tags=["goals"])
 
 
-@router.get("/", response_model=List[schemas.Goal])
-def get_goals(db: Session = Depends(get_db)):
-    """Get all goals"""
-    goals = db.query(models.Goal).all()
-    return goals
+@router.get("/", response_model=List[schemas.Goal], dependencies=[Depends(ETag("goals"))])
+def get_goals(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all goals, optionally one page at a time ordered by (created_at, id)"""
+    goals = paginate(db.query(models.Goal), [models.Goal.created_at, models.Goal.id], response, limit, after)
+    return json_list(schemas.Goal, goals, response)
 
 
 @router.get("/{goal_id}", response_model=schemas.Goal)
-def get_goal(goal_id: str, db: Session = Depends(get_db)):
+def get_goal(goal_id: str, db: Session = Depends(get_read_db)):
     """Get a single goal by ID"""
     goal = db.query(models.Goal).filter(models.Goal.id == goal_id).first()
     if not goal:
@@ -25,11 +33,22 @@ def get_goal(goal_id: str, db: Session = Depends(get_db)):
     return goal
 
 
-@router.get("/{goal_id}/tasks", response_model=List[schemas.Task])
-def get_goal_tasks(goal_id: str, db: Session = Depends(get_db)):
-    """Get all tasks linked to a goal"""
-    tasks = db.query(models.Task).filter(models.Task.goal_id == goal_id).all()
-    return tasks
+@router.get(
+    "/{goal_id}/tasks",
+    response_model=List[schemas.Task],
+    dependencies=[Depends(ETag("goals", "tasks", "subtasks"))]
+)
+def get_goal_tasks(
+    goal_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all tasks linked to a goal, optionally one page at a time ordered by (created_at, id)"""
+    query = db.query(models.Task).options(selectinload(models.Task.subtasks)).filter(models.Task.goal_id == goal_id)
+    tasks = paginate(query, [models.Task.created_at, models.Task.id], response, limit, after)
+    return json_list(schemas.Task, tasks, response)
 
 
 @router.post("/", response_model=schemas.Goal, status_code=201)
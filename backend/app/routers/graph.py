@@ -0,0 +1,143 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import get_db, get_sync_db
+from app.routers.links import serialize_link
+from app.utils import layout
+from app.utils.graph_index import ADJACENCY_INDEX_ENABLED, adjacency_index, connected_components, neighborhood_sql
+from app.utils.position_buffer import position_buffer, write_positions
+from app.utils.versions import PrimaryETag
+import numpy as np
+import time
+
+router = APIRouter(prefix="/api/graph", tags=["graph"])
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+ID_CHUNK = 900
+
+
+def _chunks(ids: list):
+    for i in range(0, len(ids), ID_CHUNK):
+        yield ids[i:i + ID_CHUNK]
+
+
+@router.get(
+    "/neighborhood/{node_id}",
+    response_model=schemas.Subgraph,
+    # Primary, not replica: the adjacency index must be built from current data
+    dependencies=[Depends(PrimaryETag("nodes", "links", before=position_buffer.flush))]
+)
+def get_neighborhood(
+    node_id: str,
+    depth: int = Query(1, ge=1, le=6),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get the nodes within `depth` hops of a node and the links between them"""
+    if db.query(models.Node.id).filter(models.Node.id == node_id).first() is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+
+    if ADJACENCY_INDEX_ENABLED:
+        node_ids, truncated = adjacency_index.neighborhood(db, node_id, depth, limit)
+        link_ids = adjacency_index.induced_links(db, node_ids)
+        links = [
+            link
+            for chunk in _chunks(link_ids)
+            for link in db.query(models.Link).filter(models.Link.id.in_(chunk))
+        ]
+    else:
+        node_ids, truncated = neighborhood_sql(db, node_id, depth, limit)
+        members = set(node_ids)
+        links = [
+            link
+            for chunk in _chunks(node_ids)
+            for link in db.query(models.Link).filter(models.Link.source_id.in_(chunk))
+            if link.target_id in members
+        ]
+
+    order = {node_id: i for i, node_id in enumerate(node_ids)}
+    nodes = [node for chunk in _chunks(node_ids) for node in db.query(models.Node).filter(models.Node.id.in_(chunk))]
+    nodes.sort(key=lambda node: order[node.id])
+    return {"nodes": nodes, "links": [serialize_link(link) for link in links], "truncated": truncated}
+
+
+@router.get("/stats", response_model=schemas.GraphStats, dependencies=[Depends(PrimaryETag("nodes", "links"))])
+def get_graph_stats(top: int = Query(5, ge=1, le=100), db: Session = Depends(get_db)):
+    """Node type counts, orphans, best-connected nodes and connected components"""
+    types = dict(db.query(models.Node.type, func.count()).group_by(models.Node.type).all())
+    node_ids = [node_id for node_id, in db.query(models.Node.id)]
+    orphans = [node_id for node_id, in db.query(models.Node.id).filter(models.Node.degree == 0).order_by(models.Node.id)]
+    hubs = (
+        db.query(models.Node.id, models.Node.title, models.Node.degree)
+        .filter(models.Node.degree > 0)
+        .order_by(models.Node.degree.desc(), models.Node.id)
+        .limit(top)
+        .all()
+    )
+    if ADJACENCY_INDEX_ENABLED:
+        edges = adjacency_index.edges(db)
+    else:
+        edges = db.query(models.Link.source_id, models.Link.target_id).all()
+    components = connected_components(node_ids, edges)
+    return {
+        "nodes": len(node_ids),
+        "links": len(edges),
+        "types": {node_type.value: count for node_type, count in types.items()},
+        "orphans": orphans,
+        "hubs": [{"id": node_id, "title": title, "degree": degree} for node_id, title, degree in hubs],
+        "components": len(components),
+        "largest_component": components[0] if components else 0,
+    }
+
+
+@router.post("/layout", response_model=schemas.LayoutResult)
+def run_layout(
+    mode: str = Query("incremental", pattern="^(incremental|full)$"),
+    iterations: int = Query(layout.DEFAULT_ITERATIONS, ge=1, le=1000),
+    spacing: float = Query(layout.DEFAULT_SPACING, gt=0, le=10000),
+    # CPU-bound: kept on the threadpool with a sync session even in async mode
+    db: Session = Depends(get_sync_db)
+):
+    """Lay out the stored graph with a force-directed simulation and save the positions.
+
+    incremental only places nodes that have no position yet, treating every
+    positioned node as pinned; full relaxes every node, starting from where
+    it is now.
+    """
+    started = time.perf_counter()
+    position_buffer.flush()
+    rows = db.query(models.Node.id, models.Node.x, models.Node.y).all()
+    index = {row.id: i for i, row in enumerate(rows)}
+    edges = np.array([
+        (index[source_id], index[target_id])
+        for source_id, target_id in db.query(models.Link.source_id, models.Link.target_id)
+        if source_id in index and target_id in index
+    ], dtype=np.int64).reshape(-1, 2)
+    positions = np.array(
+        [(np.nan if row.x is None else row.x, np.nan if row.y is None else row.y) for row in rows],
+        dtype=float
+    ).reshape(-1, 2)
+
+    if mode == "incremental":
+        pinned = ~np.isnan(positions).any(axis=1)
+    else:
+        pinned = np.zeros(len(rows), dtype=bool)
+    moved = np.flatnonzero(~pinned)
+    if len(moved) == 0:
+        return {"moved": 0, "pinned": len(rows), "elapsed_ms": (time.perf_counter() - started) * 1000}
+
+    result = layout.force_layout(positions, edges, pinned, iterations=iterations, spacing=spacing)
+    updates = {rows[i].id: (float(result[i, 0]), float(result[i, 1])) for i in moved}
+    position_buffer.discard(updates)
+    try:
+        write_positions(db, updates)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    return {
+        "moved": len(moved),
+        "pinned": int(pinned.sum()),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.date_range import DateRange
+from app.utils import rollups, tag_index
+from app.utils.fast_json import json_list
+from app.utils.importer import import_transactions
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/income", tags=["income"])
 
 
-@router.get("/", response_model=List[schemas.Income])
-def get_income(db: Session = Depends(get_db)):
-    """Get all income entries, sorted by date descending"""
-    income = db.query(models.Income).order_by(models.Income.date.desc()).all()
-    return income
+@router.get("/", response_model=List[schemas.Income], dependencies=[Depends(ETag("income", "entity_tags"))])
+def get_income(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    tag_filter: tag_index.TagFilter = Depends(),
+    date_range: DateRange = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """Get all income entries, sorted by (date, id) descending, optionally one page at a time"""
+    query = tag_filter.apply(db.query(models.Income), models.Income)
+    query = date_range.apply(query, models.Income.date)
+    income = paginate(query, [models.Income.date, models.Income.id], response, limit, after, descending=True)
+    return json_list(schemas.Income, income, response)
 
 
 @router.get("/{income_id}", response_model=schemas.Income)
-def get_income_entry(income_id: str, db: Session = Depends(get_db)):
+def get_income_entry(income_id: str, db: Session = Depends(get_read_db)):
     """Get a single income entry by ID"""
     income = db.query(models.Income).filter(models.Income.id == income_id).first()
     if not income:
@@ -35,6 +50,8 @@ def create_income(income: schemas.TransactionCreate, db: Session = Depends(get_d
             **income.model_dump()
         )
         db.add(db_income)
+        rollups.apply_transaction(db, db_income)
+        tag_index.sync_tags(db, db_income)
         db.commit()
         db.refresh(db_income)
         return db_income
@@ -46,6 +63,16 @@ def create_income(income: schemas.TransactionCreate, db: Session = Depends(get_d
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_income(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    """Bulk-import income entries from a streamed CSV or NDJSON body"""
+    return await import_transactions(request, db, models.Income, "inc", format)
+
+
 @router.delete("/{income_id}", status_code=204)
 def delete_income(income_id: str, db: Session = Depends(get_db)):
     """Delete an income entry"""
@@ -54,6 +81,8 @@ def delete_income(income_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Income entry not found")
     
     try:
+        rollups.apply_transaction(db, db_income, sign=-1)
+        tag_index.clear_tags(db, db_income)
         db.delete(db_income)
         db.commit()
         return None
@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.date_range import DateRange
+from app.utils import rollups, tag_index
+from app.utils.fast_json import json_list
+from app.utils.importer import import_transactions
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/investments", tags=["investments"])
 
 
-@router.get("/", response_model=List[schemas.Investment])
-def get_investments(db: Session = Depends(get_db)):
-    """Get all investment entries, sorted by date descending"""
-    investments = db.query(models.Investment).order_by(models.Investment.date.desc()).all()
-    return investments
+@router.get("/", response_model=List[schemas.Investment], dependencies=[Depends(ETag("investments", "entity_tags"))])
+def get_investments(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    tag_filter: tag_index.TagFilter = Depends(),
+    date_range: DateRange = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """Get all investment entries, sorted by (date, id) descending, optionally one page at a time"""
+    query = tag_filter.apply(db.query(models.Investment), models.Investment)
+    query = date_range.apply(query, models.Investment.date)
+    investments = paginate(query, [models.Investment.date, models.Investment.id], response, limit, after, descending=True)
+    return json_list(schemas.Investment, investments, response)
 
 
 @router.get("/{investment_id}", response_model=schemas.Investment)
-def get_investment(investment_id: str, db: Session = Depends(get_db)):
+def get_investment(investment_id: str, db: Session = Depends(get_read_db)):
     """Get a single investment entry by ID"""
     investment = db.query(models.Investment).filter(models.Investment.id == investment_id).first()
     if not investment:
@@ -35,6 +50,8 @@ def create_investment(investment: schemas.TransactionCreate, db: Session = Depen
             **investment.model_dump()
         )
         db.add(db_investment)
+        rollups.apply_transaction(db, db_investment)
+        tag_index.sync_tags(db, db_investment)
         db.commit()
         db.refresh(db_investment)
         return db_investment
@@ -46,6 +63,16 @@ def create_investment(investment: schemas.TransactionCreate, db: Session = Depen
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_investments(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db)
+):
+    """Bulk-import investment entries from a streamed CSV or NDJSON body"""
+    return await import_transactions(request, db, models.Investment, "inv", format)
+
+
 @router.delete("/{investment_id}", status_code=204)
 def delete_investment(investment_id: str, db: Session = Depends(get_db)):
     """Delete an investment entry"""
@@ -54,6 +81,8 @@ def delete_investment(investment_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Investment entry not found")
     
     try:
+        rollups.apply_transaction(db, db_investment, sign=-1)
+        tag_index.clear_tags(db, db_investment)
         db.delete(db_investment)
         db.commit()
         return None
@@ -1,23 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.date_range import DateRange
+from app.utils import journal_search, tag_index
+from app.utils.blobs import externalize, release
+from app.utils.fast_json import json_list
 from app.models import JournalEntry as JournalEntryModel
-from app.schemas import JournalEntry, JournalEntryCreate, JournalEntryUpdate
+from app.schemas import JournalEntry, JournalEntryCreate, JournalEntryUpdate, JournalSearchHit
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/journal", tags=["journal"])
 
 
-@router.get("/", response_model=List[JournalEntry])
-def get_journal_entries(db: Session = Depends(get_db)):
-    """Get all journal entries"""
-    entries = db.query(JournalEntryModel).order_by(JournalEntryModel.created_at.desc()).all()
-    return entries
+@router.get("/", response_model=List[JournalEntry], dependencies=[Depends(ETag("journal_entries", "entity_tags"))])
+def get_journal_entries(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    tag_filter: tag_index.TagFilter = Depends(),
+    date_range: DateRange = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """Get all journal entries, newest first by (created_at, id), optionally one page at a time"""
+    query = tag_filter.apply(db.query(JournalEntryModel), JournalEntryModel)
+    query = date_range.apply(query, JournalEntryModel.date)
+    entries = paginate(query, [JournalEntryModel.created_at, JournalEntryModel.id], response, limit, after, descending=True)
+    return json_list(JournalEntry, entries, response)
+
+
+@router.get("/search", response_model=List[JournalSearchHit], dependencies=[Depends(ETag("journal_entries"))])
+def search_journal_entries(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Full-text search over title, content and tags, best matches first"""
+    hits = journal_search.search(db, q, limit)
+    entries = {
+        entry.id: entry
+        for entry in db.query(JournalEntryModel).filter(JournalEntryModel.id.in_([hit[0] for hit in hits]))
+    }
+    return [
+        JournalSearchHit(
+            id=entry_id,
+            title=entries[entry_id].title,
+            date=entries[entry_id].date,
+            tags=entries[entry_id].tags or [],
+            snippet=snippet,
+            score=score
+        )
+        for entry_id, score, snippet in hits
+        if entry_id in entries
+    ]
 
 
 @router.get("/{entry_id}", response_model=JournalEntry)
-def get_journal_entry(entry_id: str, db: Session = Depends(get_db)):
+def get_journal_entry(entry_id: str, db: Session = Depends(get_read_db)):
     """Get a specific journal entry"""
     entry = db.query(JournalEntryModel).filter(JournalEntryModel.id == entry_id).first()
     if not entry:
@@ -29,11 +70,17 @@ def get_journal_entry(entry_id: str, db: Session = Depends(get_db)):
 def create_journal_entry(entry: JournalEntryCreate, db: Session = Depends(get_db)):
     """Create a new journal entry"""
     try:
+        data = entry.model_dump()
+        # Inline data URLs go to the blob store; the row keeps media URLs only
+        data["photos"] = externalize(data["photos"])
+        data["voice_notes"] = externalize(data["voice_notes"])
         db_entry = JournalEntryModel(
             id=f"journal-{uuid.uuid4().hex[:12]}",
-            **entry.model_dump()
+            **data
         )
         db.add(db_entry)
+        tag_index.sync_tags(db, db_entry)
+        journal_search.index_entry(db, db_entry)
         db.commit()
         db.refresh(db_entry)
         return db_entry
@@ -51,10 +98,20 @@ def update_journal_entry(entry_id: str, entry: JournalEntryUpdate, db: Session =
             raise HTTPException(status_code=404, detail="Journal entry not found")
         
         update_data = entry.model_dump(exclude_unset=True)
+        dropped = set()
+        for key in ("photos", "voice_notes"):
+            if update_data.get(key) is not None:
+                update_data[key] = externalize(update_data[key])
+                dropped.update(set(getattr(db_entry, key) or []) - set(update_data[key]))
         for key, value in update_data.items():
             setattr(db_entry, key, value)
+        if "tags" in update_data:
+            tag_index.sync_tags(db, db_entry)
+        if update_data.keys() & {"title", "content", "tags"}:
+            journal_search.index_entry(db, db_entry)
         
         db.commit()
+        release(db, dropped)  # media replaced by this update
         db.refresh(db_entry)
         return db_entry
     except HTTPException:
@@ -72,8 +129,12 @@ def delete_journal_entry(entry_id: str, db: Session = Depends(get_db)):
         if not db_entry:
             raise HTTPException(status_code=404, detail="Journal entry not found")
         
+        media = [*(db_entry.photos or []), *(db_entry.voice_notes or [])]
+        tag_index.clear_tags(db, db_entry)
+        journal_search.remove_entry(db, db_entry.id)
         db.delete(db_entry)
         db.commit()
+        release(db, media)
         return None
     except HTTPException:
         raise
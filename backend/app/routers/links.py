@@ -1,88 +1,171 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db, upsert_insert
+from app.utils import degrees
+from app.utils.fast_json import json_list
+from app.utils.graph_index import adjacency_index
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/links", tags=["links"])
 
+MAX_BULK_LINKS = 5000
 
-@router.get("/", response_model=List[schemas.Link])
-def get_links(db: Session = Depends(get_db)):
-    """Get all links"""
-    links = db.query(models.Link).all()
-    return [
-        {
-            "id": link.id,
-            "source": link.source_id,
-            "target": link.target_id,
-            "source_id": link.source_id,
-            "target_id": link.target_id,
-            "created_at": link.created_at
-        }
-        for link in links
-    ]
-
-
-@router.get("/node/{node_id}", response_model=List[schemas.Link])
-def get_node_links(node_id: str, db: Session = Depends(get_db)):
+
+def serialize_link(link: models.Link) -> dict:
+    """Map a Link row to the shape the frontend expects (source/target ids)"""
+    return {
+        "id": link.id,
+        "source": link.source_id,
+        "target": link.target_id,
+        "source_id": link.source_id,
+        "target_id": link.target_id,
+        "created_at": link.created_at
+    }
+
+
+@router.get("/", response_model=List[schemas.Link], dependencies=[Depends(ETag("links"))])
+def get_links(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all links, optionally one page at a time ordered by (created_at, id)"""
+    links = paginate(db.query(models.Link), [models.Link.created_at, models.Link.id], response, limit, after)
+    return json_list(schemas.Link, [serialize_link(link) for link in links], response)
+
+
+@router.get("/node/{node_id}", response_model=List[schemas.Link], dependencies=[Depends(ETag("links"))])
+def get_node_links(node_id: str, response: Response, db: Session = Depends(get_read_db)):
     """Get all links for a specific node"""
     links = db.query(models.Link).filter(
         (models.Link.source_id == node_id) | (models.Link.target_id == node_id)
     ).all()
-    return [
-        {
-            "id": link.id,
-            "source": link.source_id,
-            "target": link.target_id,
-            "source_id": link.source_id,
-            "target_id": link.target_id,
-            "created_at": link.created_at
-        }
-        for link in links
-    ]
+    return json_list(schemas.Link, [serialize_link(link) for link in links], response)
+
+
+def canonical_pair(source_id: str, target_id: str) -> tuple:
+    """The (smaller, larger) endpoint ids that identify an undirected link"""
+    return (source_id, target_id) if source_id <= target_id else (target_id, source_id)
+
+
+def _insert_ignoring_duplicates(insert):
+    """INSERT ... ON CONFLICT DO NOTHING on the pair index, returning the new rows"""
+    table = models.Link.__table__
+    return (
+        insert(table)
+        .on_conflict_do_nothing(index_elements=[table.c.pair_lo, table.c.pair_hi])
+        .returning(*table.c)
+    )
+
+
+def _insert_missing(db: Session, rows: list) -> list:
+    """Check-then-insert for backends without ON CONFLICT.
+
+    Not atomic: a concurrent insert of the same pair fails on the unique
+    pair index instead of being skipped.
+    """
+    pairs = [(row["pair_lo"], row["pair_hi"]) for row in rows]
+    existing = set()
+    for i in range(0, len(pairs), 450):
+        existing.update(
+            tuple(pair) for pair in
+            db.query(models.Link.pair_lo, models.Link.pair_hi).filter(
+                tuple_(models.Link.pair_lo, models.Link.pair_hi).in_(pairs[i:i + 450])
+            )
+        )
+    created = [models.Link(**row) for row in rows if (row["pair_lo"], row["pair_hi"]) not in existing]
+    db.add_all(created)
+    db.flush()
+    return created
+
+
+def insert_links(db: Session, pairs: list) -> list:
+    """Insert (source, target) links in one statement; returns only the rows actually created"""
+    if not pairs:
+        return []
+    now = datetime.utcnow()
+    rows = []
+    for source_id, target_id in pairs:
+        pair_lo, pair_hi = canonical_pair(source_id, target_id)
+        rows.append({
+            "id": f"link-{uuid.uuid4().hex[:12]}",
+            "source_id": source_id,
+            "target_id": target_id,
+            "pair_lo": pair_lo,
+            "pair_hi": pair_hi,
+            "created_at": now,
+        })
+    insert = upsert_insert(db)
+    if insert is None:
+        return _insert_missing(db, rows)
+    return db.execute(_insert_ignoring_duplicates(insert), rows).all()
+
+
+def _missing_nodes(db: Session, node_ids: set) -> set:
+    found = set()
+    ids = list(node_ids)
+    for i in range(0, len(ids), 900):
+        found.update(node_id for node_id, in db.query(models.Node.id).filter(models.Node.id.in_(ids[i:i + 900])))
+    return node_ids - found
 
 
 @router.post("/", response_model=schemas.Link, status_code=201)
 def create_link(link: schemas.LinkCreate, db: Session = Depends(get_db)):
     """Create a new link between two nodes"""
-    # Verify both nodes exist
-    source_node = db.query(models.Node).filter(models.Node.id == link.source).first()
-    target_node = db.query(models.Node).filter(models.Node.id == link.target).first()
-    
-    if not source_node or not target_node:
+    if _missing_nodes(db, {link.source, link.target}):
         raise HTTPException(status_code=404, detail="One or both nodes not found")
     
-    # Check if link already exists
-    existing_link = db.query(models.Link).filter(
-        ((models.Link.source_id == link.source) & (models.Link.target_id == link.target)) |
-        ((models.Link.source_id == link.target) & (models.Link.target_id == link.source))
-    ).first()
-    
-    if existing_link:
+    try:
+        created = insert_links(db, [(link.source, link.target)])
+        if created:
+            degrees.apply(db, [(row.source_id, row.target_id) for row in created])
+            db.commit()
+        else:
+            db.rollback()  # nothing was written, so don't move the links version
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Database integrity error: {str(e.orig)}")
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    if not created:
+        # The pair index already holds this link, in one direction or the other
         raise HTTPException(status_code=400, detail="Link already exists")
-    
-    link_id = f"link-{uuid.uuid4().hex[:12]}"
+    db_link = created[0]
+    adjacency_index.add_links(db, [(db_link.id, db_link.source_id, db_link.target_id)])
+    return serialize_link(db_link)
+
+
+@router.post("/bulk", response_model=schemas.LinkBulkResult, status_code=201)
+def create_links_bulk(links: List[schemas.LinkCreate], db: Session = Depends(get_db)):
+    """Create many links in one transaction, reporting the ones that already existed"""
+    if len(links) > MAX_BULK_LINKS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_LINKS} links per request")
+    missing = _missing_nodes(db, {node_id for link in links for node_id in (link.source, link.target)})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Nodes not found: {', '.join(sorted(missing))}")
+
+    # Repeats within the request (in either direction) collapse into one link
+    requested = {}
+    for link in links:
+        requested.setdefault(canonical_pair(link.source, link.target), (link.source, link.target))
+
     try:
-        db_link = models.Link(
-            id=link_id,
-            source_id=link.source,
-            target_id=link.target
-        )
-        db.add(db_link)
-        db.commit()
-        db.refresh(db_link)
-        
-        return {
-            "id": db_link.id,
-            "source": db_link.source_id,
-            "target": db_link.target_id,
-            "source_id": db_link.source_id,
-            "target_id": db_link.target_id,
-            "created_at": db_link.created_at
-        }
+        created = insert_links(db, list(requested.values()))
+        if created:
+            degrees.apply(db, [(row.source_id, row.target_id) for row in created])
+            db.commit()
+        else:
+            db.rollback()  # every pair already existed; nothing was written
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Database integrity error: {str(e.orig)}")
@@ -90,6 +173,20 @@ def create_link(link: schemas.LinkCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+    if created:
+        adjacency_index.add_links(db, [(row.id, row.source_id, row.target_id) for row in created])
+    created_pairs = {(row.pair_lo, row.pair_hi) for row in created}
+    existing_pairs = [pair for pair in requested if pair not in created_pairs]
+    existing = []
+    for i in range(0, len(existing_pairs), 450):
+        existing.extend(db.query(models.Link).filter(
+            tuple_(models.Link.pair_lo, models.Link.pair_hi).in_(existing_pairs[i:i + 450])
+        ))
+    return {
+        "created": [serialize_link(row) for row in created],
+        "existing": [serialize_link(link) for link in existing],
+    }
+
 
 @router.delete("/{link_id}", status_code=204)
 def delete_link(link_id: str, db: Session = Depends(get_db)):
@@ -100,7 +197,9 @@ def delete_link(link_id: str, db: Session = Depends(get_db)):
     
     try:
         db.delete(db_link)
+        degrees.apply(db, [(db_link.source_id, db_link.target_id)], sign=-1)
         db.commit()
+        adjacency_index.remove_link(db, link_id)
         return None
     except Exception as e:
         db.rollback()
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app import schemas
+from app.utils.blobs import blob_store, media_url
+import os
+import re
+
+router = APIRouter(prefix="/api/media", tags=["media"])
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+WRITE_CHUNK_BYTES = 1024 * 1024
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Blobs never change under a digest, so clients may cache them forever
+CACHE_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "Accept-Ranges": "bytes",
+    # Media is already compressed; also keeps GZipMiddleware off ranged bodies
+    "Content-Encoding": "identity",
+    # Browsers must not guess a different (e.g. HTML) type from the bytes
+    "X-Content-Type-Options": "nosniff",
+}
+
+# The upload's Content-Type comes from the client. Only raster images and
+# audio are served inline; anything else (HTML, SVG, scripts...) is sent as
+# a download, so a blob never runs as active content on the API origin
+INLINE_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp", "image/avif", "image/bmp"}
+
+
+def is_inline_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in INLINE_IMAGE_TYPES or media_type.startswith("audio/")
+
+
+@router.post("/", response_model=schemas.MediaBlob, status_code=201)
+async def upload_media(request: Request):
+    """Store the raw request body as a blob (deduplicated by SHA-256)"""
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    writer = await run_in_threadpool(blob_store.writer)
+    received = 0
+    pending = []  # chunks not yet handed to the writer
+    try:
+        # Hashing and disk writes block, so they run on the threadpool, a
+        # WRITE_CHUNK_BYTES batch at a time rather than once per network chunk
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Upload too large")
+            pending.append(chunk)
+            if received - writer.size >= WRITE_CHUNK_BYTES:
+                await run_in_threadpool(writer.write, b"".join(pending))
+                pending = []
+        if pending:
+            await run_in_threadpool(writer.write, b"".join(pending))
+        digest = await run_in_threadpool(writer.commit, content_type)
+    except Exception:
+        await run_in_threadpool(writer.abort)
+        raise
+    return schemas.MediaBlob(id=digest, url=media_url(digest), size=writer.size, content_type=content_type)
+
+
+def _parse_range(header: str, size: int):
+    """Return (start, end) inclusive for a single bytes range, or None if unsatisfiable"""
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def _read(path, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(READ_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/{digest}")
+def get_media(digest: str, request: Request):
+    """Serve a blob, honouring conditional and Range requests; non-media types download as attachments"""
+    if not blob_store.exists(digest):
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    path = blob_store.path(digest)
+    size = path.stat().st_size
+    etag = f'"{digest}"'
+    media_type = blob_store.content_type(digest)
+    headers = {**CACHE_HEADERS, "ETag": etag}
+    if not is_inline_type(media_type):
+        headers["Content-Disposition"] = f'attachment; filename="{digest}"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = byte_range
+        return StreamingResponse(
+            _read(path, start, end),
+            status_code=206,
+            media_type=media_type,
+            headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)}
+        )
+
+    return StreamingResponse(
+        _read(path, 0, size - 1),
+        media_type=media_type,
+        headers={**headers, "Content-Length": str(size)}
+    )
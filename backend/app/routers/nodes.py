@@ -1,24 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils import degrees
+from app.utils.fast_json import json_list
+from app.utils.graph_index import adjacency_index
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.position_buffer import position_buffer, write_positions
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/nodes", tags=["nodes"])
 
+MAX_BULK_DELETE = 5000
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+DELETE_CHUNK = 900
 
-@router.get("/", response_model=List[schemas.Node])
-def get_nodes(db: Session = Depends(get_db)):
-    """Get all nodes"""
-    nodes = db.query(models.Node).all()
-    return nodes
+
+@router.get("/", response_model=List[schemas.Node], dependencies=[Depends(ETag("nodes", before=position_buffer.flush))])
+def get_nodes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all nodes, optionally one page at a time ordered by (created_at, id)"""
+    nodes = paginate(db.query(models.Node), [models.Node.created_at, models.Node.id], response, limit, after)
+    return json_list(schemas.Node, nodes, response)
 
 
 @router.get("/{node_id}", response_model=schemas.Node)
-def get_node(node_id: str, db: Session = Depends(get_db)):
+def get_node(node_id: str, db: Session = Depends(get_read_db)):
     """Get a single node by ID"""
+    position_buffer.flush()
     node = db.query(models.Node).filter(models.Node.id == node_id).first()
     if not node:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -46,6 +63,33 @@ def create_node(node: schemas.NodeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.patch("/positions", response_model=schemas.NodePositionsResult)
+def update_node_positions(
+    positions: List[schemas.NodePosition],
+    flush: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Move many nodes at once.
+
+    Positions are buffered for a short window and written in one batched
+    UPDATE, keeping only the latest position per node; pass ?flush=true
+    (e.g. on drag end) to write immediately.
+    """
+    latest = {position.id: (position.x, position.y) for position in positions}
+    if position_buffer.enabled and not flush:
+        return {"updated": 0, "pending": position_buffer.submit(latest)}
+
+    position_buffer.discard(latest)
+    try:
+        updated = write_positions(db, latest)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    position_buffer.flush()
+    return {"updated": updated, "pending": 0}
+
+
 @router.put("/{node_id}", response_model=schemas.Node)
 def update_node(node_id: str, node_update: schemas.NodeUpdate, db: Session = Depends(get_db)):
     """Update an existing node"""
@@ -54,6 +98,8 @@ def update_node(node_id: str, node_update: schemas.NodeUpdate, db: Session = Dep
         raise HTTPException(status_code=404, detail="Node not found")
     
     update_data = node_update.model_dump(exclude_unset=True)
+    if "x" in update_data or "y" in update_data:
+        position_buffer.discard([node_id])  # this write is newer than anything buffered
     try:
         for key, value in update_data.items():
             setattr(db_node, key, value)
@@ -69,17 +115,59 @@ def update_node(node_id: str, node_update: schemas.NodeUpdate, db: Session = Dep
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+def delete_nodes(db: Session, node_ids: list) -> int:
+    """Delete nodes by id; their links go with them through ON DELETE CASCADE"""
+    # The cascade drops links without telling the surviving endpoints, so
+    # take those links off the neighbours' degrees first
+    removed = set(node_ids)
+    touching = {}
+    for i in range(0, len(node_ids), DELETE_CHUNK):
+        chunk = node_ids[i:i + DELETE_CHUNK]
+        touching.update(
+            (link_id, (source_id, target_id))
+            for link_id, source_id, target_id in db.query(models.Link.id, models.Link.source_id, models.Link.target_id)
+            .filter(or_(models.Link.source_id.in_(chunk), models.Link.target_id.in_(chunk)))
+        )
+    degrees.apply(db, [
+        (source_id, target_id) for source_id, target_id in touching.values()
+        if source_id not in removed or target_id not in removed
+    ], sign=-1)
+
+    deleted = 0
+    for i in range(0, len(node_ids), DELETE_CHUNK):
+        chunk = node_ids[i:i + DELETE_CHUNK]
+        deleted += db.execute(delete(models.Node.__table__).where(models.Node.__table__.c.id.in_(chunk))).rowcount
+    return deleted
+
+
+@router.delete("/", response_model=schemas.NodeDeleteResult)
+def delete_nodes_bulk(ids: List[str] = Query(...), db: Session = Depends(get_db)):
+    """Delete many nodes and their links in one transaction (?ids=a,b or repeated ?ids=)"""
+    node_ids = sorted({node_id.strip() for value in ids for node_id in value.split(",") if node_id.strip()})
+    if len(node_ids) > MAX_BULK_DELETE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_DELETE} nodes per request")
+    position_buffer.discard(node_ids)
+    try:
+        deleted = delete_nodes(db, node_ids)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    adjacency_index.remove_nodes(db, node_ids)
+    return {"deleted": deleted}
+
+
 @router.delete("/{node_id}", status_code=204)
 def delete_node(node_id: str, db: Session = Depends(get_db)):
     """Delete a node and its associated links"""
-    db_node = db.query(models.Node).filter(models.Node.id == node_id).first()
-    if not db_node:
-        raise HTTPException(status_code=404, detail="Node not found")
-    
+    position_buffer.discard([node_id])
     try:
-        db.delete(db_node)
+        deleted = delete_nodes(db, [node_id])
         db.commit()
-        return None
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Node not found")
+    adjacency_index.remove_nodes(db, [node_id])
+    return None
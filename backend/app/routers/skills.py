@@ -1,23 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.fast_json import json_list
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/skills", tags=["skills"])
 
 
-@router.get("/", response_model=List[schemas.Skill])
-def get_skills(db: Session = Depends(get_db)):
-    """Get all skills"""
-    skills = db.query(models.Skill).all()
-    return skills
+@router.get("/", response_model=List[schemas.Skill], dependencies=[Depends(ETag("skills"))])
+def get_skills(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all skills, optionally one page at a time ordered by (created_at, id)"""
+    skills = paginate(db.query(models.Skill), [models.Skill.created_at, models.Skill.id], response, limit, after)
+    return json_list(schemas.Skill, skills, response)
 
 
 @router.get("/{skill_id}", response_model=schemas.Skill)
-def get_skill(skill_id: str, db: Session = Depends(get_db)):
+def get_skill(skill_id: str, db: Session = Depends(get_read_db)):
     """Get a single skill by ID"""
     skill = db.query(models.Skill).filter(models.Skill.id == skill_id).first()
     if not skill:
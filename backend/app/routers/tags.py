@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app import models, schemas
+from app.database import get_read_db
+from app.utils.tag_index import ENTITY_TYPES
+from app.utils.versions import ETag
+
+router = APIRouter(prefix="/api/tags", tags=["tags"])
+
+
+@router.get("/", response_model=List[schemas.TagCount], dependencies=[Depends(ETag("entity_tags"))])
+def get_tags(
+    type: Optional[str] = Query(None, pattern=f"^({'|'.join(ENTITY_TYPES.values())})$"),
+    db: Session = Depends(get_read_db)
+):
+    """Get every tag with its usage count, most used first"""
+    count = func.count().label("count")
+    query = db.query(models.EntityTag.tag, count)
+    if type:
+        query = query.filter(models.EntityTag.entity_type == type)
+    rows = query.group_by(models.EntityTag.tag).order_by(count.desc(), models.EntityTag.tag).all()
+    return [{"tag": tag, "count": n} for tag, n in rows]
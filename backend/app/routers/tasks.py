@@ -1,25 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.fast_json import json_list
+from app.utils.pagination import paginate, MAX_PAGE_SIZE
+from app.utils.versions import ETag
 import uuid
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
 
-@router.get("/", response_model=List[schemas.Task])
-def get_tasks(db: Session = Depends(get_db)):
-    """Get all tasks with subtasks"""
-    tasks = db.query(models.Task).all()
-    return tasks
+@router.get("/", response_model=List[schemas.Task], dependencies=[Depends(ETag("tasks", "subtasks"))])
+def get_tasks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all tasks with subtasks (loaded in one batched query), optionally one page at a time ordered by (created_at, id)"""
+    tasks = paginate(db.query(models.Task).options(selectinload(models.Task.subtasks)), [models.Task.created_at, models.Task.id], response, limit, after)
+    return json_list(schemas.Task, tasks, response)
 
 
 @router.get("/{task_id}", response_model=schemas.Task)
-def get_task(task_id: str, db: Session = Depends(get_db)):
+def get_task(task_id: str, db: Session = Depends(get_read_db)):
     """Get a single task by ID"""
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    task = db.query(models.Task).options(selectinload(models.Task.subtasks)).filter(models.Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Dict
+from datetime import datetime, date
 from enum import Enum
 
 
@@ -58,6 +58,21 @@ class Node(NodeBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class NodePosition(BaseModel):
+    id: str
+    x: float
+    y: float
+
+
+class NodeDeleteResult(BaseModel):
+    deleted: int
+
+
+class NodePositionsResult(BaseModel):
+    updated: int  # rows written by this request
+    pending: int  # positions buffered for the next coalesced write
+
+
 # Link Schemas
 class LinkBase(BaseModel):
     source: str
@@ -77,6 +92,40 @@ class Link(LinkBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LinkBulkResult(BaseModel):
+    created: List[Link]
+    existing: List[Link]  # requested pairs that were already linked, in either direction
+
+
+# Graph Schemas
+class Subgraph(BaseModel):
+    nodes: List[Node]
+    links: List[Link]
+    truncated: bool  # the node limit was hit before the full depth was explored
+
+
+class NodeDegree(BaseModel):
+    id: str
+    title: str
+    degree: int
+
+
+class GraphStats(BaseModel):
+    nodes: int
+    links: int
+    types: Dict[str, int]
+    orphans: List[str]  # ids of nodes without any link
+    hubs: List[NodeDegree]  # most-linked nodes first
+    components: int  # connected components, counting each orphan as one
+    largest_component: int
+
+
+class LayoutResult(BaseModel):
+    moved: int  # nodes whose position was (re)computed and saved
+    pinned: int  # nodes left where they were
+    elapsed_ms: float
+
+
 # Subtask Schemas
 class SubtaskBase(BaseModel):
     content: str
@@ -233,7 +282,7 @@ class TransactionBase(BaseModel):
     source: str
     amount: float
     tags: List[str] = Field(default_factory=list)
-    date: str  # ISO date string
+    date: date  # ISO date (YYYY-MM-DD)
 
 
 class TransactionCreate(TransactionBase):
@@ -247,6 +296,17 @@ class Transaction(TransactionBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row (CSV header and blank lines not counted)
+    error: str
+
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
+
 class Income(Transaction):
     pass
 
@@ -259,6 +319,42 @@ class Investment(Transaction):
     pass
 
 
+# Tag Schemas
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+# Finance Summary Schemas
+class FinanceTotals(BaseModel):
+    income: float = 0
+    expenses: float = 0
+    investments: float = 0
+    net: float = 0
+
+
+class FinancePeriod(FinanceTotals):
+    period: str
+
+
+class FinanceSummary(BaseModel):
+    granularity: str
+    periods: List[FinancePeriod]
+    totals: FinanceTotals
+    # kind ("income", "expenses", "investments") -> tag -> total
+    categories: Dict[str, Dict[str, float]]
+
+
+# Media Schemas
+class MediaBlob(BaseModel):
+    id: str  # SHA-256 of the content
+    url: str
+    size: int
+    content_type: str = Field(..., alias="contentType", serialization_alias="contentType")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 # Journal Entry Schemas
 class JournalEntryBase(BaseModel):
     title: str
@@ -266,7 +362,7 @@ class JournalEntryBase(BaseModel):
     photos: List[str] = Field(default_factory=list)
     voice_notes: List[str] = Field(default_factory=list, alias="voiceNotes", serialization_alias="voiceNotes")
     tags: List[str] = Field(default_factory=list)
-    date: str
+    date: date
 
 
 class JournalEntryCreate(JournalEntryBase):
@@ -290,3 +386,27 @@ class JournalEntry(JournalEntryBase):
         from_attributes=True,
         populate_by_name=True
     )
+
+
+# Bootstrap Schema
+class Bootstrap(BaseModel):
+    nodes: List[Node]
+    links: List[Link]
+    tasks: List[Task]
+    skills: List[Skill]
+    goals: List[Goal]
+    cards: List[Card]
+    income: List[Income]
+    expenses: List[Expense]
+    investments: List[Investment]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JournalSearchHit(BaseModel):
+    id: str
+    title: str
+    date: date
+    tags: List[str] = Field(default_factory=list)
+    snippet: str  # matched text with <mark>…</mark> around the hits
+    score: float
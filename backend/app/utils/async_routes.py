@@ -0,0 +1,67 @@
+from fastapi import FastAPI, Response
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from sqlalchemy.util import greenlet_spawn
+from starlette.routing import request_response
+from app.database import get_db, get_read_db
+import inspect
+
+
+def _is_plain_sync(call) -> bool:
+    """A blocking callable FastAPI would hand to its threadpool"""
+    target = call if inspect.isfunction(call) or inspect.isclass(call) else getattr(call, "__call__", call)
+    return not (
+        inspect.iscoroutinefunction(target)
+        or inspect.isgeneratorfunction(target)
+        or inspect.isasyncgenfunction(target)
+    )
+
+
+def _uses_db(dependant: Dependant) -> bool:
+    return any(sub.call in (get_db, get_read_db) or _uses_db(sub) for sub in dependant.dependencies)
+
+
+def _on_greenlet(call, response_field=None):
+    """Async wrapper running `call` in SQLAlchemy's greenlet bridge on the event loop.
+
+    For endpoints the response is also validated inside the bridge, so
+    relationships still to be lazy-loaded are fetched while awaiting the
+    async driver is possible; FastAPI's own pass then sees plain models.
+    """
+    def run(values):
+        result = call(**values)
+        if response_field is not None and not isinstance(result, Response):
+            validated, errors = response_field.validate(result, {}, loc=("response",))
+            if not errors:
+                return validated
+        return result
+
+    async def wrapper(**values):
+        return await greenlet_spawn(run, values)
+
+    return wrapper
+
+
+def _wrap_dependencies(dependant: Dependant):
+    for sub in dependant.dependencies:
+        _wrap_dependencies(sub)
+        if _is_plain_sync(sub.call):
+            sub.call = _on_greenlet(sub.call)
+
+
+def run_routes_on_event_loop(app: FastAPI):
+    """Turn every sync route that takes the async session into a coroutine.
+
+    Handlers stay ordinary `def` functions over a Session; in async mode
+    they (and their sync dependencies) run on the event loop, so concurrent
+    requests wait on the driver instead of queueing for threadpool workers.
+    Routes without a get_db dependency keep FastAPI's default behaviour.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not _uses_db(route.dependant):
+            continue
+        if not _is_plain_sync(route.dependant.call):
+            continue
+        _wrap_dependencies(route.dependant)
+        route.dependant.call = _on_greenlet(route.dependant.call, route.response_field)
+        route.app = request_response(route.get_route_handler())
@@ -0,0 +1,159 @@
+from sqlalchemy import String, cast, or_
+from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import Optional
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from app import models
+
+logger = logging.getLogger(__name__)
+
+BLOB_STORAGE_DIR = os.getenv("BLOB_STORAGE_DIR", "./blobs")
+
+# An unreferenced blob stored (or uploaded again) more recently than this is
+# kept: a client uploads first and saves the entry that refers to it after
+BLOB_CLEANUP_GRACE_SECONDS = int(os.getenv("BLOB_CLEANUP_GRACE_SECONDS", "3600"))
+
+# Journal entries reference media by this URL path instead of inlining it
+MEDIA_PATH = "/api/media/"
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+DATA_URL_PATTERN = re.compile(r"^data:(?P<type>[^;,]*)(?P<params>(;[^;,]*)*?);base64,(?P<data>.*)$", re.DOTALL)
+
+
+class BlobWriter:
+    """Hashes and spools an upload to a temp file, then files it under its digest"""
+
+    def __init__(self, store: "BlobStore"):
+        self.store = store
+        self.hash = hashlib.sha256()
+        self.size = 0
+        fd, self.temp_path = tempfile.mkstemp(dir=store.temp_dir)
+        self.file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self.hash.update(chunk)
+        self.size += len(chunk)
+        self.file.write(chunk)
+
+    def commit(self, content_type: Optional[str] = None) -> str:
+        """Move the data into place (or drop it if already stored) and return the digest"""
+        self.file.close()
+        digest = self.hash.hexdigest()
+        path = self.store.path(digest)
+        if path.exists():
+            os.remove(self.temp_path)  # deduplicated
+            os.utime(path)  # restart the cleanup grace period for the new reference
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.temp_path, path)
+        type_path = path.with_suffix(".type")
+        if content_type and not type_path.exists():
+            type_path.write_text(content_type)
+        return digest
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class BlobStore:
+    """Content-addressed files on local disk: <root>/<aa>/<sha256>"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.temp_dir = self.root / "tmp"  # created by the first write, not on import
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def exists(self, digest: str) -> bool:
+        return bool(DIGEST_PATTERN.match(digest)) and self.path(digest).is_file()
+
+    def content_type(self, digest: str) -> str:
+        type_path = self.path(digest).with_suffix(".type")
+        return type_path.read_text() if type_path.exists() else "application/octet-stream"
+
+    def remove(self, digest: str, grace_seconds: float = 0) -> bool:
+        """Delete a blob unless it was stored within the last grace_seconds"""
+        path = self.path(digest)
+        try:
+            if time.time() - path.stat().st_mtime < grace_seconds:
+                return False
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        path.with_suffix(".type").unlink(missing_ok=True)
+        return True
+
+    def writer(self) -> BlobWriter:
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        return BlobWriter(self)
+
+    def put(self, data: bytes, content_type: Optional[str] = None) -> str:
+        writer = self.writer()
+        try:
+            writer.write(data)
+            return writer.commit(content_type)
+        except Exception:
+            writer.abort()
+            raise
+
+
+blob_store = BlobStore(BLOB_STORAGE_DIR)
+
+
+def media_url(digest: str) -> str:
+    return f"{MEDIA_PATH}{digest}"
+
+
+def digest_of(url) -> Optional[str]:
+    """The blob digest behind a media URL, or None for anything else"""
+    if not isinstance(url, str) or not url.startswith(MEDIA_PATH):
+        return None
+    digest = url[len(MEDIA_PATH):]
+    return digest if DIGEST_PATTERN.match(digest) else None
+
+
+def release(db: Session, urls) -> int:
+    """Delete the blobs behind media URLs that no journal entry refers to any more.
+
+    Call after committing the change that dropped the URLs. Best effort:
+    failures are logged, and blobs within the grace period are kept.
+    """
+    removed = 0
+    for digest in sorted({digest_of(url) for url in urls} - {None}):
+        try:
+            pattern = f"%{digest}%"
+            referenced = db.query(models.JournalEntry.id).filter(or_(
+                cast(models.JournalEntry.photos, String).like(pattern),
+                cast(models.JournalEntry.voice_notes, String).like(pattern),
+            )).first()
+            if referenced is None and blob_store.remove(digest, BLOB_CLEANUP_GRACE_SECONDS):
+                removed += 1
+        except Exception:
+            logger.exception("Releasing blob %s failed", digest)
+    return removed
+
+
+def externalize(values: Optional[list]) -> list:
+    """Move inline data URLs into the blob store, keeping only their media URLs"""
+    result = []
+    for value in values or []:
+        match = DATA_URL_PATTERN.match(value) if isinstance(value, str) else None
+        if match:
+            try:
+                data = base64.b64decode(match.group("data"), validate=False)
+            except (binascii.Error, ValueError):
+                result.append(value)
+                continue
+            value = media_url(blob_store.put(data, match.group("type") or None))
+        result.append(value)
+    return result
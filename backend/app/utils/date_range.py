@@ -0,0 +1,25 @@
+from fastapi import HTTPException, Query
+from datetime import date
+from typing import Optional
+
+
+class DateRange:
+    """?from=&to= query parameters (inclusive ISO dates) for date-indexed lists"""
+
+    def __init__(
+        self,
+        date_from: Optional[date] = Query(None, alias="from"),
+        date_to: Optional[date] = Query(None, alias="to")
+    ):
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def apply(self, query, column):
+        """Restrict a query to rows whose date column falls inside the range"""
+        if self.date_from:
+            query = query.filter(column >= self.date_from)
+        if self.date_to:
+            query = query.filter(column <= self.date_to)
+        return query
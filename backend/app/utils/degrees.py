@@ -0,0 +1,37 @@
+from sqlalchemy import bindparam, text, update
+from sqlalchemy.orm import Session
+from collections import Counter
+from app import models
+
+_nodes = models.Node.__table__
+
+_bump_degree = (
+    update(_nodes)
+    .where(_nodes.c.id == bindparam("node_id"))
+    .values(degree=_nodes.c.degree + bindparam("delta"))
+)
+
+
+def endpoint_counts(pairs) -> Counter:
+    """How many link ends each node has among (source, target) pairs; a self-link counts twice"""
+    counts = Counter()
+    for source_id, target_id in pairs:
+        counts[source_id] += 1
+        counts[target_id] += 1
+    return counts
+
+
+def apply(db: Session, pairs, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) links from Node.degree, one executemany UPDATE"""
+    counts = endpoint_counts(pairs)
+    if counts:
+        db.execute(_bump_degree, [{"node_id": node_id, "delta": sign * count} for node_id, count in counts.items()])
+
+
+def rebuild(db: Session):
+    """Recount every node's degree from the link table"""
+    db.execute(text(
+        "UPDATE nodes SET degree = "
+        "(SELECT COUNT(*) FROM links WHERE links.source_id = nodes.id) + "
+        "(SELECT COUNT(*) FROM links WHERE links.target_id = nodes.id)"
+    ))
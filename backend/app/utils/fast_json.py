@@ -0,0 +1,86 @@
+from fastapi import Response
+from pydantic import BaseModel
+from enum import Enum
+from functools import lru_cache
+from typing import Union, get_args, get_origin
+import orjson
+import os
+
+# Opt-in: list endpoints project rows straight to JSON with orjson instead of
+# validating them into response models and serializing those again
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_RESPONSES", "0") == "1"
+
+
+def _converter(annotation):
+    """Per-value conversion for a field type, or None when orjson can take the value as is"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _converter(args[0]) if len(args) == 1 else None
+    if origin is list:
+        item = _converter(get_args(annotation)[0])
+        return (lambda values: [item(value) for value in values]) if item else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return projector(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return lambda value: value.value if isinstance(value, Enum) else value
+    if annotation is float:
+        return float
+    return None
+
+
+@lru_cache(maxsize=None)
+def projector(model: type):
+    """Compile a response model into a function from an ORM row (or dict) to its JSON-ready dict.
+
+    Keys are the serialization aliases (skillId, voiceNotes...), enums become
+    their values and missing list columns fall back to the field default, so
+    the output matches model_dump(mode="json", by_alias=True) for rows that
+    would pass validation. Dates are left for orjson to format.
+    """
+    fields = [
+        (field.serialization_alias or name, name, _converter(field.annotation), field.default_factory)
+        for name, field in model.model_fields.items()
+    ]
+
+    def project(row) -> dict:
+        # Loaded ORM attributes sit in the instance __dict__; reading it directly
+        # skips the descriptor, and anything not loaded yet goes through getattr
+        loaded = row if isinstance(row, dict) else row.__dict__
+        projected = {}
+        for key, name, convert, default_factory in fields:
+            if name in loaded:
+                value = loaded[name]
+            else:
+                value = None if loaded is row else getattr(row, name)
+            if value is None:
+                value = default_factory() if default_factory is not None else None
+            elif convert is not None:
+                value = convert(value)
+            projected[key] = value
+        return projected
+
+    return project
+
+
+def dumps(model: type, content) -> bytes:
+    """Encode one model's worth of content, or a list of them when content is a list"""
+    project = projector(model)
+    if isinstance(content, list):
+        return orjson.dumps([project(row) for row in content])
+    return orjson.dumps(project(content))
+
+
+def json_list(model: type, rows: list, response: Response):
+    """Return value for a List[model] endpoint.
+
+    Without FAST_JSON_RESPONSES the rows go back to FastAPI unchanged. With
+    it they are encoded here, and headers the handler and its dependencies
+    set on `response` (ETag, X-Next-Cursor) are carried over, since FastAPI
+    does not merge them into a Response the handler returns itself.
+    """
+    if not FAST_JSON_ENABLED:
+        return rows
+    encoded = Response(content=dumps(model, rows), media_type="application/json")
+    encoded.headers.update(response.headers)
+    return encoded
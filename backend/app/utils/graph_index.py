@@ -0,0 +1,185 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from collections import Counter, deque
+from typing import Optional
+import os
+import threading
+from app import models
+from app.utils import versions
+
+LINKS_TABLE = models.Link.__tablename__
+
+# Serve graph traversals from memory; 0 uses recursive SQL instead
+ADJACENCY_INDEX_ENABLED = os.getenv("GRAPH_ADJACENCY_INDEX", "1") != "0"
+
+
+class AdjacencyIndex:
+    """Undirected adjacency lists of the link table, kept per process.
+
+    The index remembers the links table version (app.utils.versions) it was
+    built at. Every read compares that with the database's current version
+    and rebuilds on a mismatch, so writes by other workers are picked up.
+    Routers report their own committed link writes together with the
+    version the commit produced; a write that is the next version is
+    applied in place, anything else (a gap, e.g. commits arriving out of
+    order) marks the index stale.
+
+    The build reads through the caller's session without holding the lock:
+    waiting for a pooled connection (threadpool) or for the async driver
+    (event loop) while other requests need the lock could deadlock.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None  # links table version the index reflects
+        self._links = {}  # link id -> (source id, target id)
+        self._adjacency = {}  # node id -> set of link ids
+
+    def _ensure_built(self, db: Session):
+        # Read before the rows: a write landing during the build leaves the
+        # index at an older version than its contents, so it is rebuilt again
+        # (or the write re-applied) instead of being missed
+        version = versions.current(db, [LINKS_TABLE]).get(LINKS_TABLE, 0)
+        with self._lock:
+            if self._built and self._version == version:
+                return
+        links, adjacency = {}, {}
+        rows = db.query(models.Link.id, models.Link.source_id, models.Link.target_id)
+        for link_id, source_id, target_id in rows.yield_per(5000):
+            self._add(links, adjacency, link_id, source_id, target_id)
+        with self._lock:
+            if self._built and self._version >= version:
+                return  # another request built (or advanced) it meanwhile
+            self._links, self._adjacency = links, adjacency
+            self._version = version
+            self._built = True
+
+    @staticmethod
+    def _add(links: dict, adjacency: dict, link_id: str, source_id: str, target_id: str):
+        links[link_id] = (source_id, target_id)
+        adjacency.setdefault(source_id, set()).add(link_id)
+        adjacency.setdefault(target_id, set()).add(link_id)
+
+    def _apply(self, version: Optional[int], method, *args):
+        """Apply a committed write that left the links table at `version`"""
+        with self._lock:
+            if not self._built:
+                return
+            if version is not None and version == self._version + 1:
+                method(*args)
+                self._version = version
+            elif version is None or version > self._version:
+                self._built = False  # a write in between is missing; rebuild on the next read
+            # else: built from a snapshot that already holds this write
+
+    def _add_links(self, rows):
+        for link_id, source_id, target_id in rows:
+            self._add(self._links, self._adjacency, link_id, source_id, target_id)
+
+    def _remove_link(self, link_id: str):
+        endpoints = self._links.pop(link_id, None)
+        if endpoints:
+            for node_id in endpoints:
+                self._adjacency.get(node_id, set()).discard(link_id)
+
+    def _remove_nodes(self, node_ids):
+        for node_id in node_ids:
+            for link_id in self._adjacency.pop(node_id, set()):
+                self._remove_link(link_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+
+    def add_links(self, db: Session, rows):
+        """Record (link id, source id, target id) rows the session just committed"""
+        self._apply(versions.committed(db, LINKS_TABLE), self._add_links, list(rows))
+
+    def remove_link(self, db: Session, link_id: str):
+        self._apply(versions.committed(db, LINKS_TABLE), self._remove_link, link_id)
+
+    def remove_nodes(self, db: Session, node_ids):
+        """Drop nodes and every link touching them (mirrors the FK cascade)"""
+        self._apply(versions.committed(db, LINKS_TABLE), self._remove_nodes, list(node_ids))
+
+    def neighborhood(self, db: Session, root: str, depth: int, limit: int):
+        """Breadth-first node ids within `depth` hops, nearest first; (ids, truncated)"""
+        self._ensure_built(db)
+        with self._lock:
+            seen = {root: 0}
+            queue = deque([root])
+            while queue:
+                node_id = queue.popleft()
+                distance = seen[node_id]
+                if distance == depth:
+                    continue
+                for link_id in self._adjacency.get(node_id, ()):
+                    source_id, target_id = self._links[link_id]
+                    neighbor = target_id if source_id == node_id else source_id
+                    if neighbor in seen:
+                        continue
+                    if len(seen) >= limit:
+                        return list(seen), True
+                    seen[neighbor] = distance + 1
+                    queue.append(neighbor)
+            return list(seen), False
+
+    def induced_links(self, db: Session, node_ids) -> list:
+        """Ids of links with both endpoints inside node_ids"""
+        self._ensure_built(db)
+        members = set(node_ids)
+        with self._lock:
+            return [
+                link_id
+                for node_id in members
+                for link_id in self._adjacency.get(node_id, ())
+                if self._links[link_id][0] == node_id and self._links[link_id][1] in members
+            ]
+
+    def edges(self, db: Session) -> list:
+        """(source id, target id) of every link"""
+        self._ensure_built(db)
+        with self._lock:
+            return list(self._links.values())
+
+
+adjacency_index = AdjacencyIndex()
+
+
+def connected_components(node_ids, edges) -> list:
+    """Sizes of the connected components (union-find), largest first; isolated nodes count as one each"""
+    parent = {node_id: node_id for node_id in node_ids}
+
+    def find(node_id):
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    for source_id, target_id in edges:
+        if source_id in parent and target_id in parent:
+            a, b = find(source_id), find(target_id)
+            if a != b:
+                parent[a] = b
+    sizes = Counter(find(node_id) for node_id in parent)
+    return sorted(sizes.values(), reverse=True)
+
+
+_NEIGHBORHOOD_CTE = text("""
+    WITH RECURSIVE hood(id, depth) AS (
+        SELECT :root, 0
+        UNION
+        SELECT CASE WHEN links.source_id = hood.id THEN links.target_id ELSE links.source_id END,
+               hood.depth + 1
+        FROM hood JOIN links ON links.source_id = hood.id OR links.target_id = hood.id
+        WHERE hood.depth < :depth
+    )
+    SELECT id, MIN(depth) AS distance FROM hood GROUP BY id ORDER BY distance, id LIMIT :limit
+""")
+
+
+def neighborhood_sql(db: Session, root: str, depth: int, limit: int):
+    """Recursive-CTE equivalent of AdjacencyIndex.neighborhood"""
+    rows = db.execute(_NEIGHBORHOOD_CTE, {"root": root, "depth": depth, "limit": limit + 1}).all()
+    return [row.id for row in rows[:limit]], len(rows) > limit
@@ -0,0 +1,165 @@
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from app import schemas
+from app.database import run_db
+from app.utils import rollups, tag_index
+import codecs
+import csv
+import json
+import re
+import uuid
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+}
+
+# Tags in a CSV cell: "food;fun", "food|fun" or a quoted "food,fun"
+TAG_SEPARATOR = re.compile(r"[;|,]")
+
+
+def detect_format(request: Request, format: Optional[str]) -> str:
+    """Pick the body format from ?format= or the Content-Type header"""
+    if format:
+        return format
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+        )
+    return CONTENT_TYPES[content_type]
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request body as it arrives and yield complete lines"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    """Parse CSV with a header row; quoted fields may span lines"""
+    header = None
+    record = ""
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue  # inside a quoted field that continues on the next line
+        text, record = record, ""
+        if not text.strip():
+            continue
+        cells = next(csv.reader([text]))
+        if header is None:
+            header = [cell.strip().lower() for cell in cells]
+            continue
+        row = dict(zip(header, cells))
+        if "tags" in row:
+            row["tags"] = [tag.strip() for tag in TAG_SEPARATOR.split(row["tags"]) if tag.strip()]
+        yield row
+    if record:
+        raise csv.Error("Unterminated quoted field at end of body")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[dict]:
+    """Parse one JSON object per line; malformed lines are passed on as errors"""
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+        )
+    if isinstance(error, json.JSONDecodeError):
+        return f"Invalid JSON: {error}"
+    return str(error)
+
+
+def _insert_batch(db: Session, model, rows: list):
+    """Insert one batch with a single executemany and update the derived tables"""
+    db.execute(insert(model), rows)
+    rollups.apply_rows(db, model, rows)
+    tag_index.add_rows(db, model, rows)
+
+
+async def import_transactions(request: Request, db: Session, model, id_prefix: str,
+                              format: Optional[str] = None) -> schemas.ImportResult:
+    """Stream-parse a CSV/NDJSON body into transaction rows.
+
+    Every row is validated with TransactionCreate; valid rows are inserted
+    in executemany batches and committed together at the end, invalid rows
+    are reported back by row number.
+    """
+    lines = _lines(request)
+    records = _csv_records(lines) if detect_format(request, format) == "csv" else _ndjson_records(lines)
+
+    imported = 0
+    errors = []
+    failed = 0
+    batch = []
+    row_number = 0
+    try:
+        async for record in records:
+            row_number += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                if not isinstance(record, dict):
+                    raise ValueError("Expected a JSON object")
+                transaction = schemas.TransactionCreate.model_validate(record)
+            except (ValidationError, ValueError) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(schemas.ImportRowError(row=row_number, error=_describe(e)))
+                continue
+
+            batch.append({
+                "id": f"{id_prefix}-{uuid.uuid4().hex[:12]}",
+                "created_at": datetime.utcnow(),
+                **transaction.model_dump()
+            })
+            if len(batch) >= BATCH_SIZE:
+                await run_db(_insert_batch, db, model, batch)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            await run_db(_insert_batch, db, model, batch)
+            imported += len(batch)
+        await run_db(db.commit)
+    except (UnicodeDecodeError, csv.Error, ClientDisconnect) as e:
+        # The body itself is unreadable, so nothing from it is kept
+        await run_db(db.rollback)
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e) or 'client disconnected'}")
+    except SQLAlchemyError as e:
+        await run_db(db.rollback)
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    return schemas.ImportResult(imported=imported, failed=failed, errors=errors)
@@ -0,0 +1,177 @@
+from sqlalchemy import or_, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import Optional
+from app import models
+import hashlib
+import html
+import re
+
+FTS_TABLE = "journal_fts"
+
+# Column weights for bm25 (entry_id, title, content, tags)
+BM25_WEIGHTS = "0.0, 10.0, 1.0, 5.0"
+SNIPPET_TOKENS = 12
+
+# FTS5 brackets matches with these control characters; the snippet is
+# HTML-escaped first and only then are they swapped for <mark> tags, so
+# entry text can never inject markup into the highlights
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Whether the FTS5 index exists; probed once per process
+_enabled: Optional[bool] = None
+
+
+def _rowid(entry_id: str) -> int:
+    """Stable 60-bit FTS rowid for a journal id, so updates and deletes are point lookups.
+
+    Journal ids are strings and SQLite may renumber implicit rowids on
+    VACUUM, so the index cannot borrow journal_entries.rowid.
+    """
+    return int(hashlib.sha1(entry_id.encode()).hexdigest()[:15], 16)
+
+
+def _strip_sentinels(value: str) -> str:
+    """Drop MATCH_START/MATCH_END from entry text, so only real matches become <mark>"""
+    return value.replace(MATCH_START, "").replace(MATCH_END, "")
+
+
+def _document(entry) -> dict:
+    return {
+        "rowid": _rowid(entry.id),
+        "entry_id": entry.id,
+        "title": _strip_sentinels(entry.title or ""),
+        "content": _strip_sentinels(entry.content or ""),
+        "tags": _strip_sentinels(" ".join(entry.tags or [])),
+    }
+
+
+def enabled(db: Session) -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = db.bind.dialect.name == "sqlite" and db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first() is not None
+    return _enabled
+
+
+def create_index(db: Session):
+    """Create the FTS5 table (SQLite builds without FTS5 fall back to LIKE search)"""
+    global _enabled
+    if db.bind.dialect.name != "sqlite":
+        _enabled = False
+        return
+    try:
+        db.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "entry_id UNINDEXED, title, content, tags, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        _enabled = True
+    except OperationalError:
+        _enabled = False
+
+
+def index_entry(db: Session, entry):
+    """Insert or replace an entry's document in the index"""
+    if not enabled(db):
+        return
+    document = _document(entry)
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), document)
+    db.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, entry_id, title, content, tags) "
+        "VALUES (:rowid, :entry_id, :title, :content, :tags)"
+    ), document)
+
+
+def remove_entry(db: Session, entry_id: str):
+    if not enabled(db):
+        return
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": _rowid(entry_id)})
+
+
+def rebuild(db: Session):
+    """Re-index every journal entry"""
+    if not enabled(db):
+        return
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    batch = []
+    for entry in db.query(models.JournalEntry).yield_per(500):
+        batch.append(_document(entry))
+        if len(batch) >= 500:
+            _insert_documents(db, batch)
+            batch = []
+    if batch:
+        _insert_documents(db, batch)
+
+
+def _insert_documents(db: Session, documents: list):
+    db.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, entry_id, title, content, tags) "
+        "VALUES (:rowid, :entry_id, :title, :content, :tags)"
+    ), documents)
+
+
+def is_empty(db: Session) -> bool:
+    return db.execute(text(f"SELECT 1 FROM {FTS_TABLE} LIMIT 1")).first() is None
+
+
+def _match_expression(q: str) -> Optional[str]:
+    """Quote each word (so user input can't inject FTS syntax); prefix-match the last one"""
+    tokens = TOKEN_PATTERN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def search(db: Session, q: str, limit: int) -> list:
+    """Return (entry_id, score, snippet) for the best matches, best first"""
+    if not enabled(db):
+        return _search_like(db, q, limit)
+    expression = _match_expression(q)
+    if expression is None:
+        return []
+    rows = db.execute(text(
+        f"SELECT entry_id, -bm25({FTS_TABLE}, {BM25_WEIGHTS}) AS score, "
+        f"snippet({FTS_TABLE}, -1, :start, :end, '…', {SNIPPET_TOKENS}) AS snippet "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :expression ORDER BY score DESC LIMIT :limit"
+    ), {"expression": expression, "limit": limit, "start": MATCH_START, "end": MATCH_END})
+    return [(row.entry_id, row.score, highlight(row.snippet)) for row in rows]
+
+
+def highlight(snippet: str) -> str:
+    """HTML-escape a snippet, then turn the match sentinels into <mark> tags"""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+def _search_like(db: Session, q: str, limit: int) -> list:
+    """Unindexed fallback for databases without FTS5: every word must appear somewhere"""
+    tokens = TOKEN_PATTERN.findall(q)
+    if not tokens:
+        return []
+    query = db.query(models.JournalEntry.id, models.JournalEntry.content)
+    for token in tokens:
+        pattern = f"%{token}%"
+        query = query.filter(or_(
+            models.JournalEntry.title.ilike(pattern),
+            models.JournalEntry.content.ilike(pattern),
+        ))
+    rows = query.order_by(models.JournalEntry.date.desc()).limit(limit).all()
+    return [(entry_id, 0.0, _plain_snippet(content, tokens[0])) for entry_id, content in rows]
+
+
+def _plain_snippet(content: str, token: str) -> str:
+    content = _strip_sentinels(content or "")
+    position = content.lower().find(token.lower())
+    if position < 0:
+        return highlight(content[:80])
+    start = max(position - 40, 0)
+    end = position + len(token)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end + 40 < len(content) else ""
+    return highlight(
+        f"{prefix}{content[start:position]}{MATCH_START}{content[position:end]}{MATCH_END}{content[end:end + 40]}{suffix}"
+    )
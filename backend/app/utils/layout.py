@@ -0,0 +1,144 @@
+import numpy as np
+
+DEFAULT_ITERATIONS = 100
+# Ideal distance between linked nodes, in canvas pixels
+DEFAULT_SPACING = 120.0
+# Pull toward the centre that keeps disconnected pieces from drifting apart
+GRAVITY = 0.02
+# Upper bound on node pairs held in memory at once by the repulsion step
+PAIR_BLOCK = 2_000_000
+
+# 2D grid cells are packed into one int64 key: cx * CELL_KEY_STRIDE + cy
+CELL_KEY_STRIDE = 1 << 32
+NEIGHBOR_CELLS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def _seed_positions(positions: np.ndarray, edges: np.ndarray, spacing: float, rng) -> np.ndarray:
+    """Fill NaN positions: next to already placed neighbours if any, else scattered around the map"""
+    positions = positions.copy()
+    missing = np.isnan(positions).any(axis=1)
+    if not missing.any():
+        return positions
+    placed = ~missing
+    center = positions[placed].mean(axis=0) if placed.any() else np.zeros(2)
+
+    n = len(positions)
+    sums = np.zeros((n, 2))
+    counts = np.zeros(n)
+    for a, b in ((0, 1), (1, 0)):
+        # Each unplaced endpoint accumulates the positions of its placed neighbours
+        use = missing[edges[:, a]] & placed[edges[:, b]]
+        np.add.at(sums, edges[use, a], positions[edges[use, b]])
+        np.add.at(counts, edges[use, a], 1)
+
+    near = missing & (counts > 0)
+    positions[near] = sums[near] / counts[near, None] + rng.normal(scale=spacing / 2, size=(near.sum(), 2))
+
+    far = missing & (counts == 0)
+    radius = spacing * np.sqrt(far.sum()) / 2
+    angle = rng.uniform(0, 2 * np.pi, far.sum())
+    distance = radius * np.sqrt(rng.uniform(0, 1, far.sum()))
+    positions[far] = center + np.column_stack((np.cos(angle), np.sin(angle))) * distance[:, None]
+    return positions
+
+
+def _repulsion(positions: np.ndarray, rows: np.ndarray, spacing: float) -> np.ndarray:
+    """k^2 / d push on each of `rows` from every node closer than 2k.
+
+    This is the grid variant of Fruchterman-Reingold: nodes are bucketed
+    into 2k-wide cells and only the 3x3 cells around a node are compared,
+    so one step costs O(n) instead of O(n^2). Far-away nodes contribute
+    little and are ignored; gravity keeps the map together instead.
+    """
+    cutoff = 2 * spacing
+    k2 = spacing * spacing
+    cells = np.floor(positions / cutoff).astype(np.int64)
+    keys = cells[:, 0] * CELL_KEY_STRIDE + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    cell_keys, cell_starts, cell_sizes = np.unique(keys[order], return_index=True, return_counts=True)
+
+    # For every row and neighbouring cell: where that cell's nodes sit in `order`
+    starts = np.zeros((len(NEIGHBOR_CELLS), len(rows)), dtype=np.int64)
+    sizes = np.zeros((len(NEIGHBOR_CELLS), len(rows)), dtype=np.int64)
+    for o, (dx, dy) in enumerate(NEIGHBOR_CELLS):
+        wanted = (cells[rows, 0] + dx) * CELL_KEY_STRIDE + cells[rows, 1] + dy
+        slot = np.minimum(np.searchsorted(cell_keys, wanted), len(cell_keys) - 1)
+        found = cell_keys[slot] == wanted
+        starts[o] = np.where(found, cell_starts[slot], 0)
+        sizes[o] = np.where(found, cell_sizes[slot], 0)
+
+    displacement = np.zeros((len(rows), 2))
+    # Split rows so no chunk compares more than PAIR_BLOCK pairs
+    load = np.cumsum(sizes.sum(axis=0))
+    bounds = np.searchsorted(load, np.arange(PAIR_BLOCK, load[-1] + PAIR_BLOCK, PAIR_BLOCK), side="right")
+    chunk_start = 0
+    for chunk_end in np.append(np.unique(np.maximum(bounds, 1)), len(rows)):
+        if chunk_end <= chunk_start:
+            continue
+        chunk = np.arange(chunk_start, chunk_end)
+        size = sizes[:, chunk].ravel()
+        pair_row = np.repeat(np.tile(chunk, len(NEIGHBOR_CELLS)), size)
+        first = np.repeat(starts[:, chunk].ravel(), size)
+        rank = np.arange(len(pair_row)) - np.repeat(np.cumsum(size) - size, size)
+        other = order[first + rank]
+        delta = positions[rows[pair_row]] - positions[other]
+        distance2 = np.einsum("ij,ij->i", delta, delta)
+        weight = np.where(
+            (distance2 < cutoff * cutoff) & (rows[pair_row] != other),
+            k2 / np.maximum(distance2, 1e-4 * k2),
+            0.0,
+        )
+        for axis in (0, 1):
+            displacement[:, axis] += np.bincount(pair_row, weights=delta[:, axis] * weight, minlength=len(rows))
+        chunk_start = chunk_end
+    return displacement
+
+
+def force_layout(
+    positions: np.ndarray,
+    edges: np.ndarray,
+    pinned: np.ndarray,
+    iterations: int = DEFAULT_ITERATIONS,
+    spacing: float = DEFAULT_SPACING,
+    seed: int = 0,
+) -> np.ndarray:
+    """Fruchterman-Reingold layout, vectorized across all nodes and links.
+
+    positions is (n, 2) with NaN rows for nodes that have no position yet,
+    edges is (m, 2) node indices and pinned is an (n,) mask of nodes that
+    push and pull the others but never move. Returns the new (n, 2) array.
+    """
+    rng = np.random.default_rng(seed)
+    positions = _seed_positions(positions, edges, spacing, rng)
+    movable = np.flatnonzero(~pinned)
+    n = len(positions)
+    if n < 2 or len(movable) == 0:
+        return positions
+
+    # Nodes stacked on the same spot would feel no force to separate them
+    positions[movable] += rng.normal(scale=spacing * 1e-3, size=(len(movable), 2))
+    center = positions[pinned].mean(axis=0) if pinned.any() else positions.mean(axis=0)
+    temperature = spacing * max(np.sqrt(len(movable)) / 4, 1.0)
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+        displacement[movable] = _repulsion(positions, movable, spacing)
+
+        # Attraction d^2 / k along links
+        if len(edges):
+            delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+            pull = delta * (np.sqrt(np.einsum("ij,ij->i", delta, delta)) / spacing)[:, None]
+            for axis in (0, 1):
+                displacement[:, axis] -= np.bincount(edges[:, 0], weights=pull[:, axis], minlength=n)
+                displacement[:, axis] += np.bincount(edges[:, 1], weights=pull[:, axis], minlength=n)
+
+        displacement -= GRAVITY * (positions - center)
+
+        # Move each free node at most `temperature` along its net force
+        step = displacement[movable]
+        length = np.maximum(np.sqrt(np.einsum("ij,ij->i", step, step)), 1e-9)
+        positions[movable] += step * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return positions
@@ -0,0 +1,194 @@
+from sqlalchemy import event
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+import bisect
+import os
+import threading
+import time
+from app.database import async_engine, async_read_engine, engine, pool_stats, read_engine
+
+# Record request and query metrics and serve them at /metrics; 0 disables both
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Queries issued on behalf of one request; shared with threadpool and greenlet workers"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Registry:
+    """In-process counters, gauges and histograms rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.latency = {}  # (method, route) -> Histogram
+        self.queries_per_request = {}  # (method, route) -> Histogram
+        self.queries = defaultdict(int)  # (method, route) -> count
+        self.query_seconds = defaultdict(float)  # (method, route) -> seconds
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(method, route, status)] += 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.queries_per_request.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            self.queries[key] += stats.queries
+            self.query_seconds[key] += stats.seconds
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, series: dict):
+            for (method, route), hist in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip((*hist.buckets, "+Inf"), hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(method=method, route=route)} {hist.total}")
+                lines.append(f"{name}_count{_labels(method=method, route=route)} {cumulative}")
+
+        with self._lock:
+            header("http_requests_in_flight", "gauge", "Requests currently being served")
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+
+            header("http_requests_total", "counter", "Requests served, by route template and status code")
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+            header("http_request_duration_seconds", "histogram", "Time from request start to the last response byte")
+            histogram("http_request_duration_seconds", self.latency)
+
+            header("http_request_db_queries", "histogram", "SQL statements executed per request")
+            histogram("http_request_db_queries", self.queries_per_request)
+
+            header("db_queries_total", "counter", "SQL statements executed, by the route that issued them")
+            for (method, route), count in sorted(self.queries.items()):
+                lines.append(f"db_queries_total{_labels(method=method, route=route)} {count}")
+
+            header("db_query_seconds_total", "counter", "Time spent executing SQL, by the route that issued it")
+            for (method, route), seconds in sorted(self.query_seconds.items()):
+                lines.append(f"db_query_seconds_total{_labels(method=method, route=route)} {seconds}")
+
+        header("db_pool_connections", "gauge", "Connection pool usage per engine")
+        for name, pooled in _engines():
+            stats = pool_stats(pooled)
+            for state in ("checkedout", "checkedin", "overflow"):
+                if state in stats:
+                    lines.append(f"db_pool_connections{_labels(engine=name, state=state)} {stats[state]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and attributes its SQL statements to the matched route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+        registry.started()
+
+        async def record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, record_status)
+        finally:
+            # The router stores the matched APIRoute in the scope; its template
+            # (/api/tasks/{task_id}) keeps label cardinality bounded
+            route = scope.get("route")
+            registry.finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                stats,
+            )
+            _current.reset(token)
+
+
+def _engines():
+    """(name, Engine) for every configured engine; async ones through their sync core"""
+    named = [("primary", engine), ("read", read_engine), ("async_primary", async_engine), ("async_read", async_read_engine)]
+    return [(name, getattr(pooled, "sync_engine", pooled)) for name, pooled in named if pooled is not None]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - started
+
+
+def _failed_cursor_execute(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+if METRICS_ENABLED:
+    for _name, _engine in _engines():
+        event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(_engine, "handle_error", _failed_cursor_execute)
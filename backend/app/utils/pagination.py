@@ -0,0 +1,71 @@
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from datetime import date, datetime
+from typing import Optional
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list) -> list:
+    """Decode a cursor back into typed sort-key values for the given columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort key")
+        decoded = []
+        for column, value in zip(keys, values):
+            python_type = column.type.python_type
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _after_clause(keys: list, values: list, descending: bool):
+    """Row-value comparison (k1, k2, ...) > (v1, v2, ...) spelled out portably"""
+    clauses = []
+    for i, (column, value) in enumerate(zip(keys, values)):
+        equal_prefix = [keys[j] == values[j] for j in range(i)]
+        beyond = column < value if descending else column > value
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def paginate(query, keys: list, response: Response, limit: Optional[int] = None,
+             after: Optional[str] = None, descending: bool = False) -> list:
+    """Order a query by a stable key and, when asked, return one keyset page.
+
+    Without ``limit`` or ``after`` every row is returned, so existing clients
+    keep working. Otherwise at most ``limit`` rows after the ``after`` cursor
+    are returned and the cursor for the next page is put in the
+    ``X-Next-Cursor`` response header (absent on the last page).
+    """
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in keys])
+    if limit is None and after is None:
+        return query.all()
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    if after is not None:
+        query = query.filter(_after_clause(keys, decode_cursor(after, keys), descending))
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in keys])
+    return rows
@@ -0,0 +1,147 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from datetime import datetime
+import logging
+import os
+import threading
+from app import models
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# How long position writes for the same node are merged before hitting the
+# database; 0 writes every request straight through
+COALESCE_WINDOW_MS = int(os.getenv("NODE_POSITION_COALESCE_MS", "250"))
+
+_update_position = (
+    update(models.Node.__table__)
+    .where(models.Node.__table__.c.id == bindparam("node_id"))
+    .values(x=bindparam("new_x"), y=bindparam("new_y"), updated_at=bindparam("now"))
+)
+
+
+def write_positions(db: Session, positions: dict) -> int:
+    """Apply {node_id: (x, y)} with one executemany UPDATE; returns rows changed"""
+    if not positions:
+        return 0
+    now = datetime.utcnow()
+    result = db.execute(_update_position, [
+        {"node_id": node_id, "new_x": x, "new_y": y, "now": now}
+        for node_id, (x, y) in positions.items()
+    ])
+    return result.rowcount
+
+
+class PositionBuffer:
+    """Collects node positions and writes only the latest one per node.
+
+    The first submit starts a timer; everything submitted until it fires is
+    merged into one batched UPDATE. Reads call flush() first so they never
+    see positions older than what a client already sent. A batch that fails
+    to commit goes back into the buffer (behind anything newer) and is
+    retried when the next timer fires.
+    """
+
+    def __init__(self, session_factory, window_ms: int):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self._pending = {}
+        self._writing = {}  # the batch being written, until it commits
+        self._lock = threading.Lock()
+        # Held while a batch is being written, so a read that flushes waits for it
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def submit(self, positions: dict) -> int:
+        with self._lock:
+            self._pending.update(positions)
+            self._schedule()
+            return len(self._pending)
+
+    def _schedule(self):
+        """Start the flush timer if none is running; call with _lock held"""
+        if self._timer is None and self.enabled:
+            self._timer = threading.Timer(self.window, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception:
+            pass  # logged and re-queued by flush()
+
+    def discard(self, node_ids):
+        """Forget buffered positions that a newer write supersedes.
+
+        Call before making the newer write. If one of the nodes is in the
+        batch being written, this waits for that batch to commit (or be
+        re-queued) so it cannot land on top of the caller's write.
+        """
+        node_ids = list(node_ids)
+        with self._lock:
+            for node_id in node_ids:
+                self._pending.pop(node_id, None)
+            in_flight = any(node_id in self._writing for node_id in node_ids)
+        if not in_flight:
+            return
+        if in_greenlet():
+            await_only(run_in_threadpool(self._discard_after_flush, node_ids))
+        else:
+            self._discard_after_flush(node_ids)
+
+    def _discard_after_flush(self, node_ids: list):
+        with self._flush_lock:
+            with self._lock:
+                for node_id in node_ids:
+                    self._pending.pop(node_id, None)
+
+    def flush(self) -> int:
+        """Write everything buffered (waiting for a write in progress); returns rows changed.
+
+        Handlers in async mode run in SQLAlchemy's greenlet bridge on the
+        event loop; from there the blocking write (sync session, thread
+        locks) is handed to the threadpool and awaited through the bridge.
+        """
+        if not self._pending and not self._writing:
+            return 0
+        if in_greenlet():
+            return await_only(run_in_threadpool(self._flush))
+        return self._flush()
+
+    def _flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                positions, self._pending = self._pending, {}
+                self._writing = dict(positions)
+            if not positions:
+                return 0
+            db = self.session_factory()
+            try:
+                written = write_positions(db, positions)
+                db.commit()
+                return written
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    # Positions submitted meanwhile are newer than this batch
+                    self._pending = {**self._writing, **self._pending}
+                    self._schedule()
+                logger.exception("Writing %d buffered node positions failed; they will be retried", len(positions))
+                raise
+            finally:
+                with self._lock:
+                    self._writing = {}
+                db.close()
+
+
+position_buffer = PositionBuffer(SessionLocal, COALESCE_WINDOW_MS)
@@ -0,0 +1,246 @@
+from fastapi import FastAPI, Response
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.routing import request_response
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import threading
+import traceback
+import uuid
+from app.database import async_engine, async_read_engine, engine, read_engine
+from app.utils.async_routes import _is_plain_sync
+
+logger = logging.getLogger(__name__)
+
+# Debug mode: per-request cProfile on demand and N+1 query warnings. Off by
+# default; when off nothing below is installed (no middleware, no SQL listeners)
+PROFILING_ENABLED = os.getenv("REQUEST_PROFILING", "0") == "1"
+
+# Send this header (any value) to profile one request; the response names
+# the profile in PROFILE_ID_HEADER
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILES_KEPT = int(os.getenv("REQUEST_PROFILES_KEPT", "20"))
+
+# Flag requests running one parameterized statement more than this many times
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RequestProfile:
+    """cProfile runs for one request, one per thread its code ran on.
+
+    A Profile only sees the thread that enabled it, so the event loop's
+    share and each threadpool call get their own and are merged at the end.
+    """
+
+    def __init__(self):
+        self.profiles = []
+
+    def runcall(self, call, *args, **kwargs):
+        profile = cProfile.Profile()
+        self.profiles.append(profile)
+        return profile.runcall(call, *args, **kwargs)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profiles[0])
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+class RequestQueries:
+    """Executions per SQL statement for one request, with where each repeat came from"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.stacks = {}
+
+    def saw(self, statement: str):
+        self.counts[statement] += 1
+        if self.counts[statement] == N_PLUS_ONE_THRESHOLD + 1:
+            self.stacks[statement] = _app_stack()
+
+    def repeated(self):
+        return [(statement, self.counts[statement], stack) for statement, stack in self.stacks.items()]
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def _app_stack() -> str:
+    """The current stack, trimmed to frames in the application's own code"""
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(APP_DIR) and frame.filename != __file__
+    ]
+    return "".join(traceback.format_list(frames))
+
+
+class ProfileStore:
+    """The last PROFILES_KEPT profiles, as pstats marshal data"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = OrderedDict()
+
+    def save(self, profile_id: str, stats: pstats.Stats):
+        with self._lock:
+            self._profiles[profile_id] = marshal.dumps(stats.stats)
+            while len(self._profiles) > PROFILES_KEPT:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
+
+
+def profile_response(profile_id: str, output: str = "prof") -> Response:
+    """A stored profile as a .prof download (snakeviz, pstats) or a text report"""
+    data = profile_store.get(profile_id)
+    if not PROFILING_ENABLED or data is None:
+        return Response(status_code=404)
+    if output == "text":
+        stats = pstats.Stats(_MarshalledStats(data), stream=io.StringIO())
+        stats.sort_stats("cumulative").print_stats(60)
+        return Response(content=stats.stream.getvalue(), media_type="text/plain")
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+    )
+
+
+class _MarshalledStats:
+    """Adapter letting pstats.Stats load stats that are already in memory"""
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+
+class ProfilingMiddleware:
+    """Profiles requests that ask for it and reports N+1 query patterns on every request.
+
+    The event loop's Profile stays enabled while the request awaits, so in
+    async mode requests served concurrently on the loop show up in it too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        queries_token = _queries.set(queries)
+        profile = profile_id = profile_token = None
+        if PROFILE_HEADER.lower().encode() in dict(scope["headers"]):
+            profile = RequestProfile()
+            profile_id = uuid.uuid4().hex
+            profile_token = _profile.set(profile)
+
+        async def announce_profile(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER.lower().encode(), profile_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            if profile is None:
+                await self.app(scope, receive, send)
+            else:
+                loop_profile = cProfile.Profile()
+                profile.profiles.append(loop_profile)
+                loop_profile.enable()
+                try:
+                    await self.app(scope, receive, announce_profile)
+                finally:
+                    loop_profile.disable()
+        finally:
+            if profile is not None:
+                _profile.reset(profile_token)
+                profile_store.save(profile_id, profile.stats())
+            _queries.reset(queries_token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for statement, count, stack in queries.repeated():
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times\n    %s\n%s",
+                    scope["method"], route, count, statement, stack,
+                )
+
+
+def _profiled(call, response_field=None):
+    """Sync wrapper running `call` under the request's profile when there is one.
+
+    For endpoints the response is validated inside the profiled call as
+    well, since FastAPI would otherwise do it in a separate threadpool call.
+    """
+    def run(values):
+        result = call(**values)
+        if response_field is not None and not isinstance(result, Response):
+            validated, errors = response_field.validate(result, {}, loc=("response",))
+            if not errors:
+                return validated
+        return result
+
+    def wrapper(**values):
+        profile = _profile.get()
+        if profile is None:
+            return call(**values)
+        return profile.runcall(run, values)
+
+    return wrapper
+
+
+def _wrap_dependencies(dependant: Dependant):
+    for sub in dependant.dependencies:
+        _wrap_dependencies(sub)
+        if _is_plain_sync(sub.call):
+            sub.call = _profiled(sub.call)
+
+
+def profile_threadpool_calls(app: FastAPI):
+    """Let the request profile follow sync endpoints and dependencies into the threadpool.
+
+    Call after run_routes_on_event_loop: routes it moved onto the event
+    loop are covered by the middleware's own Profile.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        _wrap_dependencies(route.dependant)
+        if _is_plain_sync(route.dependant.call):
+            route.dependant.call = _profiled(route.dependant.call, route.response_field)
+        route.app = request_response(route.get_route_handler())
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    queries = _queries.get()
+    if queries is not None:
+        queries.saw(statement)
+
+
+if PROFILING_ENABLED:
+    for _engine in (engine, read_engine, async_engine, async_read_engine):
+        if _engine is not None:
+            event.listen(getattr(_engine, "sync_engine", _engine), "before_cursor_execute", _count_statement)
@@ -0,0 +1,32 @@
+from app.database import READ_AFTER_WRITE_HEADER
+import time
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """Stamps successful write responses with the time of the write.
+
+    Clients send the stamp back in the same header; get_read_db then
+    serves them from the primary until the replica has caught up. Pure
+    ASGI so streamed and plain Response bodies are stamped alike.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def stamp(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                wrote_at = str(int(time.time() * 1000))
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (READ_AFTER_WRITE_HEADER.lower().encode(), wrote_at.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, stamp)
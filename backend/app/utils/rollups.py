@@ -0,0 +1,137 @@
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+from datetime import date
+from app import models
+from app.database import upsert_insert
+
+# Rollup kind for each transaction model
+KINDS = {
+    models.Income: "income",
+    models.Expense: "expense",
+    models.Investment: "investment",
+}
+
+# Tag value of the row that holds the untagged total for a period, so a
+# transaction with several tags is only counted once in the period totals
+TOTAL_TAG = ""
+
+
+def period_of(value) -> str:
+    """Month bucket (YYYY-MM) for an ISO date string or date"""
+    if isinstance(value, date):
+        return value.strftime("%Y-%m")
+    return str(value)[:7]
+
+
+def _rollup_keys(tags) -> list:
+    return [TOTAL_TAG] + sorted({tag for tag in (tags or []) if tag})
+
+
+def _bump(db: Session, kind: str, deltas: dict):
+    """Add {(period, tag): (total, count)} deltas to the rollups of one kind.
+
+    The addition happens in the database (INSERT ... ON CONFLICT DO UPDATE),
+    so concurrent writers neither lose each other's amounts nor collide on
+    the primary key; rows whose count drops to zero are deleted afterwards.
+    Backends without ON CONFLICT fall back to _bump_existing_or_insert.
+    """
+    if not deltas:
+        return
+    table = models.FinanceRollup.__table__
+    rows = [
+        {"kind": kind, "period": period, "tag": tag, "total": total, "count": count}
+        for (period, tag), (total, count) in deltas.items()
+    ]
+    upsert = upsert_insert(db)
+    if upsert is None:
+        _bump_existing_or_insert(db, kind, rows)
+    else:
+        statement = upsert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.kind, table.c.period, table.c.tag],
+            set_={"total": table.c.total + statement.excluded.total, "count": table.c.count + statement.excluded.count},
+        )
+        db.execute(statement, rows)
+    db.execute(
+        delete(table).where(
+            table.c.kind == kind,
+            table.c.period.in_(sorted({period for period, _ in deltas})),
+            table.c.count <= 0,
+        )
+    )
+
+
+_add_to_rollup = (
+    update(models.FinanceRollup.__table__)
+    .where(
+        models.FinanceRollup.__table__.c.kind == bindparam("b_kind"),
+        models.FinanceRollup.__table__.c.period == bindparam("b_period"),
+        models.FinanceRollup.__table__.c.tag == bindparam("b_tag"),
+    )
+    .values(
+        total=models.FinanceRollup.__table__.c.total + bindparam("b_total"),
+        count=models.FinanceRollup.__table__.c.count + bindparam("b_count"),
+    )
+)
+
+
+def _bump_existing_or_insert(db: Session, kind: str, rows: list):
+    """Select-then-update/insert for backends without ON CONFLICT.
+
+    Existing rows are still added to in the database, but two writers
+    creating the same new row at once collide on the primary key instead
+    of merging; the loser's transaction fails and can be retried.
+    """
+    table = models.FinanceRollup.__table__
+    existing = set(db.execute(
+        select(table.c.period, table.c.tag).where(
+            table.c.kind == kind,
+            table.c.period.in_(sorted({row["period"] for row in rows})),
+        )
+    ).all())
+    updates = [
+        {f"b_{key}": value for key, value in row.items()}
+        for row in rows if (row["period"], row["tag"]) in existing
+    ]
+    if updates:
+        db.execute(_add_to_rollup, updates)
+    inserts = [row for row in rows if (row["period"], row["tag"]) not in existing]
+    if inserts:
+        db.execute(insert(table), inserts)
+
+
+def apply_transaction(db: Session, entry, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) a transaction from the monthly rollups.
+
+    Runs inside the caller's transaction, so the rollups commit or roll back
+    together with the row they describe.
+    """
+    period = period_of(entry.date)
+    _bump(db, KINDS[type(entry)], {(period, tag): (sign * entry.amount, sign) for tag in _rollup_keys(entry.tags)})
+
+
+def apply_rows(db: Session, model, rows: list):
+    """Add a batch of newly inserted transaction rows (dicts) to the rollups"""
+    totals = {}
+    for row in rows:
+        period = period_of(row["date"])
+        for tag in _rollup_keys(row["tags"]):
+            total, count = totals.get((period, tag), (0.0, 0))
+            totals[(period, tag)] = (total + row["amount"], count + 1)
+    _bump(db, KINDS[model], totals)
+
+
+def rebuild(db: Session):
+    """Recompute every rollup row from the transaction tables"""
+    db.query(models.FinanceRollup).delete()
+    totals = {}
+    for model, kind in KINDS.items():
+        for entry in db.query(model).yield_per(1000):
+            period = period_of(entry.date)
+            for tag in _rollup_keys(entry.tags):
+                total, count = totals.get((kind, period, tag), (0.0, 0))
+                totals[(kind, period, tag)] = (total + entry.amount, count + 1)
+    db.bulk_insert_mappings(models.FinanceRollup, [
+        {"kind": kind, "period": period, "tag": tag, "total": total, "count": count}
+        for (kind, period, tag), (total, count) in totals.items()
+    ])
@@ -0,0 +1,97 @@
+from fastapi import Query
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app import models
+
+# Entity type stored in the tag index for each tagged model
+ENTITY_TYPES = {
+    models.Income: "income",
+    models.Expense: "expense",
+    models.Investment: "investment",
+    models.JournalEntry: "journal",
+}
+
+
+def _normalize(tags) -> set:
+    return {tag for tag in (tags or []) if tag}
+
+
+def sync_tags(db: Session, entry):
+    """Replace the index rows of an entry with its current tags"""
+    clear_tags(db, entry)
+    entity_type = ENTITY_TYPES[type(entry)]
+    db.add_all([
+        models.EntityTag(entity_type=entity_type, entity_id=entry.id, tag=tag)
+        for tag in _normalize(entry.tags)
+    ])
+
+
+def clear_tags(db: Session, entry):
+    """Remove an entry from the tag index"""
+    db.query(models.EntityTag).filter(
+        models.EntityTag.entity_type == ENTITY_TYPES[type(entry)],
+        models.EntityTag.entity_id == entry.id
+    ).delete(synchronize_session=False)
+
+
+def add_rows(db: Session, model, rows: list):
+    """Index a batch of newly inserted rows (dicts with id and tags)"""
+    entity_type = ENTITY_TYPES[model]
+    mappings = [
+        {"entity_type": entity_type, "entity_id": row["id"], "tag": tag}
+        for row in rows
+        for tag in _normalize(row["tags"])
+    ]
+    if mappings:
+        db.execute(insert(models.EntityTag), mappings)
+
+
+def rebuild(db: Session):
+    """Recompute the whole tag index from the tagged tables"""
+    db.query(models.EntityTag).delete()
+    for model, entity_type in ENTITY_TYPES.items():
+        rows = []
+        for entity_id, tags in db.query(model.id, model.tags).yield_per(1000):
+            rows.extend(
+                {"entity_type": entity_type, "entity_id": entity_id, "tag": tag}
+                for tag in _normalize(tags)
+            )
+        db.bulk_insert_mappings(models.EntityTag, rows)
+
+
+def _split(values: Optional[List[str]]) -> List[str]:
+    """Accept both repeated (?t=a&t=b) and comma-separated (?t=a,b) values"""
+    return sorted({tag.strip() for value in (values or []) for tag in value.split(",") if tag.strip()})
+
+
+class TagFilter:
+    """Query parameters that filter a list endpoint through the tag index"""
+
+    def __init__(
+        self,
+        tag: Optional[str] = None,
+        tags_all: Optional[List[str]] = Query(None),
+        tags_any: Optional[List[str]] = Query(None)
+    ):
+        self.tags_all = _split((tags_all or []) + ([tag] if tag else []))
+        self.tags_any = _split(tags_any)
+
+    def apply(self, query, model):
+        """Restrict a query on a tagged model to the requested tags"""
+        entity_type = ENTITY_TYPES[model]
+        if self.tags_all:
+            matching = (
+                select(models.EntityTag.entity_id)
+                .where(models.EntityTag.entity_type == entity_type, models.EntityTag.tag.in_(self.tags_all))
+                .group_by(models.EntityTag.entity_id)
+                .having(func.count() == len(self.tags_all))
+            )
+            query = query.filter(model.id.in_(matching))
+        if self.tags_any:
+            matching = (
+                select(models.EntityTag.entity_id)
+                .where(models.EntityTag.entity_type == entity_type, models.EntityTag.tag.in_(self.tags_any))
+            )
+            query = query.filter(model.id.in_(matching))
+        return query
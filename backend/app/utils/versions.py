@@ -0,0 +1,146 @@
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from typing import Callable, Optional
+from app import models
+from app.database import Base, async_engine, engine, get_db, get_read_db
+import hashlib
+
+VERSION_TABLE = models.TableVersion.__tablename__
+
+# Connection.info key holding the tables written in the current transaction
+_CHANGED = "changed_tables"
+# Session.info key holding {table: version} as bumped by the session's last commit
+_COMMITTED = "committed_versions"
+
+
+def _dependents() -> dict:
+    """Tables whose rows change when a row of the key table is deleted (ON DELETE CASCADE / SET NULL)"""
+    direct = {}
+    for table in Base.metadata.tables.values():
+        for foreign_key in table.foreign_keys:
+            if (foreign_key.ondelete or "").upper() in ("CASCADE", "SET NULL"):
+                direct.setdefault(foreign_key.column.table.name, set()).add(table.name)
+    closure = {}
+    for name in direct:
+        seen, stack = set(), [name]
+        while stack:
+            for dependent in direct.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        closure[name] = seen
+    return closure
+
+
+DELETE_DEPENDENTS = _dependents()
+
+
+def _record(connection, clauseelement, multiparams, params, execution_options, result):
+    """Note the table behind every INSERT/UPDATE/DELETE, ORM flushes included"""
+    if not getattr(clauseelement, "is_dml", False):
+        return
+    table_name = clauseelement.table.name
+    if table_name == VERSION_TABLE:
+        return
+    changed = connection.info.setdefault(_CHANGED, set())
+    changed.add(table_name)
+    if clauseelement.is_delete:
+        changed.update(DELETE_DEPENDENTS.get(table_name, ()))
+
+
+def _forget(connection):
+    connection.info.pop(_CHANGED, None)
+
+
+for _engine in [engine] + ([async_engine.sync_engine] if async_engine is not None else []):
+    event.listen(_engine, "after_execute", _record)
+    event.listen(_engine, "rollback", _forget)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session):
+    session.flush()
+    connection = session.connection()
+    changed = connection.info.pop(_CHANGED, None)
+    session.info[_COMMITTED] = bump(session, changed) if changed else {}
+
+
+def bump(db: Session, table_names) -> dict:
+    """Increment the tables' counters; returns their new versions where the backend supports RETURNING"""
+    table = models.TableVersion.__table__
+    statement = update(table).where(table.c.name.in_(sorted(table_names))).values(version=table.c.version + 1)
+    if not db.bind.dialect.update_returning:
+        db.execute(statement)
+        return {}
+    return dict(db.execute(statement.returning(table.c.name, table.c.version)).all())
+
+
+def committed(db: Session, table_name: str) -> Optional[int]:
+    """The version the session's last commit gave a table, or None if unknown.
+
+    The counter row stays locked until the commit, so this is exactly the
+    version of that transaction's write, even with other writers about.
+    """
+    return db.info.get(_COMMITTED, {}).get(table_name)
+
+
+def seed(db: Session):
+    """Make sure every table has a counter, and bump them all.
+
+    Startup migrations and older releases wrote without bumping, so ETags
+    handed out before this boot must not match anymore.
+    """
+    existing = {name for name, in db.query(models.TableVersion.name)}
+    for name in Base.metadata.tables:
+        if name not in existing and name != VERSION_TABLE:
+            db.add(models.TableVersion(name=name, version=0))
+    db.flush()
+    bump(db, [name for name in Base.metadata.tables if name != VERSION_TABLE])
+
+
+def current(db: Session, table_names) -> dict:
+    table = models.TableVersion.__table__
+    return dict(db.execute(select(table.c.name, table.c.version).where(table.c.name.in_(table_names))).all())
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header value against an ETag"""
+    opaque = etag.removeprefix("W/")
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque in candidates
+
+
+class ETag:
+    """Dependency for GET handlers whose response depends only on the given tables.
+
+    The tag combines those tables' version counters with the request URL.
+    A matching If-None-Match is answered with 304 before the handler (and
+    its queries) run; otherwise the ETag header is set and returned.
+    """
+
+    def __init__(self, *table_names: str, before: Optional[Callable[[], object]] = None):
+        self.table_names = sorted(table_names)
+        self.before = before  # e.g. flush buffered writes so the versions are current
+
+    def __call__(self, request: Request, response: Response, db: Session = Depends(get_read_db)) -> str:
+        if self.before is not None:
+            self.before()
+        versions = current(db, self.table_names)
+        db.rollback()  # leave the handler a fresh transaction
+        state = ",".join(f"{name}={versions.get(name, 0)}" for name in self.table_names)
+        digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{state}".encode()).hexdigest()[:20]
+        etag = f'W/"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+
+class PrimaryETag(ETag):
+    """ETag for handlers that read from the primary (get_db) rather than a replica"""
+
+    def __call__(self, request: Request, response: Response, db: Session = Depends(get_db)) -> str:
+        return super().__call__(request, response, db)
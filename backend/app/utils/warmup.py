@@ -0,0 +1,139 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from contextlib import AsyncExitStack, ExitStack
+from urllib.parse import urlsplit
+import gc
+import logging
+import os
+import time
+from app.database import POOL_OPTIONS, async_engine, async_read_engine, engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+# Open pool connections and run the hot read endpoints once before /api/ready
+# reports ready, so the first real requests find warm connections, compiled
+# statements, built adjacency indexes and a filled page cache
+WARMUP_ENABLED = os.getenv("STARTUP_WARMUP", "0") == "1"
+WARMUP_CONNECTIONS = int(os.getenv("STARTUP_WARMUP_CONNECTIONS", str(POOL_OPTIONS["pool_size"])))
+DEFAULT_WARMUP_PATHS = (
+    "/api/nodes/?limit=100",
+    "/api/links/?limit=100",
+    "/api/tasks/?limit=100",
+    "/api/skills/?limit=100",
+    "/api/goals/?limit=100",
+    "/api/cards/?limit=100",
+    "/api/income/?limit=100",
+    "/api/expenses/?limit=100",
+    "/api/investments/?limit=100",
+    "/api/journal/?limit=100",
+    "/api/tags/",
+    "/api/finance/summary",
+    "/api/graph/stats",
+)
+WARMUP_PATHS = [
+    path.strip() for path in os.getenv("STARTUP_WARMUP_PATHS", ",".join(DEFAULT_WARMUP_PATHS)).split(",") if path.strip()
+]
+
+
+class Readiness:
+    """Startup progress, reported by /api/ready"""
+
+    def __init__(self):
+        self.started = time.perf_counter()  # when the app module was imported
+        self.ready = False
+        self.report = {}
+        self.task = None  # the running warm-up, kept referenced until it finishes
+
+    def record(self, phase: str, started: float):
+        self.report[f"{phase}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_ready(self):
+        self.record("ready_after", self.started)
+        self.ready = True
+
+
+readiness = Readiness()
+
+
+def _pool_capacity(pooled) -> int:
+    """Connections the pool keeps open; in-memory SQLite pools hold just one"""
+    size = getattr(pooled.pool, "size", None)
+    return min(WARMUP_CONNECTIONS, size()) if size else 1
+
+
+def open_connections(pooled) -> int:
+    """Check out (and so open) a pool's worth of connections at once, then return them to the pool"""
+    count = _pool_capacity(pooled)
+    with ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(pooled.connect()).execute(text("SELECT 1"))
+    return count
+
+
+async def open_async_connections(pooled) -> int:
+    count = _pool_capacity(pooled.sync_engine)
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            connection = await stack.enter_async_context(pooled.connect())
+            await connection.execute(text("SELECT 1"))
+    return count
+
+
+async def _get(app, path: str) -> int:
+    """Run one GET through the full ASGI app in-process; returns the status code"""
+    url = urlsplit(path)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": url.path, "raw_path": url.path.encode(), "query_string": url.query.encode(), "root_path": "",
+        "headers": [(b"host", b"warmup")], "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app):
+    """Open pool connections, prime the hot read paths and freeze the heap, then report ready.
+
+    Failures are logged and never keep the app from becoming ready: a cold
+    request is slower, not wrong.
+    """
+    try:
+        started = time.perf_counter()
+        connections = 0
+        for pooled in (engine, read_engine):
+            if pooled is not None:
+                connections += await run_in_threadpool(open_connections, pooled)
+        for pooled in (async_engine, async_read_engine):
+            if pooled is not None:
+                connections += await open_async_connections(pooled)
+        readiness.report["connections"] = connections
+        readiness.record("connections", started)
+
+        started = time.perf_counter()
+        statuses = {path: await _get(app, path) for path in WARMUP_PATHS}
+        readiness.report["primed"] = len(statuses)
+        readiness.record("priming", started)
+        failed = {path: status for path, status in statuses.items() if status >= 400}
+        if failed:
+            logger.warning("Warm-up requests failed: %s", failed)
+
+        # Move everything startup built (modules, compiled statements, the
+        # adjacency index) out of the collector's generations, so the first
+        # full collection doesn't land on a real request and walk all of it.
+        # Frozen objects are still freed by reference counting
+        gc.collect()
+        gc.freeze()
+    except Exception:
+        logger.exception("Warm-up failed")
+    finally:
+        readiness.mark_ready()
@@ -0,0 +1,143 @@
+"""Requests/sec of the sync (threadpool) and async (event loop) database modes.
+
+Starts the API twice under uvicorn on a throwaway SQLite database, once
+with DATABASE_ASYNC=0 and once with DATABASE_ASYNC=1, seeds it through
+the API and hammers a few read endpoints with concurrent clients.
+
+    cd backend
+    python benchmarks/async_benchmark.py --clients 200 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    "/api/nodes/?limit=50",
+    "/api/tasks/?limit=50",
+    "/api/skills/",
+    "/api/graph/neighborhood/{root}?depth=2&limit=100",
+]
+
+
+def start_server(database_url: str, port: int, async_mode: bool) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url, DATABASE_ASYNC="1" if async_mode else "0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def seed(base_url: str, nodes: int, tasks: int) -> str:
+    """Create a linked mind map, tasks and skills; returns a node id to traverse from"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        node_ids = []
+        for i in range(nodes):
+            response = await client.post("/api/nodes/", json={
+                "title": f"Node {i}", "type": "Task", "x": i % 40 * 50.0, "y": i // 40 * 50.0,
+            })
+            response.raise_for_status()
+            node_ids.append(response.json()["id"])
+        pairs = [{"source": node_ids[i], "target": node_ids[(i * 7 + 1) % nodes]} for i in range(nodes)]
+        (await client.post("/api/links/bulk", json=pairs)).raise_for_status()
+        for i in range(tasks):
+            (await client.post("/api/tasks/", json={"content": f"Task {i}"})).raise_for_status()
+        for i in range(20):
+            (await client.post("/api/skills/", json={"title": f"Skill {i}"})).raise_for_status()
+        return node_ids[0]
+
+
+async def hammer(base_url: str, clients: int, duration: float, root: str) -> dict:
+    paths = [endpoint.format(root=root) for endpoint in ENDPOINTS]
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.TransportError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                i += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+async def run_mode(async_mode: bool, args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(database_url, args.port, async_mode)
+        try:
+            await wait_until_up(base_url)
+            root = await seed(base_url, args.nodes, args.tasks)
+            await hammer(base_url, args.clients, min(args.duration, 2), root)  # warm-up
+            return await hammer(base_url, args.clients, args.duration, root)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for name, async_mode in (("sync", False), ("async", True)):
+        results[name] = asyncio.run(run_mode(async_mode, args))
+
+    print(f"{args.clients} concurrent clients, {args.duration:g}s per mode")
+    print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'requests':>9} {'errors':>7}")
+    for name, r in results.items():
+        print(f"{name:<6} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['requests']:>9} {r['errors']:>7}")
+    print(f"async / sync: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cold start: time from spawning a worker to ready, and its first requests.
+
+Seeds a synthetic account (synthetic_data.py) into a throwaway SQLite
+database, then boots uvicorn on it --runs times in each startup mode:
+
+  migrate     DATABASE_SCHEMA_FINGERPRINT=0: create_all and every startup
+              migration on each boot (the behaviour before fingerprints)
+  current     the stored schema fingerprint matches, startup skips both
+  warm-up     as current, plus STARTUP_WARMUP=1 before /api/ready turns 200
+
+For every boot it measures spawn -> /api/ready returning 200, then the
+latency of the first request to each of a few hot endpoints. Medians are
+printed.
+
+    cd backend
+    python benchmarks/cold_start_benchmark.py --scale 0.1 --runs 5
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic_data import DatasetSpec, seed_database  # noqa: E402  (app code is imported lazily)
+
+MODES = {
+    "migrate": {"DATABASE_SCHEMA_FINGERPRINT": "0", "STARTUP_WARMUP": "0"},
+    "current": {"DATABASE_SCHEMA_FINGERPRINT": "1", "STARTUP_WARMUP": "0"},
+    "warm-up": {"DATABASE_SCHEMA_FINGERPRINT": "1", "STARTUP_WARMUP": "1"},
+}
+
+FIRST_REQUESTS = [
+    "/api/nodes/?limit=100",
+    "/api/tasks/?limit=100",
+    "/api/expenses/?limit=100",
+    "/api/finance/summary",
+    "/api/graph/stats",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot(env: dict, timeout: float = 120.0) -> dict:
+    """Start one worker, wait for readiness, send the first requests, stop it"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError("worker did not become ready")
+                try:
+                    response = client.get("/api/ready")
+                    if response.status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+            ready_ms = (time.perf_counter() - started) * 1000
+
+            first = []
+            for path in FIRST_REQUESTS:
+                request_started = time.perf_counter()
+                client.get(path).raise_for_status()
+                first.append((time.perf_counter() - request_started) * 1000)
+        report = response.json()
+        return {
+            "ready_ms": ready_ms,
+            "init_db_ms": report.get("init_db_ms", 0.0),
+            "first_total_ms": sum(first),
+            "first_max_ms": max(first),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.1, help="dataset size relative to synthetic_data's default")
+    parser.add_argument("--runs", type=int, default=5, help="boots per mode")
+    args = parser.parse_args()
+
+    spec = DatasetSpec().scaled(args.scale)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(
+            DATABASE_URL=f"sqlite:///{os.path.join(directory, 'cold_start.db')}",
+            BLOB_STORAGE_DIR=os.path.join(directory, "blobs"),
+        )
+        for name in ("DATABASE_READ_URL", "DATABASE_ASYNC_URL", "DATABASE_ASYNC_READ_URL"):
+            os.environ.pop(name, None)
+
+        print(f"seeding {spec.as_dict()}", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pool.submit(seed_database, spec).result()
+
+        results = {}
+        for mode, settings in MODES.items():
+            env = dict(os.environ, **settings)
+            boot(env)  # warm the OS page cache and store the fingerprint, not measured
+            runs = [boot(env) for _ in range(args.runs)]
+            results[mode] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    print(f"\nmedian of {args.runs} boots; first requests: {', '.join(FIRST_REQUESTS)}")
+    print(f"{'mode':<9}{'ready ms':>10}{'init_db ms':>12}{'first reqs ms':>15}{'slowest ms':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<9}{r['ready_ms']:>10.0f}{r['init_db_ms']:>12.1f}{r['first_total_ms']:>15.1f}{r['first_max_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
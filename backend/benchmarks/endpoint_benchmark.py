@@ -0,0 +1,450 @@
+"""Latency, throughput, queries per request and peak RSS for every API endpoint.
+
+Seeds a synthetic account (see synthetic_data.py) into a throwaway SQLite
+database in a child process, then drives every route in app/routers
+in-process through the ASGI app with httpx, with no network or server
+process involved. Reads run first against the seeded data. Writes then
+create, update and delete their own rows, so the read numbers are not
+skewed by earlier writes.
+
+Save a run as a baseline and compare later runs against it. Comparing
+exits with status 1 when an endpoint's p95 latency or its queries per
+request got worse:
+
+    cd backend
+    python benchmarks/endpoint_benchmark.py --save baseline.json
+    python benchmarks/endpoint_benchmark.py --compare baseline.json
+
+--scale 0.1 seeds a tenth of the default account for quick runs. Settings
+that change behaviour (DATABASE_ASYNC, FAST_JSON_RESPONSES, ...) are read
+from the environment as usual and recorded in the baseline.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic_data import TAGS, WORDS, DatasetSpec, database_size, seed_database  # noqa: E402  (app code is imported lazily)
+
+# Recorded with every run; a baseline taken with different values is not comparable
+SETTINGS = (
+    "DATABASE_ASYNC", "FAST_JSON_RESPONSES", "METRICS_ENABLED", "REQUEST_PROFILING", "GRAPH_ADJACENCY_INDEX",
+    "NODE_POSITION_COALESCE_MS", "DATABASE_POOL_SIZE", "DATABASE_MAX_OVERFLOW", "SQLITE_JOURNAL_MODE",
+    "SQLITE_SYNCHRONOUS", "SQLITE_CACHE_SIZE", "SQLITE_MMAP_SIZE", "SQLITE_TEMP_STORE",
+)
+PAGE = 100
+
+
+class QueryCount:
+    __slots__ = ("queries",)
+
+    def __init__(self):
+        self.queries = 0
+
+
+_counter: ContextVar[Optional[QueryCount]] = ContextVar("benchmark_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _counter.get()
+    if counter is not None:
+        counter.queries += 1
+
+
+@dataclass
+class Case:
+    name: str  # method and route template, the key results are stored under
+    request: Callable[[int], tuple]  # call number -> (method, url, httpx kwargs)
+    created: Optional[str] = None  # keep response bodies under this key for a later delete case
+    needs: Optional[str] = None  # reads rows an earlier case kept under this key
+    heavy: bool = False  # whole-account responses; run --heavy-requests times instead
+    revalidate: bool = False  # send If-None-Match with the ETag of a first plain request
+    expect: int = 0  # status that counts as success besides 2xx (304 for revalidation)
+
+
+def build_cases(dataset, rng: random.Random, calls: int, created: dict) -> list:
+    """Every route in app/routers, reads first, then creates, updates and deletes.
+
+    Create cases append their response bodies to created[key]; the matching
+    delete case pops them, so each endpoint runs `calls` times on rows of its own.
+    """
+    ids = dataset.ids
+
+    def cycle(name):
+        return lambda i: ids[name][i % len(ids[name])]
+
+    node, task, skill, goal, card, journal = (
+        cycle("nodes"), cycle("tasks"), cycle("skills"), cycle("goals"), cycle("cards"), cycle("journal")
+    )
+    income, expense, investment = cycle("income"), cycle("expenses"), cycle("investments")
+
+    def get(url):
+        return lambda i: ("GET", url(i) if callable(url) else url, {})
+
+    def deletes(name, key, url):
+        return Case(name, lambda i: ("DELETE", url(created[key].pop()), {}), needs=key)
+
+    def new_pair():
+        while True:
+            source, target = rng.sample(ids["nodes"], 2)
+            pair = frozenset((source, target))
+            if pair not in dataset.link_pairs:
+                dataset.link_pairs.add(pair)
+                return {"source": source, "target": target}
+
+    def transaction(i):
+        return {
+            "source": rng.choice(WORDS).capitalize(), "amount": round(rng.uniform(1, 500), 2),
+            "tags": rng.sample(TAGS, 2), "date": (date(2024, 1, 1) + timedelta(days=i % 365)).isoformat(),
+        }
+
+    def import_body(i):
+        lines = [json.dumps(transaction(i * PAGE + j)) for j in range(PAGE)]
+        return {"content": "\n".join(lines).encode(), "headers": {"Content-Type": "application/x-ndjson"}}
+
+    def task_update(i):
+        task_id = task(i)
+        return ("PUT", f"/api/tasks/{task_id}", {"json": {
+            "content": f"Updated task {i}", "status": "Done" if i % 2 else "To Do",
+            "subtasks": [
+                {"id": subtask_id, "content": f"Step {j} rev {i}", "completed": bool((i + j) % 2)}
+                for j, subtask_id in enumerate(dataset.subtasks[task_id])
+            ],
+        }})
+
+    def subtask_update(i):
+        task_id = task(i)
+        return ("PUT", f"/api/tasks/{task_id}/subtasks/{dataset.subtasks[task_id][0]}", {"json": {"completed": bool(i % 2)}})
+
+    def journal_body(i):
+        return {
+            "title": f"Entry {i}", "content": " ".join(rng.choice(WORDS) for _ in range(120)),
+            "photos": [f"/api/media/{digest}" for digest in dataset.media[i % len(dataset.media):][:2]],
+            "voiceNotes": [], "tags": rng.sample(TAGS, 2), "date": "2024-06-01",
+        }
+
+    def node_body(i):
+        return {"title": f"Node {i}", "type": "Task", "x": float(i), "y": float(-i)}
+
+    def positions(i):
+        return [{"id": node(i * 50 + j), "x": float(i + j), "y": float(j)} for j in range(50)]
+
+    def bulk_links(i):
+        return [new_pair() for _ in range(20)]
+
+    bulk_delete = dataset.take("nodes", 5 * calls)
+    search_word = WORDS[0]
+
+    return [
+        # Reads
+        Case("GET /api/bootstrap/", get("/api/bootstrap/"), heavy=True),
+        Case("GET /api/bootstrap/ (304)", get("/api/bootstrap/"), revalidate=True, expect=304),
+        Case("GET /api/nodes/", get("/api/nodes/"), heavy=True),
+        Case("GET /api/nodes/?limit", get(f"/api/nodes/?limit={PAGE}")),
+        Case("GET /api/nodes/{node_id}", get(lambda i: f"/api/nodes/{node(i)}")),
+        Case("GET /api/links/?limit", get(f"/api/links/?limit={PAGE}")),
+        Case("GET /api/links/node/{node_id}", get(lambda i: f"/api/links/node/{node(i)}")),
+        Case("GET /api/graph/neighborhood/{node_id}", get(lambda i: f"/api/graph/neighborhood/{node(i)}?depth=2&limit=500")),
+        Case("GET /api/graph/stats", get("/api/graph/stats")),
+        Case("GET /api/tasks/?limit", get(f"/api/tasks/?limit={PAGE}")),
+        Case("GET /api/tasks/{task_id}", get(lambda i: f"/api/tasks/{task(i)}")),
+        Case("GET /api/skills/", get("/api/skills/")),
+        Case("GET /api/skills/{skill_id}", get(lambda i: f"/api/skills/{skill(i)}")),
+        Case("GET /api/goals/", get("/api/goals/")),
+        Case("GET /api/goals/{goal_id}", get(lambda i: f"/api/goals/{goal(i)}")),
+        Case("GET /api/goals/{goal_id}/tasks", get(lambda i: f"/api/goals/{goal(i)}/tasks?limit={PAGE}")),
+        Case("GET /api/cards/", get("/api/cards/")),
+        Case("GET /api/cards/{card_id}", get(lambda i: f"/api/cards/{card(i)}")),
+        Case("GET /api/income/?limit", get(f"/api/income/?limit={PAGE}")),
+        Case("GET /api/income/{income_id}", get(lambda i: f"/api/income/{income(i)}")),
+        Case("GET /api/expenses/?limit", get(f"/api/expenses/?limit={PAGE}")),
+        Case("GET /api/expenses/?tag&from&to", get(f"/api/expenses/?limit={PAGE}&tag={TAGS[0]}&from=2022-01-01&to=2022-12-31")),
+        Case("GET /api/expenses/{expense_id}", get(lambda i: f"/api/expenses/{expense(i)}")),
+        Case("GET /api/investments/?limit", get(f"/api/investments/?limit={PAGE}")),
+        Case("GET /api/investments/{investment_id}", get(lambda i: f"/api/investments/{investment(i)}")),
+        Case("GET /api/finance/summary", get("/api/finance/summary")),
+        Case("GET /api/tags/", get("/api/tags/")),
+        Case("GET /api/journal/?limit", get(f"/api/journal/?limit={PAGE}")),
+        Case("GET /api/journal/search", get(f"/api/journal/search?q={search_word}")),
+        Case("GET /api/journal/{entry_id}", get(lambda i: f"/api/journal/{journal(i)}")),
+        Case("GET /api/media/{digest}", get(lambda i: f"/api/media/{dataset.media[i % len(dataset.media)]}")),
+        Case("GET /api/export/", get("/api/export/?format=ndjson"), heavy=True),
+        # Creates
+        Case("POST /api/nodes/", lambda i: ("POST", "/api/nodes/", {"json": node_body(i)}), created="nodes"),
+        Case("POST /api/links/", lambda i: ("POST", "/api/links/", {"json": new_pair()}), created="links"),
+        Case("POST /api/links/bulk", lambda i: ("POST", "/api/links/bulk", {"json": bulk_links(i)})),
+        Case("POST /api/tasks/", lambda i: ("POST", "/api/tasks/", {"json": {
+            "content": f"Task {i}", "skillId": skill(i), "goalId": goal(i),
+        }}), created="tasks"),
+        # On tasks of its own: PUT /api/tasks/{task_id} replaces the seeded tasks' subtask lists
+        Case("POST /api/tasks/{task_id}/subtasks", lambda i: (
+            "POST", f"/api/tasks/{created['tasks'][i % len(created['tasks'])]['id']}/subtasks", {"json": {"content": f"Step {i}"}}
+        ), created="subtasks", needs="tasks"),
+        Case("POST /api/skills/", lambda i: ("POST", "/api/skills/", {"json": {"title": f"Skill {i}"}}), created="skills"),
+        Case("POST /api/goals/", lambda i: ("POST", "/api/goals/", {"json": {"title": f"Goal {i}"}}), created="goals"),
+        Case("POST /api/cards/", lambda i: ("POST", "/api/cards/", {"json": {
+            "nickname": f"Card {i}", "bankName": "Bench Bank", "cardholderName": "Bench User",
+            "limit": 5000, "cardType": "Credit",
+        }}), created="cards"),
+        Case("POST /api/income/", lambda i: ("POST", "/api/income/", {"json": transaction(i)}), created="income"),
+        Case("POST /api/income/import", lambda i: ("POST", "/api/income/import", import_body(i))),
+        Case("POST /api/expenses/", lambda i: ("POST", "/api/expenses/", {"json": transaction(i)}), created="expenses"),
+        Case("POST /api/expenses/import", lambda i: ("POST", "/api/expenses/import", import_body(i))),
+        Case("POST /api/investments/", lambda i: ("POST", "/api/investments/", {"json": transaction(i)}), created="investments"),
+        Case("POST /api/investments/import", lambda i: ("POST", "/api/investments/import", import_body(i))),
+        Case("POST /api/journal/", lambda i: ("POST", "/api/journal/", {"json": journal_body(i)}), created="journal"),
+        Case("POST /api/media/", lambda i: ("POST", "/api/media/", {
+            "content": rng.randbytes(64 * 1024), "headers": {"Content-Type": "image/jpeg"},
+        })),
+        # Updates
+        Case("PUT /api/nodes/{node_id}", lambda i: ("PUT", f"/api/nodes/{node(i)}", {"json": {"title": f"Renamed {i}", "progress": i % 100}})),
+        Case("PATCH /api/nodes/positions", lambda i: ("PATCH", "/api/nodes/positions", {"json": positions(i)})),
+        Case("POST /api/graph/layout", lambda i: ("POST", "/api/graph/layout?mode=incremental", {}), heavy=True),
+        Case("PUT /api/tasks/{task_id}", task_update),
+        Case("PUT /api/tasks/{task_id}/subtasks/{subtask_id}", subtask_update),
+        Case("PUT /api/skills/{skill_id}", lambda i: ("PUT", f"/api/skills/{skill(i)}", {"json": {"progress": i % 100}})),
+        Case("PUT /api/goals/{goal_id}", lambda i: ("PUT", f"/api/goals/{goal(i)}", {"json": {"summary": f"Revision {i}"}})),
+        Case("PUT /api/cards/{card_id}", lambda i: ("PUT", f"/api/cards/{card(i)}", {"json": {"limit": 1000 + i}})),
+        Case("PUT /api/journal/{entry_id}", lambda i: ("PUT", f"/api/journal/{journal(i)}", {"json": {
+            "content": " ".join(rng.choice(WORDS) for _ in range(120)), "tags": rng.sample(TAGS, 2),
+        }})),
+        # Deletes, of rows the create cases made (and seeded nodes, with their links, for the bulk delete)
+        deletes("DELETE /api/nodes/{node_id}", "nodes", lambda row: f"/api/nodes/{row['id']}"),
+        Case("DELETE /api/nodes/", lambda i: (
+            "DELETE", "/api/nodes/", {"params": [("ids", node_id) for node_id in bulk_delete[i * 5:i * 5 + 5]]}
+        )),
+        deletes("DELETE /api/links/{link_id}", "links", lambda row: f"/api/links/{row['id']}"),
+        deletes("DELETE /api/tasks/{task_id}/subtasks/{subtask_id}", "subtasks",
+                lambda row: f"/api/tasks/{row['task_id']}/subtasks/{row['id']}"),
+        deletes("DELETE /api/tasks/{task_id}", "tasks", lambda row: f"/api/tasks/{row['id']}"),
+        deletes("DELETE /api/skills/{skill_id}", "skills", lambda row: f"/api/skills/{row['id']}"),
+        deletes("DELETE /api/goals/{goal_id}", "goals", lambda row: f"/api/goals/{row['id']}"),
+        deletes("DELETE /api/cards/{card_id}", "cards", lambda row: f"/api/cards/{row['id']}"),
+        deletes("DELETE /api/income/{income_id}", "income", lambda row: f"/api/income/{row['id']}"),
+        deletes("DELETE /api/expenses/{expense_id}", "expenses", lambda row: f"/api/expenses/{row['id']}"),
+        deletes("DELETE /api/investments/{investment_id}", "investments", lambda row: f"/api/investments/{row['id']}"),
+        deletes("DELETE /api/journal/{entry_id}", "journal", lambda row: f"/api/journal/{row['id']}"),
+    ]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+async def run_case(client, case: Case, warmup: int, requests: int, concurrency: int, created: dict) -> dict:
+    headers = {}
+    if case.revalidate:
+        method, url, kwargs = case.request(0)
+        headers["If-None-Match"] = (await client.request(method, url, **kwargs)).headers["etag"]
+
+    latencies, queries = [], []
+    errors = 0
+    next_call = 0
+
+    async def worker(stop: int):
+        nonlocal errors, next_call
+        while next_call < stop:
+            i = next_call
+            next_call += 1
+            method, url, kwargs = case.request(i)
+            if headers:
+                kwargs = {**kwargs, "headers": {**kwargs.get("headers", {}), **headers}}
+            counter = QueryCount()
+            token = _counter.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                _counter.reset(token)
+            ok = response.status_code < 400 or response.status_code == case.expect
+            if not ok:
+                errors += 1
+            elif case.created:
+                created.setdefault(case.created, []).append(response.json())
+            if i >= warmup:
+                latencies.append(elapsed)
+                queries.append(counter.queries)
+
+    await asyncio.gather(*(worker(warmup) for _ in range(concurrency)))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(warmup + requests) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "rps": round(requests / elapsed, 1),
+        "queries": round(statistics.fmean(queries), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def run(args, spec: DatasetSpec, dataset) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from app.database import async_engine, async_read_engine, engine, read_engine
+    from app.main import app
+
+    for pooled in (engine, read_engine, async_engine, async_read_engine):
+        if pooled is not None:
+            event.listen(getattr(pooled, "sync_engine", pooled), "before_cursor_execute", _count_query)
+
+    created = {}
+    cases = build_cases(dataset, random.Random(spec.seed), args.warmup + args.requests, created)
+    if args.only:
+        selected = [case for case in cases if any(pattern in case.name for pattern in args.only)]
+        needed = {case.needs for case in selected} - {None}
+        while True:  # plus the cases creating the rows those delete
+            producers = [case for case in cases if case.created in needed and case not in selected]
+            if not producers:
+                break
+            selected += producers
+            needed |= {case.needs for case in producers} - {None}
+        cases = [case for case in cases if case in selected]
+
+    results = {}
+    await app.router.startup()
+    print(f"\n{format_header()}", flush=True)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for case in cases:
+                warmup, requests = (args.heavy_warmup, args.heavy_requests) if case.heavy else (args.warmup, args.requests)
+                results[case.name] = result = await run_case(client, case, warmup, requests, args.concurrency, created)
+                print(format_row(case.name, result), flush=True)
+    finally:
+        await app.router.shutdown()
+    return results
+
+
+COLUMNS = (("p50_ms", "p50 ms"), ("p95_ms", "p95 ms"), ("p99_ms", "p99 ms"), ("rps", "req/s"), ("queries", "queries"),
+           ("peak_rss_mb", "RSS MB"), ("errors", "errors"))
+
+
+def format_header() -> str:
+    return f"{'endpoint':<52}" + "".join(f"{title:>10}" for _, title in COLUMNS)
+
+
+def format_row(name: str, result: dict) -> str:
+    return f"{name:<52}" + "".join(f"{result[key]:>10}" for key, _ in COLUMNS)
+
+
+def compare(baseline: dict, current: dict, tolerance: float, min_delta_ms: float) -> int:
+    """Print per-endpoint changes against a baseline; returns the number of regressions"""
+    for key in ("dataset", "settings"):
+        if baseline[key] != current[key]:
+            print(f"warning: {key} differs from the baseline's, results may not be comparable")
+
+    print(f"\n{'endpoint':<52}{'p95 was':>10}{'p95 now':>10}{'change':>9}{'queries':>14}")
+    regressions = 0
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            print(f"{name:<52}{'':>10}{now['p95_ms']:>10}{'new':>9}")
+            continue
+        change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        slower = change > tolerance and now["p95_ms"] - before["p95_ms"] > min_delta_ms
+        more_queries = now["queries"] > before["queries"] + 0.5
+        flag = "  REGRESSION" if slower or more_queries else ""
+        regressions += bool(flag)
+        print(
+            f"{name:<52}{before['p95_ms']:>10}{now['p95_ms']:>10}{change:>+9.0%}"
+            f"{before['queries']:>7}->{now['queries']:<6}{flag}"
+        )
+    print(f"\npeak RSS: {baseline['peak_rss_mb']} MB -> {current['peak_rss_mb']} MB")
+    print(f"{regressions} regression(s)" if regressions else "no regressions")
+    return regressions
+
+
+def main():
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every dataset row count")
+    for name in ("nodes", "links", "tasks", "transactions", "journal_entries", "media_blobs"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"default {getattr(defaults, name)} x scale")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--requests", type=int, default=100, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per endpoint first")
+    parser.add_argument("--heavy-requests", type=int, default=5, help="for whole-account endpoints (bootstrap, export...)")
+    parser.add_argument("--heavy-warmup", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight per endpoint")
+    parser.add_argument("--only", action="append", help="run endpoints whose name contains this (repeatable)")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a baseline JSON file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    spec = defaults.scaled(args.scale)
+    for name in ("nodes", "links", "tasks", "transactions", "journal_entries", "media_blobs"):
+        if getattr(args, name) is not None:
+            setattr(spec, name, getattr(args, name))
+    spec.seed = args.seed
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        os.environ.update(
+            DATABASE_URL=database_url,
+            BLOB_STORAGE_DIR=os.path.join(directory, "blobs"),
+            MAX_UPLOAD_BYTES=str(25 * 1024 * 1024),
+        )
+        for name in ("DATABASE_READ_URL", "DATABASE_ASYNC_URL", "DATABASE_ASYNC_READ_URL"):
+            os.environ.pop(name, None)  # everything goes to the throwaway database
+
+        print(f"seeding {spec.as_dict()}", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            dataset, seed_seconds = pool.submit(seed_database, spec).result()
+
+        print(f"seeded in {seed_seconds:.1f}s, {database_size(database_url) / 1e6:.0f} MB on disk", flush=True)
+        endpoints = asyncio.run(run(args, spec, dataset))
+
+    current = {
+        "dataset": spec.as_dict(),
+        "settings": {name: os.environ[name] for name in SETTINGS if name in os.environ},
+        "run": {"requests": args.requests, "warmup": args.warmup, "concurrency": args.concurrency},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed_seconds": round(seed_seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "endpoints": endpoints,
+    }
+    print(f"\npeak RSS {current['peak_rss_mb']} MB")
+    failing = [name for name, result in endpoints.items() if result["errors"]]
+    if failing:
+        print(f"warning: requests failed on {', '.join(failing)}")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"saved {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.tolerance, args.min_delta_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Per-row cost of encoding list responses, with and without FAST_JSON_RESPONSES.
+
+Builds unsaved ORM rows in memory (no database involved) and encodes them
+the way a list endpoint would:
+
+  default     FastAPI's path: validate into the response model, serialize
+              it back to Python, then json.dumps (JSONResponse)
+  adapter     precompiled TypeAdapter: validate + Rust dump_json
+  fast        app.utils.fast_json: projection compiled from the response
+              model, encoded with orjson (what FAST_JSON_RESPONSES=1 uses)
+
+    cd backend
+    python benchmarks/serialization_benchmark.py --rows 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app import models, schemas
+from app.routers.links import serialize_link
+from app.utils import fast_json
+
+
+def make_rows(n: int) -> dict:
+    start = datetime(2024, 1, 1, 8, 30, 15, 123456)
+    stamps = [start + timedelta(minutes=i) for i in range(n)]
+    return {
+        "Node": (schemas.Node, [
+            models.Node(
+                id=f"node-{i}", title=f"Node {i}", summary="A short summary", type=models.NodeType.SKILL,
+                x=i * 1.5, y=-i * 0.5, progress=i % 100, completed=False, created_at=t, updated_at=t,
+            )
+            for i, t in enumerate(stamps)
+        ]),
+        "Link": (schemas.Link, [
+            serialize_link(models.Link(id=f"link-{i}", source_id=f"node-{i}", target_id=f"node-{i + 1}", created_at=t))
+            for i, t in enumerate(stamps)
+        ]),
+        "Task": (schemas.Task, [
+            models.Task(
+                id=f"task-{i}", content=f"Task {i}", status=models.TaskStatus.TODO, skill_id="skill-1", goal_id=None,
+                created_at=t, updated_at=t,
+                subtasks=[
+                    models.Subtask(id=f"subtask-{i}-{j}", task_id=f"task-{i}", content="Step", completed=j == 0, created_at=t)
+                    for j in range(2)
+                ],
+            )
+            for i, t in enumerate(stamps)
+        ]),
+        "Expense": (schemas.Expense, [
+            models.Expense(
+                id=f"expense-{i}", source="Groceries", amount=12.5 + i, tags=["food", "weekly"],
+                date=date(2024, 1, 1) + timedelta(days=i % 365), created_at=t,
+            )
+            for i, t in enumerate(stamps)
+        ]),
+        "JournalEntry": (schemas.JournalEntry, [
+            models.JournalEntry(
+                id=f"journal-{i}", title=f"Day {i}", content="Wrote some notes. " * 20,
+                photos=[f"/api/media/{i:064x}"], voice_notes=[], tags=["daily"],
+                date=date(2024, 1, 1) + timedelta(days=i % 365), created_at=t, updated_at=t,
+            )
+            for i, t in enumerate(stamps)
+        ]),
+    }
+
+
+def encode_default(model, rows) -> bytes:
+    field = create_response_field(name="response", type_=List[model], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=rows, by_alias=True, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def encode_adapter(model, rows) -> bytes:
+    adapter = TypeAdapter(List[model])
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True), by_alias=True)
+
+
+def encode_fast(model, rows) -> bytes:
+    return fast_json.dumps(model, rows)
+
+
+ENCODERS = {"default": encode_default, "adapter": encode_adapter, "fast": encode_fast}
+
+
+def per_row_us(encode, model, rows, repeat: int) -> float:
+    encode(model, rows)  # warm up caches (compiled projectors, pydantic schemas)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(model, rows)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="best of N runs")
+    args = parser.parse_args()
+
+    print(f"µs per row, best of {args.repeat}, {args.rows} rows")
+    print(f"{'model':<14}" + "".join(f"{name:>10}" for name in ENCODERS) + f"{'speedup':>10}")
+    for name, (model, rows) in make_rows(args.rows).items():
+        outputs = {encoder: json.loads(encode(model, rows)) for encoder, encode in ENCODERS.items()}
+        if outputs["fast"] != outputs["default"]:
+            raise SystemExit(f"{name}: fast path output differs from FastAPI's")
+        costs = {encoder: per_row_us(encode, model, rows, args.repeat) for encoder, encode in ENCODERS.items()}
+        print(
+            f"{name:<14}" + "".join(f"{cost:>10.2f}" for cost in costs.values())
+            + f"{costs['default'] / costs['fast']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Deterministic synthetic account for the benchmarks.
+
+Rows are bulk-inserted straight into the tables (no API round trips), then
+the derived data the write endpoints would have maintained is rebuilt:
+node degrees, the tag index, finance rollups and the journal search index.
+The same spec and seed always produce the same rows, ids and timestamps.
+
+App modules are imported inside seed(), so callers can point DATABASE_URL
+and BLOB_STORAGE_DIR at a throwaway location before the engine is created.
+"""
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+
+BATCH_SIZE = 5000
+START = datetime(2023, 1, 1, 8, 0, 0)
+TAGS = [
+    "food", "rent", "travel", "health", "fun", "work", "family", "books", "gym", "coffee",
+    "salary", "bonus", "stocks", "bonds", "crypto", "gifts", "utilities", "transport", "music", "garden",
+]
+WORDS = (
+    "focus plan review learn build ship write read train rest walk call design test measure "
+    "refactor sketch notes garden market budget trip river mountain friends project deadline"
+).split()
+
+# Transactions are split across the three ledgers in these proportions
+LEDGER_SHARES = {"income": 0.2, "expenses": 0.7, "investments": 0.1}
+
+
+@dataclass
+class DatasetSpec:
+    nodes: int = 10_000
+    links: int = 30_000
+    tasks: int = 20_000
+    subtasks_per_task: int = 3
+    skills: int = 50
+    goals: int = 50
+    cards: int = 10
+    transactions: int = 200_000
+    journal_entries: int = 20_000
+    media_blobs: int = 200
+    media_bytes: int = 32 * 1024
+    seed: int = 42
+
+    def scaled(self, factor: float) -> "DatasetSpec":
+        """Every row count multiplied by factor (at least 1 each); sizes and seed unchanged"""
+        unscaled = {"subtasks_per_task", "media_bytes", "seed"}
+        return DatasetSpec(**{
+            f.name: getattr(self, f.name) if f.name in unscaled else max(1, int(getattr(self, f.name) * factor))
+            for f in fields(self)
+        })
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class Dataset:
+    """Ids of the seeded rows, for building request paths and bodies"""
+    spec: DatasetSpec
+    ids: dict = field(default_factory=dict)  # table name -> [id, ...]
+    subtasks: dict = field(default_factory=dict)  # task id -> [subtask id, ...]
+    link_pairs: set = field(default_factory=set)  # frozenset({source, target})
+    media: list = field(default_factory=list)  # blob digests
+
+    def take(self, name: str, count: int) -> list:
+        """Remove and return the last `count` ids of a table, for a case that deletes seeded rows.
+
+        Later cases then never read or write rows that are already gone.
+        """
+        pool = self.ids[name]
+        if count > len(pool):
+            raise SystemExit(f"dataset has too few {name} ({len(pool)}) for {count} writes; raise --scale or lower --requests")
+        taken = pool[-count:]
+        del pool[-count:]
+        return taken
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _stamp(i: int) -> datetime:
+    return START + timedelta(minutes=i)
+
+
+def _seed_media(spec: DatasetSpec, rng: random.Random) -> list:
+    """Blobs written through the blob store, as the upload endpoint would"""
+    from app.utils.blobs import blob_store
+
+    return [
+        blob_store.put(rng.randbytes(spec.media_bytes), "image/jpeg" if i % 4 else "audio/webm")
+        for i in range(spec.media_blobs)
+    ]
+
+
+def seed(spec: DatasetSpec) -> Dataset:
+    """Fill an empty, initialized database with the account described by spec"""
+    from app import models
+    from app.database import SessionLocal
+    from app.utils import degrees, journal_search, rollups, tag_index
+    from app.utils.blobs import media_url
+
+    rng = random.Random(spec.seed)
+    dataset = Dataset(spec=spec)
+    db = SessionLocal()
+    try:
+        node_types = list(models.NodeType)
+        node_ids = [f"node-{i:06d}" for i in range(spec.nodes)]
+        _insert(db, models.Node, [
+            {
+                "id": node_id, "title": _sentence(rng, 3), "summary": _sentence(rng, 12),
+                "type": node_types[i % len(node_types)], "x": (i % 100) * 60.0, "y": (i // 100) * 60.0,
+                "progress": rng.randint(0, 100), "completed": rng.random() < 0.2,
+                "created_at": _stamp(i), "updated_at": _stamp(i),
+            }
+            for i, node_id in enumerate(node_ids)
+        ])
+        dataset.ids["nodes"] = node_ids
+
+        links = []
+        max_links = spec.nodes * (spec.nodes - 1) // 2
+        while len(links) < min(spec.links, max_links):
+            source, target = rng.sample(node_ids, 2)
+            pair = frozenset((source, target))
+            if pair in dataset.link_pairs:
+                continue
+            dataset.link_pairs.add(pair)
+            lo, hi = sorted(pair)
+            links.append({
+                "id": f"link-{len(links):06d}", "source_id": source, "target_id": target,
+                "pair_lo": lo, "pair_hi": hi, "created_at": _stamp(len(links)),
+            })
+        _insert(db, models.Link, links)
+        dataset.ids["links"] = [link["id"] for link in links]
+
+        skill_ids = [f"skill-{i:04d}" for i in range(spec.skills)]
+        _insert(db, models.Skill, [
+            {"id": skill_id, "title": _sentence(rng, 2), "summary": _sentence(rng, 8), "progress": rng.randint(0, 100),
+             "category": rng.choice(WORDS), "created_at": _stamp(i), "updated_at": _stamp(i)}
+            for i, skill_id in enumerate(skill_ids)
+        ])
+        dataset.ids["skills"] = skill_ids
+
+        goal_ids = [f"goal-{i:04d}" for i in range(spec.goals)]
+        _insert(db, models.Goal, [
+            {"id": goal_id, "title": _sentence(rng, 3), "summary": _sentence(rng, 8),
+             "created_at": _stamp(i), "updated_at": _stamp(i)}
+            for i, goal_id in enumerate(goal_ids)
+        ])
+        dataset.ids["goals"] = goal_ids
+
+        task_ids = [f"task-{i:06d}" for i in range(spec.tasks)]
+        tasks, subtasks = [], []
+        for i, task_id in enumerate(task_ids):
+            tasks.append({
+                "id": task_id, "content": _sentence(rng, 5),
+                "status": models.TaskStatus.DONE if rng.random() < 0.3 else models.TaskStatus.TODO,
+                "skill_id": rng.choice(skill_ids) if rng.random() < 0.5 else None,
+                "goal_id": rng.choice(goal_ids) if rng.random() < 0.5 else None,
+                "created_at": _stamp(i), "updated_at": _stamp(i),
+            })
+            dataset.subtasks[task_id] = [f"{task_id}-s{j}" for j in range(spec.subtasks_per_task)]
+            subtasks.extend(
+                {"id": subtask_id, "task_id": task_id, "content": _sentence(rng, 3),
+                 "completed": rng.random() < 0.5, "created_at": _stamp(i)}
+                for subtask_id in dataset.subtasks[task_id]
+            )
+        _insert(db, models.Task, tasks)
+        _insert(db, models.Subtask, subtasks)
+        dataset.ids["tasks"] = task_ids
+
+        card_ids = [f"card-{i:03d}" for i in range(spec.cards)]
+        _insert(db, models.Card, [
+            {"id": card_id, "nickname": f"Card {i}", "bank_name": "Bench Bank", "cardholder_name": "Bench User",
+             "limit": 1000.0 * (i + 1), "card_type": list(models.CardType)[i % 2], "created_at": _stamp(i)}
+            for i, card_id in enumerate(card_ids)
+        ])
+        dataset.ids["cards"] = card_ids
+
+        ledgers = {"income": models.Income, "expenses": models.Expense, "investments": models.Investment}
+        for name, share in LEDGER_SHARES.items():
+            model = ledgers[name]
+            count = max(1, int(spec.transactions * share))
+            ids = [f"{name}-{i:06d}" for i in range(count)]
+            _insert(db, model, [
+                {"id": entry_id, "source": rng.choice(WORDS).capitalize(), "amount": round(rng.uniform(1, 500), 2),
+                 "tags": rng.sample(TAGS, rng.randint(0, 3)), "date": date(2021, 1, 1) + timedelta(days=rng.randrange(1460)),
+                 "created_at": _stamp(i)}
+                for i, entry_id in enumerate(ids)
+            ])
+            dataset.ids[name] = ids
+
+        dataset.media = _seed_media(spec, rng)
+        photos = [media_url(digest) for i, digest in enumerate(dataset.media) if i % 4]
+        voice_notes = [media_url(digest) for i, digest in enumerate(dataset.media) if not i % 4]
+        journal_ids = [f"journal-{i:06d}" for i in range(spec.journal_entries)]
+        _insert(db, models.JournalEntry, [
+            {"id": entry_id, "title": _sentence(rng, 4), "content": _sentence(rng, rng.randint(40, 200)),
+             "photos": rng.sample(photos, min(len(photos), rng.randint(0, 3))),
+             "voice_notes": rng.sample(voice_notes, min(len(voice_notes), rng.randint(0, 1))),
+             "tags": rng.sample(TAGS, rng.randint(0, 3)), "date": (START + timedelta(days=i // 10)).date(),
+             "created_at": _stamp(i), "updated_at": _stamp(i)}
+            for i, entry_id in enumerate(journal_ids)
+        ])
+        dataset.ids["journal"] = journal_ids
+
+        degrees.rebuild(db)
+        tag_index.rebuild(db)
+        rollups.rebuild(db)
+        journal_search.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    return dataset
+
+
+def seed_database(spec: DatasetSpec) -> tuple:
+    """Create the tables and seed them; returns (Dataset, seconds spent seeding).
+
+    Meant to run in a spawned child process with DATABASE_URL already set,
+    so the seeding memory stays out of the caller's RSS.
+    """
+    from app.database import init_db
+
+    init_db()
+    started = time.perf_counter()
+    dataset = seed(spec)
+    return dataset, time.perf_counter() - started
+
+
+def database_size(url: str) -> int:
+    """Bytes on disk for a SQLite database URL (0 for anything else)"""
+    path = url.split("sqlite:///", 1)[-1] if url.startswith("sqlite:///") else None
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if path and os.path.exists(p))
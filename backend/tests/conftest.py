@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# The app creates its engines when it is imported, so point it at a
+# throwaway database before any test module imports it
+TEST_DIR = tempfile.mkdtemp(prefix="mindspace-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["BLOB_STORAGE_DIR"] = os.path.join(TEST_DIR, "blobs")
+for name in ("DATABASE_READ_URL", "DATABASE_ASYNC_URL", "DATABASE_ASYNC_READ_URL"):
+    os.environ.pop(name, None)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement any of the app's engines runs inside the block"""
+    from sqlalchemy import event
+    from app.database import async_engine, async_read_engine, engine, read_engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [getattr(e, "sync_engine", e) for e in (engine, read_engine, async_engine, async_read_engine) if e is not None]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
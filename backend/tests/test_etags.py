@@ -0,0 +1,35 @@
+def _get(client, path, etag=None, **params):
+    return client.get(path, params=params, headers={"If-None-Match": etag} if etag else {})
+
+
+def test_unchanged_list_is_not_modified_until_a_write(client):
+    first = _get(client, "/api/skills/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = _get(client, "/api/skills/", etag)
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # Other tables and other query strings don't share the tag
+    client.post("/api/goals/", json={"title": "Unrelated"}).raise_for_status()
+    assert _get(client, "/api/skills/", etag).status_code == 304
+    assert _get(client, "/api/skills/", etag, limit=5).status_code == 200
+
+    client.post("/api/skills/", json={"title": "Juggling"}).raise_for_status()
+    changed = _get(client, "/api/skills/", etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "Juggling" in [skill["title"] for skill in changed.json()]
+    assert _get(client, "/api/skills/", changed.headers["ETag"]).status_code == 304
+
+
+def test_buffered_positions_change_the_node_list_tag(client):
+    node_id = client.post("/api/nodes/", json={"title": "Movable", "type": "Task"}).json()["id"]
+    etag = _get(client, "/api/nodes/").headers["ETag"]
+
+    client.patch("/api/nodes/positions", json=[{"id": node_id, "x": 12, "y": 34}]).raise_for_status()
+    response = _get(client, "/api/nodes/", etag)
+    assert response.status_code == 200
+    assert {(node["x"], node["y"]) for node in response.json() if node["id"] == node_id} == {(12, 34)}
@@ -0,0 +1,51 @@
+import pytest
+
+from app.utils import fast_json
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+LIST_ENDPOINTS = [
+    "/api/nodes/", "/api/links/", "/api/tasks/", "/api/skills/", "/api/goals/", "/api/cards/",
+    "/api/income/", "/api/expenses/", "/api/investments/", "/api/journal/", "/api/bootstrap/",
+]
+
+
+@pytest.fixture(scope="module")
+def sample_rows(client):
+    skill = client.post("/api/skills/", json={"title": "Piano", "progress": 40}).json()["id"]
+    client.post("/api/skills/", json={"title": "Violin", "color": "#a52a2a"}).raise_for_status()
+    goal = client.post("/api/goals/", json={"title": "Recital"}).json()["id"]
+    task = client.post("/api/tasks/", json={"content": "Scales", "skillId": skill, "goalId": goal}).json()["id"]
+    client.put(f"/api/tasks/{task}", json={
+        "status": "Done", "subtasks": [{"id": "sub-fast-json", "content": "C major", "completed": True}]
+    }).raise_for_status()
+    client.post("/api/cards/", json={
+        "nickname": "Daily", "bankName": "Bank", "cardholderName": "Sam", "limit": 1500, "cardType": "Credit"
+    }).raise_for_status()
+    a = client.post("/api/nodes/", json={"title": "Piano", "type": "Skill"}).json()["id"]
+    b = client.post("/api/nodes/", json={"title": "Recital", "type": "Goal"}).json()["id"]
+    client.post("/api/links/", json={"source": a, "target": b}).raise_for_status()
+    for kind in ("income", "expenses", "investments"):
+        client.post(f"/api/{kind}/", json={"source": "Lessons", "amount": 25.5, "tags": ["music"], "date": "1995-06-01"})
+    client.post("/api/journal/", json={
+        "title": "Practice", "content": "Forty minutes", "photos": ["/api/media/abc"], "tags": ["music"], "date": "1995-06-01"
+    }).raise_for_status()
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_fast_json_matches_the_response_models(client, monkeypatch, sample_rows, path):
+    default = client.get(path)
+    monkeypatch.setattr(fast_json, "FAST_JSON_ENABLED", True)
+    fast = client.get(path)
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == default.json()
+    assert fast.headers["ETag"] == default.headers["ETag"]
+
+
+def test_fast_json_keeps_the_page_cursor(client, monkeypatch, sample_rows):
+    default = client.get("/api/skills/", params={"limit": 1})
+    monkeypatch.setattr(fast_json, "FAST_JSON_ENABLED", True)
+    fast = client.get("/api/skills/", params={"limit": 1})
+    assert fast.json() == default.json()
+    assert fast.headers[NEXT_CURSOR_HEADER] == default.headers[NEXT_CURSOR_HEADER]
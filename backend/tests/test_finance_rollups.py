@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from app import models
+from app.utils import rollups
+from app.database import SessionLocal
+
+
+def _summary(client, month):
+    response = client.get("/api/finance/summary", params={"from": month, "to": month})
+    response.raise_for_status()
+    return response.json()
+
+
+def _rollups(month):
+    db = SessionLocal()
+    try:
+        return db.execute(select(models.FinanceRollup).where(models.FinanceRollup.period == month)).scalars().all()
+    finally:
+        db.close()
+
+
+def test_concurrent_writes_keep_rollups_exact(client):
+    month = "1999-03"
+    body = {"source": "Coffee", "amount": 1, "tags": ["coffee"], "date": f"{month}-15"}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(lambda _: client.post("/api/expenses/", json=body), range(200)))
+    assert [r.status_code for r in responses if r.status_code != 201] == []
+
+    summary = _summary(client, month)
+    assert summary["totals"]["expenses"] == 200
+    assert summary["categories"]["expenses"] == {"coffee": 200}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        deleted = list(pool.map(lambda r: client.delete(f"/api/expenses/{r.json()['id']}"), responses))
+    assert {r.status_code for r in deleted} == {204}
+
+    assert _summary(client, month)["totals"]["expenses"] == 0
+    assert _rollups(month) == []
+
+
+def test_summary_bounds_are_months(client):
+    assert client.get("/api/finance/summary", params={"from": "2024", "to": "2024-03"}).status_code == 200
+    assert client.get("/api/finance/summary", params={"from": "2024-01-15"}).status_code == 422
+
+
+def test_rollups_without_on_conflict(client, monkeypatch):
+    monkeypatch.setattr(rollups, "upsert_insert", lambda db: None)
+    month = "1999-04"
+    first = client.post("/api/expenses/", json={"source": "Rent", "amount": 500, "tags": ["home"], "date": f"{month}-01"})
+    second = client.post("/api/expenses/", json={"source": "Lamp", "amount": 40, "tags": ["home", "light"], "date": f"{month}-02"})
+    assert first.status_code == second.status_code == 201
+
+    summary = _summary(client, month)
+    assert summary["totals"]["expenses"] == 540
+    assert summary["categories"]["expenses"] == {"home": 540, "light": 40}
+
+    assert client.delete(f"/api/expenses/{second.json()['id']}").status_code == 204
+    assert _summary(client, month)["categories"]["expenses"] == {"home": 500}
+    assert {(row.tag, row.count) for row in _rollups(month)} == {("", 1), ("home", 1)}
@@ -0,0 +1,51 @@
+from sqlalchemy import insert
+
+from app import models
+from app.database import SessionLocal
+from app.routers.links import canonical_pair
+from conftest import count_queries
+
+
+def _node(client, title):
+    return client.post("/api/nodes/", json={"title": title, "type": "Task"}).json()["id"]
+
+
+def _neighbors(client, node_id):
+    response = client.get(f"/api/graph/neighborhood/{node_id}", params={"depth": 1})
+    response.raise_for_status()
+    return {node["id"] for node in response.json()["nodes"]} - {node_id}
+
+
+def _full_builds(statements):
+    """Statements reading the whole links table, i.e. index rebuilds"""
+    return [s for s in statements if s.rstrip().endswith("FROM links")]
+
+
+def test_index_follows_local_writes_without_rebuilding(client):
+    a, b, c = (_node(client, title) for title in "abc")
+    client.post("/api/links/", json={"source": a, "target": b}).raise_for_status()
+    assert _neighbors(client, a) == {b}
+
+    client.post("/api/links/", json={"source": a, "target": c}).raise_for_status()
+    with count_queries() as statements:
+        assert _neighbors(client, a) == {b, c}
+    assert _full_builds(statements) == []
+
+
+def test_index_picks_up_writes_from_other_workers(client):
+    a, b = _node(client, "a"), _node(client, "b")
+    assert _neighbors(client, a) == set()
+
+    # Another worker's write: straight to the database, this process's index never hears of it
+    db = SessionLocal()
+    try:
+        pair_lo, pair_hi = canonical_pair(a, b)
+        db.execute(insert(models.Link), [
+            {"id": f"link-{a}", "source_id": a, "target_id": b, "pair_lo": pair_lo, "pair_hi": pair_hi}
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    assert _neighbors(client, a) == {b}
+    assert (a, b) in {(link["source"], link["target"]) for link in client.get(f"/api/graph/neighborhood/{a}").json()["links"]}
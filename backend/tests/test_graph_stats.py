@@ -0,0 +1,42 @@
+import pytest
+
+from app.routers import graph
+
+
+def _node(client, title, type="Skill"):
+    return client.post("/api/nodes/", json={"title": title, "type": type}).json()["id"]
+
+
+def _stats(client):
+    response = client.get("/api/graph/stats", params={"top": 100})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_stats_follow_graph_writes(client, monkeypatch, use_index):
+    monkeypatch.setattr(graph, "ADJACENCY_INDEX_ENABLED", use_index)
+    before = _stats(client)
+
+    hub, lone = _node(client, "hub"), _node(client, "lone", type="Goal")
+    spokes = [_node(client, f"spoke {i}") for i in range(3)]
+    for spoke in spokes:
+        client.post("/api/links/", json={"source": hub, "target": spoke}).raise_for_status()
+
+    stats = _stats(client)
+    assert stats["nodes"] == before["nodes"] + 5
+    assert stats["links"] == before["links"] + 3
+    assert stats["types"]["Skill"] == before["types"].get("Skill", 0) + 4
+    assert stats["types"]["Goal"] == before["types"].get("Goal", 0) + 1
+    assert lone in stats["orphans"] and hub not in stats["orphans"]
+    assert {"id": hub, "title": "hub", "degree": 3} in stats["hubs"]
+    assert stats["components"] == before["components"] + 2
+    assert stats["largest_component"] >= 4
+
+    # Cutting a spoke off leaves it an orphan in its own component
+    link = client.get(f"/api/links/node/{spokes[0]}").json()[0]
+    client.delete(f"/api/links/{link['id']}").raise_for_status()
+    stats = _stats(client)
+    assert spokes[0] in stats["orphans"]
+    assert {"id": hub, "title": "hub", "degree": 2} in stats["hubs"]
+    assert stats["components"] == before["components"] + 3
@@ -0,0 +1,74 @@
+import json
+
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+
+
+def _import(client, body, content_type):
+    return client.post("/api/expenses/import", content=body, headers={"Content-Type": content_type})
+
+
+def _expenses(date):
+    db = SessionLocal()
+    try:
+        rows = db.execute(select(models.Expense).where(models.Expense.date == date)).scalars().all()
+        return {row.source: row for row in rows}
+    finally:
+        db.close()
+
+
+def test_csv_quoting_and_tag_separators(client):
+    body = (
+        "source,amount,tags,date\r\n"
+        '"Dinner\nwith ""friends""",30,food;fun,1998-01-01\r\n'
+        'Books,12,"read,learn",1998-01-01\r\n'
+        "Cinema,9,fun|film,1998-01-01\r\n"
+    )
+    response = _import(client, body.encode(), "text/csv")
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+
+    rows = _expenses("1998-01-01")
+    assert set(rows) == {'Dinner\nwith "friends"', "Books", "Cinema"}
+    assert rows['Dinner\nwith "friends"'].tags == ["food", "fun"]
+    assert rows["Books"].tags == ["read", "learn"]
+    assert rows["Cinema"].tags == ["fun", "film"]
+
+
+def test_invalid_rows_are_reported_by_number(client):
+    csv_body = (
+        "source,amount,tags,date\n"
+        "Ok,1,,1998-02-01\n"
+        "Bad amount,lots,,1998-02-01\n"
+        '"Two\nlines",2,,1998-02-01\n'
+        "Bad date,3,,someday\n"
+    )
+    response = _import(client, csv_body.encode(), "text/csv").json()
+    assert response["imported"] == 2
+    assert [error["row"] for error in response["errors"]] == [2, 4]
+
+    ndjson_body = "\n".join([
+        json.dumps({"source": "Ok", "amount": 1, "tags": [], "date": "1998-02-02"}),
+        "{not json",
+        "",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"source": "Also ok", "amount": 2, "tags": [], "date": "1998-02-02"}),
+    ])
+    response = _import(client, ndjson_body.encode(), "application/x-ndjson").json()
+    assert response["imported"] == 2
+    assert response["failed"] == 2
+    assert [error["row"] for error in response["errors"]] == [2, 3]
+    assert response["errors"][0]["error"].startswith("Invalid JSON")
+
+
+def test_unreadable_body_is_a_client_error(client):
+    row = "Coffee,1,,1998-03-01\n".encode()
+    response = _import(client, b"source,amount,tags,date\n" + row + b"\xff\xfe" + row, "text/csv")
+    assert response.status_code == 400
+
+    response = _import(client, b'source,amount,tags,date\n"Unclosed,1,,1998-03-01\n', "text/csv")
+    assert response.status_code == 400
+
+    assert _expenses("1998-03-01") == {}
@@ -0,0 +1,21 @@
+from app.utils import journal_search
+
+CONTENT = "<img src=x onerror=alert(1)> the zebrafish \x02swam\x03 & <b>left</b>"
+
+
+def test_search_snippets_escape_entry_text(client):
+    entry = client.post("/api/journal/", json={"title": "Aquarium", "content": CONTENT, "date": "2024-05-01"})
+    assert entry.status_code == 201
+
+    hits = client.get("/api/journal/search", params={"q": "zebrafish"}).json()
+    snippet = next(hit["snippet"] for hit in hits if hit["id"] == entry.json()["id"])
+    assert "<mark>zebrafish</mark>" in snippet
+    assert "&lt;img src=x onerror=alert(1)&gt;" in snippet
+    assert snippet.count("<") == snippet.count("<mark>") + snippet.count("</mark>")
+
+
+def test_like_fallback_snippet_is_escaped():
+    snippet = journal_search._plain_snippet(CONTENT, "zebrafish")
+    assert "<mark>zebrafish</mark>" in snippet
+    assert "&lt;b&gt;left&lt;/b&gt;" in snippet
+    assert snippet.count("<") == 2
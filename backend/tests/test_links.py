@@ -0,0 +1,49 @@
+import pytest
+
+from app.database import SessionLocal
+from app.routers import links
+from app.utils import versions
+
+
+def _node(client, title):
+    return client.post("/api/nodes/", json={"title": title, "type": "Skill"}).json()["id"]
+
+
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_bulk_links_skip_existing_pairs(client, monkeypatch, on_conflict):
+    if not on_conflict:
+        # A backend without INSERT ... ON CONFLICT takes the check-then-insert path
+        monkeypatch.setattr(links, "upsert_insert", lambda db: None)
+    a, b, c = (_node(client, title) for title in "abc")
+    client.post("/api/links/", json={"source": a, "target": b}).raise_for_status()
+
+    result = client.post("/api/links/bulk", json=[
+        {"source": b, "target": a},
+        {"source": a, "target": c},
+        {"source": c, "target": a},
+    ]).json()
+    assert [(link["source"], link["target"]) for link in result["created"]] == [(a, c)]
+    assert [(link["source"], link["target"]) for link in result["existing"]] == [(a, b)]
+    assert client.post("/api/links/", json={"source": c, "target": a}).status_code == 400
+
+
+def _links_version():
+    db = SessionLocal()
+    try:
+        return versions.current(db, ["links"])["links"]
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_duplicate_links_do_not_record_a_write(client, monkeypatch, on_conflict):
+    if not on_conflict:
+        monkeypatch.setattr(links, "upsert_insert", lambda db: None)
+    a, b = (_node(client, title) for title in "ab")
+    client.post("/api/links/", json={"source": a, "target": b}).raise_for_status()
+    version = _links_version()
+
+    assert client.post("/api/links/", json={"source": b, "target": a}).status_code == 400
+    result = client.post("/api/links/bulk", json=[{"source": a, "target": b}]).json()
+    assert result["created"] == [] and len(result["existing"]) == 1
+    assert _links_version() == version
@@ -0,0 +1,69 @@
+import hashlib
+
+import pytest
+
+from app.routers import media
+from app.utils import blobs
+from app.utils.blobs import blob_store
+
+
+@pytest.mark.parametrize("content_type, inline", [
+    ("image/png", True),
+    ("audio/webm;codecs=opus", True),
+    ("text/html", False),
+    ("image/svg+xml", False),
+    ("application/javascript", False),
+])
+def test_only_raster_images_and_audio_are_served_inline(client, content_type, inline):
+    body = f"<script>alert('{content_type}')</script>".encode()
+    uploaded = client.post("/api/media/", content=body, headers={"Content-Type": content_type})
+    assert uploaded.status_code == 201
+
+    response = client.get(uploaded.json()["url"])
+    assert response.status_code == 200
+    assert response.content == body
+    assert response.headers["x-content-type-options"] == "nosniff"
+    disposition = response.headers.get("content-disposition", "")
+    assert disposition.startswith("attachment") != inline
+
+
+def test_large_upload_round_trips(client):
+    body = bytes(range(256)) * 10_000  # spans several write batches
+    uploaded = client.post("/api/media/", content=body, headers={"Content-Type": "image/png"}).json()
+    assert uploaded["id"] == hashlib.sha256(body).hexdigest()
+    assert uploaded["size"] == len(body)
+    assert client.get(uploaded["url"]).content == body
+
+
+def test_oversized_upload_leaves_nothing_behind(client, monkeypatch):
+    monkeypatch.setattr(media, "MAX_UPLOAD_BYTES", 1000)
+    response = client.post("/api/media/", content=b"x" * 1001, headers={"Content-Type": "image/png"})
+    assert response.status_code == 413
+    assert list(blob_store.temp_dir.iterdir()) == []
+    assert not blob_store.exists(hashlib.sha256(b"x" * 1001).hexdigest())
+
+
+def _entry(client, photos):
+    body = {"title": "Trip", "content": "Photos", "photos": photos, "date": "1994-07-01"}
+    response = client.post("/api/journal/", json=body)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_unreferenced_blobs_are_removed(client, monkeypatch):
+    url = client.post("/api/media/", content=b"beach photo", headers={"Content-Type": "image/jpeg"}).json()["url"]
+    first, second = _entry(client, [url]), _entry(client, [url])
+
+    # Still within the grace period after the upload
+    assert client.delete(f"/api/journal/{first}").status_code == 204
+    assert client.get(url).status_code == 200
+
+    monkeypatch.setattr(blobs, "BLOB_CLEANUP_GRACE_SECONDS", 0)
+    third = _entry(client, [url])
+    assert client.delete(f"/api/journal/{third}").status_code == 204
+    assert client.get(url).status_code == 200  # the second entry still shows it
+
+    replacement = client.post("/api/media/", content=b"sunset photo", headers={"Content-Type": "image/jpeg"}).json()["url"]
+    client.put(f"/api/journal/{second}", json={"photos": [replacement]}).raise_for_status()
+    assert client.get(url).status_code == 404
+    assert client.get(replacement).status_code == 200
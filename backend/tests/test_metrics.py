@@ -0,0 +1,24 @@
+import re
+
+
+def _series(client, name):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return {
+        labels: float(value)
+        for labels, value in re.findall(rf"^{name}\{{(.*)\}} (\S+)$", response.text, re.MULTILINE)
+    }
+
+
+def test_requests_are_labelled_by_route_template(client):
+    for node_id in ("metrics-missing-1", "metrics-missing-2"):
+        assert client.get(f"/api/nodes/{node_id}").status_code == 404
+    assert client.get("/api/no-such-route/metrics-missing-3").status_code == 404
+
+    requests = _series(client, "http_requests_total")
+    assert requests['method="GET",route="/api/nodes/{node_id}",status="404"'] >= 2
+    assert 'method="GET",route="<unmatched>",status="404"' in requests
+    assert not [labels for labels in requests if "metrics-missing" in labels]
+
+    queries = _series(client, "db_queries_total")
+    assert queries['method="GET",route="/api/nodes/{node_id}"'] >= 2
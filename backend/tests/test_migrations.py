@@ -0,0 +1,68 @@
+import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base, configure_engine
+from app.migrations import parse_legacy_date, run_migrations
+from app.utils import journal_search
+
+LEGACY_EXPENSES = {
+    "exp-iso": "2024-01-05",
+    "exp-timestamp": "2024-01-06T23:30:00.000Z",
+    "exp-us": "01/07/2024",
+    "exp-words": "Jan 8, 2024",
+    "exp-js": "Tue Jan 09 2024 10:00:00 GMT+0100 (Central European Standard Time)",
+    "exp-garbage": "someday",
+    "exp-impossible": "2024-02-30",
+}
+
+
+def test_parse_legacy_date():
+    assert parse_legacy_date("2024-01-06T23:30:00Z") == datetime.date(2024, 1, 6)
+    assert parse_legacy_date("January 8, 2024") == datetime.date(2024, 1, 8)
+    assert parse_legacy_date("8 Jan 2024") == datetime.date(2024, 1, 8)
+    assert parse_legacy_date("not a date") is None
+
+
+def test_migration_converts_mixed_legacy_dates(tmp_path, monkeypatch):
+    # The FTS probe is cached per process; this database has no index yet
+    monkeypatch.setattr(journal_search, "_enabled", None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    configure_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    # SQLite doesn't enforce column types, so legacy strings sit in the DATE columns as they did before
+    with engine.begin() as connection:
+        for expense_id, value in LEGACY_EXPENSES.items():
+            connection.execute(text(
+                "INSERT INTO expenses (id, source, amount, tags, date) VALUES (:id, 'Shop', 10, '[\"food\"]', :date)"
+            ), {"id": expense_id, "date": value})
+        connection.execute(text(
+            "INSERT INTO journal_entries (id, title, content, photos, voice_notes, tags, date) "
+            "VALUES ('journal-bad', 'Title', 'Body', '[]', '[]', '[]', 'last tuesday')"
+        ))
+
+    with Session(engine) as db:
+        run_migrations(db)
+
+        dates = {expense.id: expense.date for expense in db.query(models.Expense)}
+        assert dates == {
+            "exp-iso": datetime.date(2024, 1, 5),
+            "exp-timestamp": datetime.date(2024, 1, 6),
+            "exp-us": datetime.date(2024, 1, 7),
+            "exp-words": datetime.date(2024, 1, 8),
+            "exp-js": datetime.date(2024, 1, 9),
+        }
+        assert db.query(models.JournalEntry).count() == 0
+
+        quarantined = {row.row_id: row for row in db.query(models.QuarantinedRow)}
+        assert set(quarantined) == {"exp-garbage", "exp-impossible", "journal-bad"}
+        assert quarantined["exp-garbage"].table_name == "expenses"
+        assert quarantined["exp-garbage"].data["date"] == "someday"
+
+        rollup = db.get(models.FinanceRollup, ("expense", "2024-01", ""))
+        assert (rollup.total, rollup.count) == (50, 5)
+        tagged = {tag.entity_id for tag in db.query(models.EntityTag).filter(models.EntityTag.entity_type == "expense")}
+        assert tagged == set(dates)
+    engine.dispose()
@@ -0,0 +1,39 @@
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+
+
+def _node(client, title):
+    return client.post("/api/nodes/", json={"title": title, "type": "Task"}).json()["id"]
+
+
+def _link(client, source, target):
+    client.post("/api/links/", json={"source": source, "target": target}).raise_for_status()
+
+
+def _degrees(node_ids):
+    db = SessionLocal()
+    try:
+        return dict(db.execute(select(models.Node.id, models.Node.degree).where(models.Node.id.in_(node_ids))).all())
+    finally:
+        db.close()
+
+
+def test_bulk_delete_cascades_links_and_fixes_degrees(client):
+    a, b, c, d = (_node(client, title) for title in "abcd")
+    for source, target in [(a, b), (a, c), (b, c), (c, d), (d, d)]:
+        _link(client, source, target)
+    assert _degrees([a, b, c, d]) == {a: 2, b: 2, c: 3, d: 3}
+
+    response = client.delete("/api/nodes/", params={"ids": f"{a},{b}"})
+    assert response.json() == {"deleted": 2}
+
+    links = client.get(f"/api/links/node/{c}").json()
+    assert [(link["source"], link["target"]) for link in links] == [(c, d)]
+    assert _degrees([a, b, c, d]) == {c: 1, d: 3}
+    assert client.get(f"/api/nodes/{a}").status_code == 404
+
+    client.delete(f"/api/nodes/{d}").raise_for_status()
+    assert client.get(f"/api/links/node/{c}").json() == []
+    assert _degrees([c]) == {c: 0}
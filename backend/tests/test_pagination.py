@@ -0,0 +1,34 @@
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+MONTH = {"from": "1997-01-01", "to": "1997-01-31"}
+
+
+def _pages(client, path, params, limit):
+    rows, after = [], None
+    while True:
+        response = client.get(path, params={**params, "limit": limit, **({"after": after} if after else {})})
+        assert response.status_code == 200
+        rows.extend(response.json())
+        after = response.headers.get(NEXT_CURSOR_HEADER)
+        if after is None:
+            return rows
+
+
+def test_keyset_pages_return_every_row_once(client):
+    # Several rows share a date, so the id has to break the ties
+    for i in range(7):
+        body = {"source": f"Salary {i}", "amount": 100 + i, "tags": [], "date": f"1997-01-{1 + i % 2:02d}"}
+        assert client.post("/api/income/", json=body).status_code == 201
+
+    everything = client.get("/api/income/", params=MONTH).json()
+    assert len(everything) == 7
+    for limit in (1, 3, 7):
+        pages = _pages(client, "/api/income/", MONTH, limit)
+        assert [row["id"] for row in pages] == [row["id"] for row in everything]
+
+
+def test_invalid_cursor_is_rejected(client):
+    for cursor in ("not a cursor", encode_cursor(["1997-01-01"]), encode_cursor(["someday", "inc-1"])):
+        response = client.get("/api/income/", params={"after": cursor})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy.util import greenlet_spawn
+
+from app.utils.position_buffer import PositionBuffer
+
+
+class FlakySession:
+    """Session stand-in whose commit fails while `failing` is set"""
+
+    failing = True
+    committed = []
+
+    def execute(self, statement, rows):
+        self.rows = rows
+        return SimpleNamespace(rowcount=len(rows))
+
+    def commit(self):
+        if FlakySession.failing:
+            raise RuntimeError("database is locked")
+        FlakySession.committed.append({row["node_id"]: (row["new_x"], row["new_y"]) for row in self.rows})
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_failed_flush_keeps_positions_for_the_retry():
+    buffer = PositionBuffer(FlakySession, window_ms=60_000)
+    buffer.submit({"a": (1, 1), "b": (2, 2), "c": (3, 3)})
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+
+    # Newer writes after the failure win over the re-queued batch
+    buffer.submit({"a": (5, 5)})
+    buffer.discard(["c"])
+    FlakySession.failing = False
+    assert buffer.flush() == 2
+    assert FlakySession.committed == [{"a": (5, 5), "b": (2, 2)}]
+    assert buffer.flush() == 0
+
+
+def test_flush_from_the_event_loop_writes_on_another_thread():
+    threads = []
+
+    class RecordingSession(FlakySession):
+        def commit(self):
+            threads.append(threading.get_ident())
+
+    buffer = PositionBuffer(RecordingSession, window_ms=60_000)
+    buffer.submit({"a": (1, 1)})
+
+    async def handler():
+        # How a sync handler runs in async mode (app.utils.async_routes)
+        return await greenlet_spawn(buffer.flush)
+
+    assert asyncio.run(handler()) == 1
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_discard_waits_for_the_batch_in_flight():
+    events = []
+    writing = threading.Event()
+    release = threading.Event()
+
+    class SlowSession(FlakySession):
+        def commit(self):
+            writing.set()
+            release.wait(5)
+            events.append("batch committed")
+
+    buffer = PositionBuffer(SlowSession, window_ms=60_000)
+    buffer.submit({"a": (1, 1)})
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    # A direct write (PUT /api/nodes/{id}) discards first, then writes
+    def direct_write():
+        buffer.discard(["a"])
+        events.append("direct write")
+
+    writer = threading.Thread(target=direct_write)
+    writer.start()
+    writer.join(0.2)
+    assert writer.is_alive()
+
+    release.set()
+    flusher.join(5)
+    writer.join(5)
+    assert events == ["batch committed", "direct write"]
+    assert buffer.flush() == 0
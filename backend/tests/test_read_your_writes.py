@@ -0,0 +1,38 @@
+import time
+
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from app.database import READ_AFTER_WRITE_HEADER, READ_AFTER_WRITE_MS, wrote_recently
+from app.utils.read_your_writes import ReadYourWritesMiddleware
+
+
+def _request(stamp):
+    headers = [(READ_AFTER_WRITE_HEADER.lower().encode(), str(stamp).encode())] if stamp is not None else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_echoed_write_stamps_are_bounded():
+    now = int(time.time() * 1000)
+    assert wrote_recently(_request(now - 10))
+    assert wrote_recently(_request(now + 10))  # another worker's clock running slightly ahead
+    assert not wrote_recently(_request(now - READ_AFTER_WRITE_MS - 1000))
+    # A stamp far in the future would otherwise pin the client to the primary for good
+    assert not wrote_recently(_request(now + READ_AFTER_WRITE_MS + 1000))
+    assert not wrote_recently(_request(10 ** 15))
+    assert not wrote_recently(_request("soon"))
+    assert not wrote_recently(_request(None))
+
+
+def test_successful_writes_are_stamped():
+    async def app(scope, receive, send):
+        status = 404 if scope["path"] == "/missing" else 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    client = TestClient(ReadYourWritesMiddleware(app))
+    before = int(time.time() * 1000)
+    stamp = int(client.post("/").headers[READ_AFTER_WRITE_HEADER])
+    assert before <= stamp <= time.time() * 1000
+    assert READ_AFTER_WRITE_HEADER not in client.get("/").headers
+    assert READ_AFTER_WRITE_HEADER not in client.post("/missing").headers
@@ -0,0 +1,48 @@
+import time
+
+from app import database, models
+from app.database import SessionLocal, init_db
+from conftest import count_queries
+
+
+def _ddl(statements):
+    return [s for s in statements if s.lstrip().upper().startswith(("CREATE", "ALTER", "DROP"))]
+
+
+def test_init_db_skips_a_current_schema(client, monkeypatch):
+    # The client fixture already started the app, so the fingerprint is stored
+    with count_queries() as statements:
+        assert init_db() is False
+    assert _ddl(statements) == []
+    assert len(statements) <= 2
+
+    monkeypatch.setattr(database, "SCHEMA_FINGERPRINT_CHECK", False)
+    assert init_db() is True
+    monkeypatch.setattr(database, "SCHEMA_FINGERPRINT_CHECK", True)
+    assert init_db() is False
+
+    # A different release (models or migrations changed) runs everything again
+    db = SessionLocal()
+    try:
+        db.query(models.SchemaFingerprint).update({"fingerprint": "older-release"})
+        db.commit()
+    finally:
+        db.close()
+    assert init_db() is True
+    assert init_db() is False
+
+
+def test_ready_after_startup(client):
+    deadline = time.monotonic() + 10
+    response = client.get("/api/ready")
+    while response.status_code == 503 and time.monotonic() < deadline:
+        assert response.json()["status"] == "starting"
+        time.sleep(0.05)
+        response = client.get("/api/ready")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "ready"
+    assert report["schema"] in ("migrated", "current")
+    assert report["init_db_ms"] >= 0
+    assert report["ready_after_ms"] >= report["init_db_ms"]
@@ -0,0 +1,40 @@
+def _invest(client, source, tags):
+    body = {"source": source, "amount": 10, "tags": tags, "date": "1996-05-01"}
+    response = client.post("/api/investments/", json=body)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _sources(client, **params):
+    response = client.get("/api/investments/", params=params)
+    assert response.status_code == 200
+    return sorted(row["source"] for row in response.json())
+
+
+def _counts(client, type=None):
+    response = client.get("/api/tags/", params={"type": type} if type else {})
+    assert response.status_code == 200
+    return {row["tag"]: row["count"] for row in response.json() if row["tag"].startswith("counted-")}
+
+
+def test_tag_filters(client):
+    _invest(client, "Index fund", ["filtered-stocks", "filtered-long"])
+    _invest(client, "Bonds", ["filtered-bonds", "filtered-long"])
+    _invest(client, "Day trade", ["filtered-stocks"])
+
+    assert _sources(client, tag="filtered-long") == ["Bonds", "Index fund"]
+    assert _sources(client, tags_all="filtered-stocks,filtered-long") == ["Index fund"]
+    assert _sources(client, tags_all=["filtered-stocks", "filtered-long"]) == ["Index fund"]
+    assert _sources(client, tags_any="filtered-bonds,filtered-stocks") == ["Bonds", "Day trade", "Index fund"]
+    assert _sources(client, tag="filtered-long", tags_any="filtered-stocks") == ["Index fund"]
+    assert _sources(client, tag="filtered-none") == []
+
+
+def test_tag_counts_follow_writes(client):
+    first = _invest(client, "Gold", ["counted-metal", "counted-safe"])
+    _invest(client, "Silver", ["counted-metal"])
+    assert _counts(client, "investment") == {"counted-metal": 2, "counted-safe": 1}
+    assert _counts(client, "expense") == {}
+
+    assert client.delete(f"/api/investments/{first}").status_code == 204
+    assert _counts(client) == {"counted-metal": 1}
@@ -0,0 +1,30 @@
+from conftest import count_queries
+
+
+def _create_tasks(client, goal_id, count, subtasks=3):
+    for i in range(count):
+        task = client.post("/api/tasks/", json={"content": f"task {i}", "goalId": goal_id}).json()
+        for j in range(subtasks):
+            client.post(f"/api/tasks/{task['id']}/subtasks", json={"content": f"subtask {j}"}).raise_for_status()
+
+
+def _queries_for(client, path) -> int:
+    with count_queries() as statements:
+        response = client.get(path)
+    response.raise_for_status()
+    return len(statements)
+
+
+def test_task_lists_load_subtasks_in_constant_queries(client):
+    goal = client.post("/api/goals/", json={"title": "Goal", "summary": ""}).json()
+    goal_tasks = f"/api/goals/{goal['id']}/tasks"
+
+    _create_tasks(client, goal["id"], 1)
+    one = {path: _queries_for(client, path) for path in ("/api/tasks/", goal_tasks)}
+
+    _create_tasks(client, goal["id"], 20)
+    many = {path: _queries_for(client, path) for path in ("/api/tasks/", goal_tasks)}
+
+    assert many == one
+    assert len(client.get(goal_tasks).json()) == 21
+    assert all(len(task["subtasks"]) == 3 for task in client.get(goal_tasks).json())
@@ -46,27 +46,17 @@ const App = () => {
       try {
         setLoading(true);
         console.log('Starting to load data from API...');
-        const [
-          nodesData,
-          linksData,
-          tasksData,
-          skillsData,
-          goalsData,
-          cardsData,
-          incomeData,
-          expensesData,
-          investmentsData
-        ] = await Promise.all([
-          api.getNodes(),
-          api.getLinks(),
-          api.getTasks(),
-          api.getSkills(),
-          api.getGoals(),
-          api.getCards(),
-          api.getIncome(),
-          api.getExpenses(),
-          api.getInvestments()
-        ]);
+        const {
+          nodes: nodesData,
+          links: linksData,
+          tasks: tasksData,
+          skills: skillsData,
+          goals: goalsData,
+          cards: cardsData,
+          income: incomeData,
+          expenses: expensesData,
+          investments: investmentsData
+        } = await api.getBootstrap();
 
         console.log('Data loaded successfully:', {
           nodes: nodesData.length,
@@ -134,15 +124,9 @@ const App = () => {
 
   const handleDeleteNode = async (nodeId: string) => {
     try {
+      // The server removes the node's links along with it
       await api.deleteNode(nodeId);
       setNodes(prev => prev.filter(n => n.id !== nodeId));
-      // Delete associated links
-      const nodeLinks = links.filter(l => getLinkId(l.source) === nodeId || getLinkId(l.target) === nodeId);
-      for (const link of nodeLinks) {
-        if (link.id) {
-          await api.deleteLink(link.id);
-        }
-      }
       setLinks(prev => prev.filter(l => getLinkId(l.source) !== nodeId && getLinkId(l.target) !== nodeId));
     } catch (error) {
       console.error('Error deleting node:', error);
@@ -1,8 +1,8 @@
-import React, { useMemo, useState } from 'react';
-import type { Node, GraphLink, NodeType, ActiveTab, Task, Skill, Goal, IncomeEntry, ExpenseEntry, InvestmentEntry } from '../types';
+import React, { useEffect, useMemo, useState } from 'react';
+import type { Node, GraphLink, GraphStats, FinanceSummary, NodeType, ActiveTab, Task, Skill, Goal, IncomeEntry, ExpenseEntry, InvestmentEntry } from '../types';
 import { nodeTypes } from '../types';
 import { styles } from '../styles/styles';
-import { getLinkId } from '../utils/helpers';
+import { financeAPI, graphAPI } from '../services/api';
 
 interface DashboardProps {
   nodes: Node[];
@@ -41,49 +41,46 @@ export const Dashboard: React.FC<DashboardProps> = ({
     }, {} as Record<NodeType, number>);
   }, [nodes]);
 
-  const connectionCounts = useMemo(() => {
-    const counts = new Map<string, number>();
-    links.forEach(link => {
-      const sourceId = getLinkId(link.source);
-      const targetId = getLinkId(link.target);
-      if (sourceId) counts.set(sourceId, (counts.get(sourceId) || 0) + 1);
-      if (targetId) counts.set(targetId, (counts.get(targetId) || 0) + 1);
-    });
-    return counts;
-  }, [links]);
+  // Degrees are maintained server-side, so the dashboard never walks the whole graph
+  const [graphStats, setGraphStats] = useState<GraphStats | null>(null);
+
+  useEffect(() => {
+    graphAPI.getStats(5)
+      .then(setGraphStats)
+      .catch(error => console.error('Error loading graph stats:', error));
+  }, [nodes.length, links.length]);
+
+  const nodesById = useMemo(() => new Map(nodes.map(node => [node.id, node])), [nodes]);
 
   const orphanNodes = useMemo(() => {
-    return nodes.filter(node => !connectionCounts.has(node.id));
-  }, [nodes, connectionCounts]);
+    return (graphStats?.orphans ?? [])
+      .map(id => nodesById.get(id))
+      .filter((node): node is Node => !!node);
+  }, [graphStats, nodesById]);
 
   const topHubs = useMemo(() => {
-    return [...connectionCounts.entries()]
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 5)
-      .map(([id, count]) => {
-        const node = nodes.find(n => n.id === id);
-        return { node, count };
-      })
+    return (graphStats?.hubs ?? [])
+      .map(hub => ({ node: nodesById.get(hub.id), count: hub.degree }))
       .filter(item => item.node);
-  }, [nodes, connectionCounts]);
+  }, [graphStats, nodesById]);
 
   const handleNodeClick = (nodeId: string) => {
     setSelectedNodeId(nodeId);
     setActiveTab('map');
   };
 
-  // Finance calculations
-  const totalIncome = useMemo(() =>
-    income.reduce((sum, entry) => sum + entry.amount, 0), [income]
-  );
+  // Finance totals come from the server's monthly rollups instead of reducing every transaction here
+  const [financeSummary, setFinanceSummary] = useState<FinanceSummary | null>(null);
 
-  const totalExpenses = useMemo(() =>
-    expenses.reduce((sum, entry) => sum + entry.amount, 0), [expenses]
-  );
+  useEffect(() => {
+    financeAPI.getSummary()
+      .then(setFinanceSummary)
+      .catch(error => console.error('Error loading finance summary:', error));
+  }, [income, expenses, investments]);
 
-  const totalInvestments = useMemo(() =>
-    investments.reduce((sum, entry) => sum + entry.amount, 0), [investments]
-  );
+  const totalIncome = financeSummary?.totals.income ?? 0;
+  const totalExpenses = financeSummary?.totals.expenses ?? 0;
+  const totalInvestments = financeSummary?.totals.investments ?? 0;
 
   const netSavings = totalIncome - totalExpenses - totalInvestments;
   const savingsRate = totalIncome > 0 ? ((netSavings / totalIncome) * 100) : 0;
@@ -91,17 +88,12 @@ export const Dashboard: React.FC<DashboardProps> = ({
   const monthlyData = useMemo(() => {
     const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
     const currentYear = new Date().getFullYear();
+    const periods = new Map((financeSummary?.periods ?? []).map(period => [period.period, period]));
 
     return months.map((month, index) => {
-      const monthIncome = income.filter(i => {
-        const date = new Date(i.date);
-        return date.getMonth() === index && date.getFullYear() === currentYear;
-      }).reduce((sum, i) => sum + i.amount, 0);
-
-      const monthExpenses = expenses.filter(e => {
-        const date = new Date(e.date);
-        return date.getMonth() === index && date.getFullYear() === currentYear;
-      }).reduce((sum, e) => sum + e.amount, 0);
+      const period = periods.get(`${currentYear}-${String(index + 1).padStart(2, '0')}`);
+      const monthIncome = period?.income ?? 0;
+      const monthExpenses = period?.expenses ?? 0;
 
       return {
         month,
@@ -110,7 +102,7 @@ export const Dashboard: React.FC<DashboardProps> = ({
         net: monthIncome - monthExpenses,
       };
     });
-  }, [income, expenses]);
+  }, [financeSummary]);
 
   const maxValue = Math.max(...monthlyData.map(d => Math.max(d.income, d.expenses)), 1);
 
@@ -119,17 +111,10 @@ export const Dashboard: React.FC<DashboardProps> = ({
   };
 
   const topExpenseCategories = useMemo(() => {
-    const categoryTotals = expenses.reduce((acc, expense) => {
-      expense.tags.forEach(tag => {
-        acc[tag] = (acc[tag] || 0) + expense.amount;
-      });
-      return acc;
-    }, {} as Record<string, number>);
-
-    return Object.entries(categoryTotals)
-      .sort((a, b) => (b[1] as number) - (a[1] as number))
+    return Object.entries(financeSummary?.categories.expenses ?? {})
+      .sort((a, b) => b[1] - a[1])
       .slice(0, 5);
-  }, [expenses]);
+  }, [financeSummary]);
 
   const recentTransactions = useMemo(() => {
     const allTransactions = [
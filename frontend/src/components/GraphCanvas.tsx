@@ -3,6 +3,7 @@ import * as d3 from 'd3';
 import type { Node, GraphLink, Tooltip, ConnectMode } from '../types';
 import { badgeColors } from '../types';
 import { getLinkId } from '../utils/helpers';
+import { updateNodePositions } from '../services/api';
 
 interface GraphCanvasProps {
   nodes: Node[];
@@ -477,6 +478,9 @@ export const GraphCanvas: React.FC<GraphCanvasProps> = ({
               : n
           ));
         }
+        // Drag end is the final position: write it now instead of waiting for the coalescing window
+        updateNodePositions([{ id: event.subject.id, x: event.subject.x, y: event.subject.y }], true)
+          .catch(error => console.error('Error saving node position:', error));
       });
     d3canvas.call(drag as any);
 
@@ -1,6 +1,12 @@
 // API Service for Mind Space
+import type { FinanceSummary, GraphStats } from '../types';
+
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Time of our last write, as stamped by the backend; sent back so reads
+// right after a write are served from the primary, not a lagging replica
+let lastWrite: string | null = null;
+
 // Generic fetch wrapper
 async function apiFetch<T>(endpoint: string, options?: RequestInit): Promise<T> {
     console.log(`API Request: ${endpoint}`);
@@ -8,11 +14,14 @@ async function apiFetch<T>(endpoint: string, options?: RequestInit): Promise<T>
         const response = await fetch(`${API_URL}${endpoint}`, {
             headers: {
                 'Content-Type': 'application/json',
+                ...(lastWrite ? { 'X-Last-Write': lastWrite } : {}),
                 ...options?.headers,
             },
             ...options,
         });
 
+        lastWrite = response.headers.get('X-Last-Write') ?? lastWrite;
+
         console.log(`API Response (${endpoint}):`, response.status);
 
         if (!response.ok) {
@@ -46,6 +55,17 @@ export const nodeAPI = {
     delete: (id: string) => apiFetch<void>(`/api/nodes/${id}`, {
         method: 'DELETE',
     }),
+    // Removes the nodes and all their links in one transaction
+    deleteMany: (ids: string[]) =>
+        apiFetch<{ deleted: number }>(`/api/nodes?ids=${ids.map(encodeURIComponent).join(',')}`, {
+            method: 'DELETE',
+        }),
+    // Batched moves; the server coalesces rapid repeats into one write
+    updatePositions: (positions: { id: string; x: number; y: number }[], flush = false) =>
+        apiFetch<{ updated: number; pending: number }>(`/api/nodes/positions${flush ? '?flush=true' : ''}`, {
+            method: 'PATCH',
+            body: JSON.stringify(positions),
+        }),
 };
 
 // Link API
@@ -56,11 +76,31 @@ export const linkAPI = {
         method: 'POST',
         body: JSON.stringify(data),
     }),
+    createBulk: (links: { source: string; target: string }[]) =>
+        apiFetch<{ created: any[]; existing: any[] }>('/api/links/bulk', {
+            method: 'POST',
+            body: JSON.stringify(links),
+        }),
     delete: (id: string) => apiFetch<void>(`/api/links/${id}`, {
         method: 'DELETE',
     }),
 };
 
+// Graph API
+export const graphAPI = {
+    getNeighborhood: (nodeId: string, depth = 1, limit = 500) =>
+        apiFetch<{ nodes: any[]; links: any[]; truncated: boolean }>(
+            `/api/graph/neighborhood/${nodeId}?depth=${depth}&limit=${limit}`
+        ),
+    getStats: (top = 5) => apiFetch<GraphStats>(`/api/graph/stats?top=${top}`),
+    // Server-side force layout; 'incremental' only places nodes without a position
+    layout: (mode: 'incremental' | 'full' = 'incremental', iterations?: number) =>
+        apiFetch<{ moved: number; pinned: number; elapsed_ms: number }>(
+            `/api/graph/layout?mode=${mode}${iterations ? `&iterations=${iterations}` : ''}`,
+            { method: 'POST' }
+        ),
+};
+
 // Task API
 export const taskAPI = {
     getAll: () => apiFetch<any[]>('/api/tasks'),
@@ -146,6 +186,11 @@ export const cardAPI = {
 // Income API
 export const incomeAPI = {
     getAll: () => apiFetch<any[]>('/api/income'),
+    importFile: (file: File) => apiFetch<any>(`/api/income/import?format=${file.name.endsWith('.csv') ? 'csv' : 'ndjson'}`, {
+        method: 'POST',
+        headers: { 'Content-Type': file.type || 'application/octet-stream' },
+        body: file,
+    }),
     create: (data: any) => apiFetch<any>('/api/income', {
         method: 'POST',
         body: JSON.stringify(data),
@@ -158,6 +203,11 @@ export const incomeAPI = {
 // Expense API
 export const expenseAPI = {
     getAll: () => apiFetch<any[]>('/api/expenses'),
+    importFile: (file: File) => apiFetch<any>(`/api/expenses/import?format=${file.name.endsWith('.csv') ? 'csv' : 'ndjson'}`, {
+        method: 'POST',
+        headers: { 'Content-Type': file.type || 'application/octet-stream' },
+        body: file,
+    }),
     create: (data: any) => apiFetch<any>('/api/expenses', {
         method: 'POST',
         body: JSON.stringify(data),
@@ -170,6 +220,11 @@ export const expenseAPI = {
 // Investment API
 export const investmentAPI = {
     getAll: () => apiFetch<any[]>('/api/investments'),
+    importFile: (file: File) => apiFetch<any>(`/api/investments/import?format=${file.name.endsWith('.csv') ? 'csv' : 'ndjson'}`, {
+        method: 'POST',
+        headers: { 'Content-Type': file.type || 'application/octet-stream' },
+        body: file,
+    }),
     create: (data: any) => apiFetch<any>('/api/investments', {
         method: 'POST',
         body: JSON.stringify(data),
@@ -179,10 +234,38 @@ export const investmentAPI = {
     }),
 };
 
+// Finance summary API (server-side monthly rollups)
+export const financeAPI = {
+    getSummary: (params: { from?: string; to?: string; granularity?: 'month' | 'year' } = {}) => {
+        const query = new URLSearchParams(params as Record<string, string>).toString();
+        return apiFetch<FinanceSummary>(`/api/finance/summary${query ? `?${query}` : ''}`);
+    },
+};
+
+// Media API (content-addressed blob store for journal photos and voice notes)
+export const mediaAPI = {
+    upload: async (file: Blob): Promise<{ id: string; url: string; size: number; contentType: string }> => {
+        const response = await fetch(`${API_URL}/api/media`, {
+            method: 'POST',
+            headers: { 'Content-Type': file.type || 'application/octet-stream' },
+            body: file,
+        });
+        if (!response.ok) {
+            throw new Error(`Upload failed with status ${response.status}`);
+        }
+        return response.json();
+    },
+};
+
+// Journal entries store media as "/api/media/<sha256>"; resolve against the API host
+export const mediaUrl = (ref: string) => ref.startsWith('/api/media/') ? `${API_URL}${ref}` : ref;
+
 // Journal API
 export const journalAPI = {
     getAll: () => apiFetch<any[]>('/api/journal'),
     getOne: (id: string) => apiFetch<any>(`/api/journal/${id}`),
+    search: (q: string, limit = 20) =>
+        apiFetch<any[]>(`/api/journal/search?q=${encodeURIComponent(q)}&limit=${limit}`),
     create: (data: any) => apiFetch<any>('/api/journal', {
         method: 'POST',
         body: JSON.stringify(data),
@@ -196,14 +279,38 @@ export const journalAPI = {
     }),
 };
 
+// Bootstrap: every collection the app needs on load, in one request
+export const bootstrapAPI = {
+    get: () => apiFetch<{
+        nodes: any[];
+        links: any[];
+        tasks: any[];
+        skills: any[];
+        goals: any[];
+        cards: any[];
+        income: any[];
+        expenses: any[];
+        investments: any[];
+    }>('/api/bootstrap'),
+};
+
+// Full-account export (download URL, streamed by the server)
+export const getExportUrl = (format: 'ndjson' | 'csv' = 'ndjson', entity?: string) =>
+    `${API_URL}/api/export?format=${format}${entity ? `&entity=${entity}` : ''}`;
+
 // Health check
 export const healthCheck = () => apiFetch<{status: string}>('/api/health');
 
 // Simplified exports for easier use
+export const getBootstrap = () => bootstrapAPI.get();
+
 export const getNodes = () => nodeAPI.getAll();
 export const createNode = (data: any) => nodeAPI.create(data);
 export const updateNode = (id: string, data: any) => nodeAPI.update(id, data);
 export const deleteNode = (id: string) => nodeAPI.delete(id);
+export const deleteNodes = (ids: string[]) => nodeAPI.deleteMany(ids);
+export const updateNodePositions = (positions: { id: string; x: number; y: number }[], flush = false) =>
+    nodeAPI.updatePositions(positions, flush);
 
 export const getLinks = () => linkAPI.getAll();
 export const createLink = (data: any) => linkAPI.create(data);
@@ -241,6 +348,9 @@ export const getInvestments = () => investmentAPI.getAll();
 export const createInvestment = (data: any) => investmentAPI.create(data);
 export const deleteInvestment = (id: string) => investmentAPI.delete(id);
 
+export const getFinanceSummary = (params?: { from?: string; to?: string; granularity?: 'month' | 'year' }) =>
+    financeAPI.getSummary(params);
+
 export const getJournalEntries = () => journalAPI.getAll();
 export const createJournalEntry = (data: any) => journalAPI.create(data);
 export const updateJournalEntry = (id: string, data: any) => journalAPI.update(id, data);
@@ -76,6 +76,30 @@ export interface GraphLink extends d3.SimulationLinkDatum<Node> {
   target: Node | string | number;
 }
 
+export interface GraphStats {
+  nodes: number;
+  links: number;
+  types: Record<string, number>;
+  orphans: string[];
+  hubs: { id: string; title: string; degree: number }[];
+  components: number;
+  largest_component: number;
+}
+
+export interface FinanceTotals {
+  income: number;
+  expenses: number;
+  investments: number;
+  net: number;
+}
+
+export interface FinanceSummary {
+  granularity: 'month' | 'year';
+  periods: (FinanceTotals & { period: string })[];
+  totals: FinanceTotals;
+  categories: Record<'income' | 'expenses' | 'investments', Record<string, number>>;
+}
+
 export interface Tooltip {
   content: string;
   x: number;